@@ -0,0 +1,18 @@
+"""
+FastAPI dependencies for shared services
+Declared as plain functions so FastAPI resolves them in its threadpool and a
+request arriving during warm-up never blocks the event loop
+"""
+from rag.rag_engine import RAGEngine
+from services.document_manager import DocumentManager
+from services.registry import registry
+
+
+def get_rag_engine() -> RAGEngine:
+    """Shared RAG engine"""
+    return registry.rag_engine
+
+
+def get_document_manager() -> DocumentManager:
+    """Shared document manager"""
+    return registry.document_manager
@@ -16,6 +16,13 @@ class QueryType(str, Enum):
     TIMELINE = "timeline"
 
 
+class SearchMode(str, Enum):
+    """Retrieval strategies for finding context chunks"""
+    VECTOR = "vector"
+    LEXICAL = "lexical"
+    HYBRID = "hybrid"
+
+
 class DocumentType(str, Enum):
     """Supported document types"""
     PDF = "pdf"
@@ -34,6 +41,7 @@ class QueryRequest(BaseModel):
     n_results: int = Field(default=5, ge=1, le=20, description="Number of context chunks to retrieve")
     document_ids: Optional[List[str]] = Field(default=None, description="Filter by specific document IDs")
     conversation_history: List[Dict[str, str]] = Field(default=[], description="Previous conversation messages for context")
+    search_mode: Optional[SearchMode] = Field(default=None, description="Retrieval mode (default: server SEARCH_MODE)")
     
     class Config:
         json_schema_extra = {
@@ -60,6 +68,38 @@ class DocumentUploadResponse(BaseModel):
     metadata: Dict[str, Any]
 
 
+class BatchUploadItem(BaseModel):
+    """Outcome for one file of a batch upload"""
+    filename: str
+    success: bool
+    document_id: Optional[str] = None
+    document_type: Optional[DocumentType] = None
+    num_chunks: Optional[int] = None
+    processing_time: float = 0.0
+    error: Optional[str] = None
+
+
+class BatchUploadResponse(BaseModel):
+    """Response model for a batch upload"""
+    success: bool
+    message: str
+    total_files: int
+    succeeded: int
+    failed: int
+    processing_time: float  # wall clock for the whole request
+    ingest_time: float  # sum of the per-file processing times
+    results: List[BatchUploadItem]
+
+
+class IngestionJobResponse(BaseModel):
+    """Response model for a queued background upload"""
+    success: bool
+    message: str
+    job_id: str
+    status: str
+    status_url: str
+
+
 # ============= Response Models =============
 
 class Citation(BaseModel):
@@ -68,6 +108,7 @@ class Citation(BaseModel):
     document_name: str
     chunk_id: str
     page_number: Optional[int] = None
+    page_end: Optional[int] = None
     relevance_score: float
     text_snippet: str
 
@@ -93,6 +134,22 @@ class DocumentInfo(BaseModel):
     metadata: Dict[str, Any]
 
 
+class IngestionJobStatus(BaseModel):
+    """Progress of a background ingestion job"""
+    job_id: str
+    filename: str
+    status: str  # queued, running, completed, failed
+    stage: str  # queued, extracting, chunking, embedding, indexing, completed, failed
+    progress: float
+    chunks_total: int
+    chunks_done: int
+    document_id: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
 class DocumentListResponse(BaseModel):
     """Response model for listing documents"""
     success: bool
@@ -114,6 +171,8 @@ class HealthResponse(BaseModel):
     version: str
     gemini_configured: bool
     database_status: str
+    ready: bool = False
+    components: Optional[Dict[str, Any]] = None
     timestamp: datetime
 
 
@@ -1,34 +1,67 @@
 """
 Document management endpoints with rename and download support
 """
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import FileResponse
+import time
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from fastapi.responses import FileResponse, JSONResponse
 from typing import List
 
 from api.models import (
     DocumentUploadResponse,
+    BatchUploadItem,
+    BatchUploadResponse,
     DocumentListResponse,
     DeleteDocumentResponse,
     DocumentInfo,
-    DocumentType
+    DocumentType,
+    IngestionJobResponse,
+    IngestionJobStatus
 )
-from services.document_manager import DocumentManager
+from api.dependencies import get_document_manager
+from services.document_manager import DocumentManager, FileTooLargeError
+from services.ingestion_jobs import ingestion_queue, QueueFullError
 from config import settings
 
 router = APIRouter()
-doc_manager = DocumentManager()
 
 
-@router.post("/documents/upload", response_model=DocumentUploadResponse)
-async def upload_document(file: UploadFile = File(...)):
+def _queue_full_error(message: str) -> HTTPException:
+    """503 telling clients to retry once the ingestion queue drains"""
+    return HTTPException(
+        status_code=503,
+        detail=message,
+        headers={"Retry-After": str(settings.INGEST_RETRY_AFTER_SECONDS)}
+    )
+
+
+async def _save_upload(doc_manager: DocumentManager, file: UploadFile) -> dict:
+    """Stream an upload to disk, mapping an oversized file to a 400"""
+    try:
+        return await doc_manager.save_upload(file)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post(
+    "/documents/upload",
+    response_model=DocumentUploadResponse,
+    responses={202: {"model": IngestionJobResponse}}
+)
+async def upload_document(
+    file: UploadFile = File(...),
+    background: bool = settings.INGEST_BACKGROUND_DEFAULT,
+    doc_manager: DocumentManager = Depends(get_document_manager)
+):
     """
     Upload a document for processing
     
     Args:
         file: Uploaded file (PDF, DOCX, TXT, MD)
+        background: Queue extraction/embedding and return a job ID immediately
     
     Returns:
-        DocumentUploadResponse: Upload confirmation with document ID
+        DocumentUploadResponse: Upload confirmation with document ID, or
+        IngestionJobResponse (202) when background=true
     """
     # Validate file extension
     file_ext = f".{file.filename.split('.')[-1].lower()}"
@@ -38,21 +71,37 @@ async def upload_document(file: UploadFile = File(...)):
             detail=f"File type {file_ext} not supported. Allowed: {settings.ALLOWED_EXTENSIONS}"
         )
     
-    # Validate file size
-    contents = await file.read()
-    file_size_mb = len(contents) / (1024 * 1024)
-    if file_size_mb > settings.MAX_FILE_SIZE_MB:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large ({file_size_mb:.2f}MB). Max size: {settings.MAX_FILE_SIZE_MB}MB"
+    if background:
+        # Reject before touching the disk when workers are saturated
+        if not ingestion_queue.has_capacity():
+            raise _queue_full_error("Ingestion queue is full, please retry shortly")
+        
+        upload = await _save_upload(doc_manager, file)
+        try:
+            job = ingestion_queue.submit(
+                lambda progress: doc_manager.ingest_upload(upload, progress),
+                filename=upload["filename"],
+                cleanup=lambda: upload["file_path"].unlink(missing_ok=True)
+            )
+        except QueueFullError as e:
+            upload["file_path"].unlink(missing_ok=True)
+            raise _queue_full_error(str(e))
+        
+        response = IngestionJobResponse(
+            success=True,
+            message="Document queued for processing",
+            job_id=job["job_id"],
+            status=job["status"],
+            status_url=f"{settings.API_V1_PREFIX}/documents/jobs/{job['job_id']}"
         )
+        return JSONResponse(status_code=202, content=response.model_dump())
     
-    # Reset file pointer
-    await file.seek(0)
+    # Stream to disk (size is enforced while copying)
+    upload = await _save_upload(doc_manager, file)
     
     try:
         # Process document
-        result = await doc_manager.process_and_store(file, contents)
+        result = await doc_manager.ingest_upload(upload)
         
         return DocumentUploadResponse(
             success=True,
@@ -70,8 +119,127 @@ async def upload_document(file: UploadFile = File(...)):
         )
 
 
+@router.post("/documents/upload/batch", response_model=BatchUploadResponse)
+async def upload_documents_batch(
+    files: List[UploadFile] = File(...),
+    doc_manager: DocumentManager = Depends(get_document_manager)
+):
+    """
+    Upload several documents (or zip archives of documents) in one request
+    
+    Files are saved, then ingested concurrently (BATCH_INGEST_CONCURRENCY at
+    a time). A file that fails does not fail the batch; its error is
+    reported in its result.
+    
+    Args:
+        files: Uploaded files (PDF, DOCX, TXT, MD or ZIP)
+    
+    Returns:
+        BatchUploadResponse: Per-file results and aggregate timing
+    """
+    started = time.perf_counter()
+    max_files = settings.BATCH_UPLOAD_MAX_FILES
+    if len(files) > max_files:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files. Max files per batch: {max_files}"
+        )
+    
+    # Saved uploads, or {"filename", "error"} for rejected files
+    entries = []
+    archive_budget = settings.BATCH_UPLOAD_MAX_ARCHIVE_MB * 1024 * 1024
+    try:
+        for file in files:
+            file_ext = f".{file.filename.split('.')[-1].lower()}"
+            if file_ext == ".zip":
+                extracted = await doc_manager.save_archive(file, max_files - len(entries), archive_budget)
+                archive_budget -= sum(entry.get("file_size", 0) for entry in extracted)
+                entries.extend(extracted)
+            elif file_ext not in settings.ALLOWED_EXTENSIONS:
+                entries.append({
+                    "filename": file.filename,
+                    "error": f"File type {file_ext} not supported. Allowed: {settings.ALLOWED_EXTENSIONS + ['.zip']}"
+                })
+            else:
+                try:
+                    entries.append(await doc_manager.save_upload(file))
+                except FileTooLargeError as e:
+                    entries.append({"filename": file.filename, "error": str(e)})
+            
+            if len(entries) > max_files:
+                raise ValueError(f"Too many files. Max files per batch: {max_files}")
+        
+        if not entries:
+            raise ValueError("No documents in batch")
+    except BaseException as e:
+        # Nothing is ingested if the batch is rejected
+        for entry in entries:
+            if "file_path" in entry:
+                entry["file_path"].unlink(missing_ok=True)
+        if isinstance(e, ValueError):
+            raise HTTPException(status_code=400, detail=str(e))
+        raise
+    
+    uploads = [entry for entry in entries if "error" not in entry]
+    outcomes = iter(await doc_manager.ingest_uploads(uploads))
+    
+    results = []
+    for entry in entries:
+        if "error" in entry:
+            results.append(BatchUploadItem(filename=entry["filename"], success=False, error=entry["error"]))
+            continue
+        
+        outcome = next(outcomes)
+        record = outcome.get("record")
+        results.append(BatchUploadItem(
+            filename=outcome["filename"],
+            success=record is not None,
+            document_id=record["document_id"] if record else None,
+            document_type=DocumentType(entry["document_type"]),
+            num_chunks=record["num_chunks"] if record else None,
+            processing_time=round(outcome["seconds"], 3),
+            error=outcome.get("error")
+        ))
+    
+    succeeded = sum(result.success for result in results)
+    return BatchUploadResponse(
+        success=bool(results) and succeeded == len(results),
+        message=f"{succeeded} of {len(results)} documents uploaded and processed successfully",
+        total_files=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        processing_time=round(time.perf_counter() - started, 3),
+        ingest_time=round(sum(result.processing_time for result in results), 3),
+        results=results
+    )
+
+
+@router.get("/documents/jobs/{job_id}", response_model=IngestionJobStatus)
+async def get_ingestion_job(job_id: str):
+    """
+    Get progress of a background ingestion job
+    
+    Args:
+        job_id: Job ID returned by POST /documents/upload?background=true
+    
+    Returns:
+        IngestionJobStatus: Stage, percentage and chunk counts
+    """
+    job = ingestion_queue.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Ingestion job {job_id} not found"
+        )
+    
+    return IngestionJobStatus(**job)
+
+
 @router.post("/documents/upload-url", response_model=DocumentUploadResponse)
-async def upload_url(url: str):
+async def upload_url(
+    url: str,
+    doc_manager: DocumentManager = Depends(get_document_manager)
+):
     """
     Upload a URL for processing
     
@@ -107,7 +275,9 @@ async def upload_url(url: str):
 
 
 @router.get("/documents", response_model=DocumentListResponse)
-async def list_documents():
+async def list_documents(
+    doc_manager: DocumentManager = Depends(get_document_manager)
+):
     """
     List all uploaded documents
     
@@ -144,7 +314,10 @@ async def list_documents():
 
 
 @router.delete("/documents/{document_id}", response_model=DeleteDocumentResponse)
-async def delete_document(document_id: str):
+async def delete_document(
+    document_id: str,
+    doc_manager: DocumentManager = Depends(get_document_manager)
+):
     """
     Delete a document and its associated chunks
     
@@ -179,7 +352,10 @@ async def delete_document(document_id: str):
 
 
 @router.get("/documents/{document_id}", response_model=DocumentInfo)
-async def get_document(document_id: str):
+async def get_document(
+    document_id: str,
+    doc_manager: DocumentManager = Depends(get_document_manager)
+):
     """
     Get information about a specific document
     
@@ -218,7 +394,11 @@ async def get_document(document_id: str):
 
 
 @router.patch("/documents/{document_id}/rename")
-async def rename_document(document_id: str, new_name: str):
+async def rename_document(
+    document_id: str,
+    new_name: str,
+    doc_manager: DocumentManager = Depends(get_document_manager)
+):
     """
     Rename a document
     
@@ -256,7 +436,11 @@ async def rename_document(document_id: str, new_name: str):
 
 
 @router.get("/documents/{document_id}/download")
-async def download_document(document_id: str, watermark: bool = True):
+async def download_document(
+    document_id: str,
+    watermark: bool = True,
+    doc_manager: DocumentManager = Depends(get_document_manager)
+):
     """
     Download a document with UB360.ai watermark
     
@@ -5,6 +5,11 @@ from fastapi import APIRouter
 from datetime import datetime
 from config import settings
 from api.models import HealthResponse
+from services.registry import registry
+from rag.llm_limiter import llm_limiter
+from rag.answer_cache import answer_cache
+from services.ingestion_jobs import ingestion_queue
+from services.web_scraper import web_scraper
 import os
 
 router = APIRouter()
@@ -25,8 +30,17 @@ async def health_check():
     db_exists = os.path.exists(settings.CHROMA_PERSIST_DIR)
     database_status = "ready" if db_exists else "not_initialized"
     
+    # Shared embedding model / services readiness
+    components = registry.status()
+    ready = components["ready"]
+    
     # Overall status
-    status = "healthy" if gemini_configured and db_exists else "degraded"
+    if not (gemini_configured and db_exists) or components["warmup_error"]:
+        status = "degraded"
+    elif not ready:
+        status = "starting"
+    else:
+        status = "healthy"
     
     return HealthResponse(
         success=True,
@@ -34,5 +48,26 @@ async def health_check():
         version=settings.APP_VERSION,
         gemini_configured=gemini_configured,
         database_status=database_status,
+        ready=ready,
+        components=components,
         timestamp=datetime.now()
     )
+
+
+@router.get("/health/metrics")
+async def health_metrics():
+    """
+    Runtime performance metrics
+    
+    Returns:
+        Metrics for shared components (LLM queue, caches, ...)
+    """
+    return {
+        "success": True,
+        "llm": llm_limiter.stats(),
+        "answer_cache": answer_cache.stats(),
+        "ingestion": ingestion_queue.stats(),
+        "scraper": web_scraper.stats(),
+        **registry.metrics(),
+        "timestamp": datetime.now()
+    }
@@ -1,21 +1,55 @@
 """
 Query endpoints for RAG system with @mention support
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, AsyncIterator
+import json
 import time
 
 from api.models import QueryRequest, QueryResponse, Citation, QueryType
+from api.dependencies import get_rag_engine, get_document_manager
 from rag.rag_engine import RAGEngine
 from services.document_manager import DocumentManager
 from utils.mention_parser import MentionParser
 
 router = APIRouter()
-rag_engine = RAGEngine()
-doc_manager = DocumentManager()
+
+
+async def _resolve_mentions(request: QueryRequest, doc_manager: DocumentManager) -> Dict[str, Any]:
+    """
+    Strip @mentions from the question and work out the document filter
+    
+    Args:
+        request: Query request
+        doc_manager: Document manager used to look up document names
+    
+    Returns:
+        Parsed mentions plus clean_query and document_ids
+    """
+    # Parse @mentions from the question
+    available_docs = await doc_manager.get_all_document_names()
+    parsed = MentionParser.parse_mentions(request.question, available_docs)
+    
+    # If mentions found, use those document IDs
+    # Otherwise, use document_ids from request (if provided)
+    document_ids = None
+    if parsed['has_mentions']:
+        document_ids = parsed['mentioned_docs']
+        print(f"📎 @Mentions found: {parsed['mentioned_names']}")
+    elif request.document_ids:
+        document_ids = request.document_ids
+    
+    parsed['document_ids'] = document_ids
+    return parsed
 
 
 @router.post("/query", response_model=QueryResponse)
-async def query_documents(request: QueryRequest):
+async def query_documents(
+    request: QueryRequest,
+    rag_engine: RAGEngine = Depends(get_rag_engine),
+    doc_manager: DocumentManager = Depends(get_document_manager)
+):
     """
     Query the RAG system with a question (supports @mentions)
     
@@ -33,21 +67,11 @@ async def query_documents(request: QueryRequest):
     start_time = time.time()
     
     try:
-        # Parse @mentions from the question
-        available_docs = await doc_manager.get_all_document_names()
-        parsed = MentionParser.parse_mentions(request.question, available_docs)
-        
-        # Use clean query (without @mentions)
+        # Resolve @mentions and use clean query (without @mentions)
+        parsed = await _resolve_mentions(request, doc_manager)
         clean_question = parsed['clean_query']
-        
-        # If mentions found, use those document IDs
-        # Otherwise, use document_ids from request (if provided)
-        document_ids = None
-        if parsed['has_mentions']:
-            document_ids = parsed['mentioned_docs']
-            print(f"📎 @Mentions found: {parsed['mentioned_names']}")
-        elif request.document_ids:
-            document_ids = request.document_ids
+        document_ids = parsed['document_ids']
+        search_mode = request.search_mode.value if request.search_mode else None
         
         # Execute query based on type
         if request.query_type == QueryType.ANSWER:
@@ -55,35 +79,40 @@ async def query_documents(request: QueryRequest):
                 question=clean_question,
                 n_results=request.n_results,
                 document_ids=document_ids,
-                conversation_history=request.conversation_history
+                conversation_history=request.conversation_history,
+                search_mode=search_mode
             )
         
         elif request.query_type == QueryType.SUMMARIZE:
             result = await rag_engine.summarize_documents(
                 query=clean_question,
                 n_results=request.n_results,
-                document_ids=document_ids
+                document_ids=document_ids,
+                search_mode=search_mode
             )
         
         elif request.query_type == QueryType.COMPARE:
             result = await rag_engine.compare_documents(
                 query=clean_question,
                 n_results=request.n_results,
-                document_ids=document_ids
+                document_ids=document_ids,
+                search_mode=search_mode
             )
         
         elif request.query_type == QueryType.EXTRACT:
             result = await rag_engine.extract_key_points(
                 query=clean_question,
                 n_results=request.n_results,
-                document_ids=document_ids
+                document_ids=document_ids,
+                search_mode=search_mode
             )
         
         elif request.query_type == QueryType.TIMELINE:
             result = await rag_engine.extract_timeline(
                 query=clean_question,
                 n_results=request.n_results,
-                document_ids=document_ids
+                document_ids=document_ids,
+                search_mode=search_mode
             )
         
         else:
@@ -102,6 +131,7 @@ async def query_documents(request: QueryRequest):
                 document_name=cite["document_name"],
                 chunk_id=cite["chunk_id"],
                 page_number=cite.get("page_number"),
+                page_end=cite.get("page_end"),
                 relevance_score=cite["relevance_score"],
                 text_snippet=cite["text_snippet"]
             )
@@ -129,8 +159,84 @@ async def query_documents(request: QueryRequest):
         )
 
 
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/query/stream")
+async def query_documents_stream(
+    request: QueryRequest,
+    rag_engine: RAGEngine = Depends(get_rag_engine),
+    doc_manager: DocumentManager = Depends(get_document_manager)
+):
+    """
+    Query the RAG system and stream the answer as Server-Sent Events
+    
+    Supports every query type and @mentions, like POST /query.
+    
+    Events:
+        citations: Sources found by retrieval (sent before generation starts)
+        token: A fragment of the answer ({"text": "..."})
+        done: Final metadata including processing_time
+        error: Processing failed ({"error": "..."})
+    
+    Args:
+        request: Query request with question and parameters
+    
+    Returns:
+        text/event-stream response
+    """
+    start_time = time.time()
+    
+    try:
+        parsed = await _resolve_mentions(request, doc_manager)
+        prepared = await rag_engine.prepare_query(
+            query_type=request.query_type.value,
+            question=parsed['clean_query'],
+            n_results=request.n_results,
+            document_ids=parsed['document_ids'],
+            conversation_history=request.conversation_history,
+            search_mode=request.search_mode.value if request.search_mode else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error processing query: {str(e)}"
+        )
+    
+    if parsed['has_mentions']:
+        prepared["metadata"]['mentioned_documents'] = parsed['mentioned_names']
+    
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for item in rag_engine.stream_prepared(prepared):
+                if item["event"] == "citations":
+                    item["data"]["query_type"] = request.query_type.value
+                    item["data"]["retrieval_time"] = time.time() - start_time
+                elif item["event"] == "done":
+                    item["data"]["processing_time"] = time.time() - start_time
+                yield _sse_event(item["event"], item["data"])
+        except Exception as e:
+            yield _sse_event("error", {"error": f"Error generating answer: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
 @router.get("/query/history")
-async def get_query_history(limit: int = 10):
+async def get_query_history(
+    limit: int = 10,
+    rag_engine: RAGEngine = Depends(get_rag_engine)
+):
     """
     Get recent query history
     
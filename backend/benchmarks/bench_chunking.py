@@ -0,0 +1,106 @@
+"""
+Benchmark: RecursiveCharacterTextSplitter vs the native single-pass chunker
+Run from the backend directory:
+    python benchmarks/bench_chunking.py [megabytes...]
+"""
+import random
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from config import settings
+from database.chunker import TextChunker
+
+SIZES_MB = [1, 5, 20]
+WORDS = (
+    "the of and to in a is that for on with as by this are be from at or an which "
+    "research method data analysis result model theory evidence sample study "
+    "significant experiment hypothesis variable measurement literature review"
+).split()
+
+
+def make_text(megabytes: int) -> str:
+    """Markdown-ish prose: headings, paragraphs of sentences, some long lines"""
+    rng = random.Random(11)
+    target = megabytes * 1024 * 1024
+    parts = []
+    size = 0
+    section = 0
+    while size < target:
+        if rng.random() < 0.05:
+            section += 1
+            block = f"## Section {section}"
+        else:
+            sentences = []
+            for _ in range(rng.randint(2, 9)):
+                words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 30)))
+                sentences.append(words.capitalize() + rng.choice([".", ".", ".", "?", "!"]))
+            block = " ".join(sentences)
+        parts.append(block)
+        size += len(block) + 2
+    return "\n\n".join(parts)
+
+
+def layouts(text: str):
+    """The text as markdown-ish prose and as PDF-like lines hard-wrapped at 90 characters"""
+    return [("prose", text), ("wrapped", "\n".join(textwrap.wrap(text.replace("\n\n", " "), 90)))]
+
+
+def legacy_split(text: str):
+    """Previous behaviour: a new splitter per document"""
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=settings.CHUNK_SIZE,
+        chunk_overlap=settings.CHUNK_OVERLAP,
+        separators=["\n\n", "\n", ". ", " ", ""],
+        add_start_index=True
+    )
+    return [(doc.metadata.get("start_index", -1), doc.page_content) for doc in splitter.create_documents([text])]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def sentence_aligned(chunks) -> float:
+    """Share of chunks that end on sentence punctuation"""
+    return sum(chunk.rstrip()[-1:] in ".?!" or chunk.startswith("#") for _, chunk in chunks) / len(chunks)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES_MB
+    recursive = TextChunker(strategy="recursive")
+    native = TextChunker(strategy="native")
+
+    print("=" * 78)
+    print(f"Chunking benchmark (CHUNK_SIZE={settings.CHUNK_SIZE}, CHUNK_OVERLAP={settings.CHUNK_OVERLAP})")
+    print("=" * 78)
+    print(f"{'MB':>4} {'layout':>7} {'chunker':>18} {'time':>9} {'MB/s':>7} {'chunks':>8} {'avg len':>8} {'sentence end':>13}")
+
+    cases = [
+        (megabytes, layout, text)
+        for megabytes in sizes
+        for layout, text in layouts(make_text(megabytes))
+    ]
+    for megabytes, layout, text in cases:
+        for label, split in (
+            ("recursive (new)", legacy_split),
+            ("recursive (reused)", recursive.split),
+            ("native", native.split),
+        ):
+            seconds, chunks = timed(split, text)
+            assert all(text[start:start + len(chunk)] == chunk for start, chunk in chunks), label
+            average = sum(len(chunk) for _, chunk in chunks) / len(chunks)
+            print(
+                f"{megabytes:>4} {layout:>7} {label:>18} {seconds:>8.2f}s {megabytes / seconds:>7.1f} "
+                f"{len(chunks):>8} {average:>8.0f} {sentence_aligned(chunks):>12.1%}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: Python-list vs NumPy-buffer embedding hand-off on ingest
+Run from the backend directory:
+    python benchmarks/bench_embedding_buffers.py [chunks]
+
+Compares the old path (embeddings.tolist() into Chroma) with passing the
+float32 matrix straight through, for one document's worth of chunks.
+Memory is the Python-side peak seen by tracemalloc (numpy buffers included;
+allocations inside Chroma's Rust core are not).
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from database.vector_backends import ChromaBackend
+
+NUM_CHUNKS = 10000
+DIMENSION = 384
+ADD_BATCH_SIZE = 5000
+REPEATS = 3
+
+
+def make_chunks(count: int):
+    rng = np.random.default_rng(3)
+    embeddings = rng.standard_normal((count, DIMENSION), dtype=np.float32)
+    ids = [f"chunk_{i}" for i in range(count)]
+    texts = [f"chunk text {i}" for i in range(count)]
+    metadatas = [{"document_id": "doc", "chunk_index": i} for i in range(count)]
+    return ids, embeddings, texts, metadatas
+
+
+def add_lists(collection, ids, embeddings, texts, metadatas):
+    """Previous behaviour: nested Python float lists"""
+    vectors = embeddings.tolist()
+    for start in range(0, len(ids), ADD_BATCH_SIZE):
+        end = start + ADD_BATCH_SIZE
+        collection.add(ids=ids[start:end], embeddings=vectors[start:end],
+                       documents=texts[start:end], metadatas=metadatas[start:end])
+
+
+def add_arrays(collection, ids, embeddings, texts, metadatas):
+    """Current behaviour: contiguous float32 matrix"""
+    for start in range(0, len(ids), ADD_BATCH_SIZE):
+        end = start + ADD_BATCH_SIZE
+        collection.add(ids=ids[start:end], embeddings=embeddings[start:end],
+                       documents=texts[start:end], metadatas=metadatas[start:end])
+
+
+def run(add, chunks, trace: bool):
+    """Ingest into a fresh collection; returns (seconds, peak MB)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        collection = ChromaBackend(persist_dir=tmp, collection_name="bench").collection
+        if trace:
+            tracemalloc.start()
+        began = time.perf_counter()
+        add(collection, *chunks)
+        elapsed = time.perf_counter() - began
+        peak = 0.0
+        if trace:
+            peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_CHUNKS
+    chunks = make_chunks(count)
+    embeddings = chunks[1]
+
+    print("=" * 60)
+    print(f"Embedding hand-off benchmark ({count} chunks, dim={DIMENSION})")
+    print("=" * 60)
+
+    # The conversion on its own (timed without tracing overhead)
+    began = time.perf_counter()
+    vectors = embeddings.tolist()
+    convert_seconds = time.perf_counter() - began
+    del vectors
+    tracemalloc.start()
+    vectors = embeddings.tolist()
+    convert_peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    del vectors
+    print(f"tolist() alone: {convert_seconds * 1000:.1f}ms, {convert_peak:.1f}MB "
+          f"(matrix itself: {embeddings.nbytes / 1024 / 1024:.1f}MB)")
+
+    print(f"{'path':>8} {'ingest (best of ' + str(REPEATS) + ')':>22} {'python peak':>12}")
+    for label, add in (("lists", add_lists), ("arrays", add_arrays)):
+        best = min(run(add, chunks, trace=False)[0] for _ in range(REPEATS))
+        _, peak = run(add, chunks, trace=True)
+        print(f"{label:>8} {best:>21.2f}s {peak:>10.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: whole-document vs streamed extraction and chunking of a PDF
+Run from the backend directory:
+    python benchmarks/bench_ingest_pipeline.py [pages...]
+
+Measures the stages in front of embedding: time until the first chunk is
+ready to embed, total time, and the Python-side peak memory (tracemalloc).
+Extraction runs in this process (parallel=False) so all of it is traced.
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_pdf_extraction import make_pdf
+from database.chunker import TextChunker
+from services.pdf_handler import PDFHandler
+
+PAGE_COUNTS = [100, 500]
+
+
+def whole_document(path: Path, chunker: TextChunker):
+    """Previous behaviour: extract every page, join, then chunk"""
+    began = time.perf_counter()
+    result = PDFHandler.extract_text_and_metadata(str(path), parallel=False)
+    chunks = chunker.split(result["text"])
+    first = time.perf_counter() - began
+    return first, len(chunks)
+
+
+def streamed(path: Path, chunker: TextChunker):
+    """Current behaviour: chunks are emitted as pages are extracted"""
+    began = time.perf_counter()
+    first = None
+    count = 0
+    stream = chunker.stream()
+    separator = ""
+    for page_number, page_text in PDFHandler.open_pages(str(path), parallel=False)["pages"]:
+        chunks = stream.feed(f"{separator}[Page {page_number}]\n{page_text}")
+        separator = "\n\n"
+        if chunks and first is None:
+            first = time.perf_counter() - began
+        # Chunks are handed to the embedder and dropped
+        count += len(chunks)
+    count += len(stream.finish())
+    return first if first is not None else time.perf_counter() - began, count
+
+
+def run(func, path: Path, chunker: TextChunker):
+    """Returns (seconds to first chunk, total seconds, chunks, peak MB)"""
+    tracemalloc.start()
+    began = time.perf_counter()
+    first, count = func(path, chunker)
+    total = time.perf_counter() - began
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return first, total, count, peak
+
+
+def main():
+    page_counts = [int(arg) for arg in sys.argv[1:]] or PAGE_COUNTS
+    chunker = TextChunker(strategy="native")
+
+    print("=" * 66)
+    print("Ingest pipeline benchmark (extraction + chunking)")
+    print("=" * 66)
+    print(f"{'pages':>6} {'path':>7} {'first chunk':>12} {'total':>9} {'chunks':>8} {'python peak':>12}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_pages in page_counts:
+            path = Path(tmp) / f"bench_{num_pages}.pdf"
+            make_pdf(path, num_pages)
+            for label, func in (("whole", whole_document), ("stream", streamed)):
+                first, total, count, peak = run(func, path, chunker)
+                print(f"{num_pages:>6} {label:>7} {first:>11.2f}s {total:>8.2f}s {count:>8} {peak:>10.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
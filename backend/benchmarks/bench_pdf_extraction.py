@@ -0,0 +1,67 @@
+"""
+Benchmark: sequential vs parallel PDF text extraction
+Run from the backend directory: python benchmarks/bench_pdf_extraction.py
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from services.pdf_handler import PDFHandler, shutdown_process_pool
+
+PAGE_COUNTS = [100, 250, 500, 1000]
+LINES_PER_PAGE = 45
+
+
+def make_pdf(path: Path, num_pages: int):
+    """Write a synthetic text-heavy PDF"""
+    pdf = canvas.Canvas(str(path), pagesize=A4)
+    pdf.setTitle("Benchmark document")
+    pdf.setAuthor("UB360.ai")
+    for page in range(num_pages):
+        y = 800
+        for line in range(LINES_PER_PAGE):
+            pdf.drawString(40, y, f"Page {page + 1} line {line + 1}: the quick brown fox jumps over the lazy dog.")
+            y -= 17
+        pdf.showPage()
+    pdf.save()
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    print("=" * 60)
+    print("PDF extraction benchmark (sequential vs parallel)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Warm the process pool so spawn cost is not charged to the first run
+        warm_path = Path(tmp) / "warm.pdf"
+        make_pdf(warm_path, 4)
+        PDFHandler.extract_text_and_metadata(str(warm_path), parallel=True)
+
+        print(f"{'pages':>6} {'sequential':>12} {'parallel':>12} {'speedup':>8}")
+        for num_pages in PAGE_COUNTS:
+            path = Path(tmp) / f"bench_{num_pages}.pdf"
+            make_pdf(path, num_pages)
+
+            seq_time, seq_result = timed(PDFHandler.extract_text_and_metadata, str(path), parallel=False)
+            par_time, par_result = timed(PDFHandler.extract_text_and_metadata, str(path), parallel=True)
+
+            assert seq_result["text"] == par_result["text"], "parallel output differs"
+            print(f"{num_pages:>6} {seq_time:>11.2f}s {par_time:>11.2f}s {seq_time / par_time:>7.2f}x")
+
+    shutdown_process_pool()
+
+
+if __name__ == "__main__":
+    main()
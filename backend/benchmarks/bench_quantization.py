@@ -0,0 +1,89 @@
+"""
+Benchmark: recall and size of quantized vector storage (NumPy backend)
+Run from the backend directory:
+    python benchmarks/bench_quantization.py [chunks]
+
+Vectors are synthetic but embedding-like: unit length, grouped around topic
+centres, so nearest neighbours are close together and quantization error
+matters. Recall@k is the overlap with float32 exact search.
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from database.vector_backends import NumpyBackend
+
+NUM_CHUNKS = 100000
+DIMENSION = 384
+NUM_TOPICS = 500
+NUM_QUERIES = 200
+ADD_BATCH_SIZE = 5000
+RECALL_AT = [1, 5, 10, 20]
+STORAGE_TYPES = ["float32", "float16", "int8"]
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def make_corpus(rng, count: int):
+    """Chunks and queries clustered around shared topic centres"""
+    centres = normalize(rng.standard_normal((NUM_TOPICS, DIMENSION), dtype=np.float32))
+    topics = rng.integers(0, NUM_TOPICS, count)
+    chunks = normalize(centres[topics] + 0.08 * rng.standard_normal((count, DIMENSION), dtype=np.float32))
+    query_topics = rng.integers(0, NUM_TOPICS, NUM_QUERIES)
+    queries = normalize(centres[query_topics] + 0.08 * rng.standard_normal((NUM_QUERIES, DIMENSION), dtype=np.float32))
+    return chunks.astype(np.float32), queries.astype(np.float32)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_CHUNKS
+    chunks, queries = make_corpus(np.random.default_rng(7), count)
+    k = max(RECALL_AT)
+
+    print("=" * 72)
+    print(f"Quantized storage benchmark ({count} chunks, dim={DIMENSION}, {NUM_QUERIES} queries)")
+    print("=" * 72)
+    header = " ".join(f"{'R@' + str(n):>7}" for n in RECALL_AT)
+    print(f"{'storage':>8} {'matrix':>10} {'add':>8} {'query':>9} {header}")
+
+    baseline = None
+    for storage in STORAGE_TYPES:
+        with tempfile.TemporaryDirectory() as tmp:
+            backend = NumpyBackend(index_dir=tmp, quantization=storage)
+
+            began = time.perf_counter()
+            for start in range(0, count, ADD_BATCH_SIZE):
+                end = min(start + ADD_BATCH_SIZE, count)
+                backend.add(
+                    [str(i) for i in range(start, end)],
+                    chunks[start:end],
+                    [""] * (end - start),
+                    [{"document_id": f"doc_{i // 100}"} for i in range(start, end)]
+                )
+            add_seconds = time.perf_counter() - began
+
+            began = time.perf_counter()
+            results = [[hit["id"] for hit in backend.query(query, k)] for query in queries]
+            query_ms = (time.perf_counter() - began) / NUM_QUERIES * 1000
+
+            matrix_mb = count * DIMENSION * np.dtype(backend.dtype).itemsize / 1024 / 1024
+            backend.close()
+
+        if baseline is None:
+            baseline = results
+        recalls = [
+            np.mean([len(set(got[:n]) & set(exact[:n])) / n for got, exact in zip(results, baseline)])
+            for n in RECALL_AT
+        ]
+        recall_text = " ".join(f"{recall:>7.4f}" for recall in recalls)
+        print(f"{storage:>8} {matrix_mb:>8.1f}MB {add_seconds:>7.2f}s {query_ms:>7.2f}ms {recall_text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: Chroma vs NumPy memory-mapped vector backend
+Run from the backend directory:
+    python benchmarks/bench_vector_backends.py [sizes...] [--backends chroma,numpy]
+e.g. python benchmarks/bench_vector_backends.py 1000 100000 1000000
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from database.vector_backends import ChromaBackend, NumpyBackend
+
+CHUNK_COUNTS = [1000, 100000, 1000000]
+DIMENSION = 384
+ADD_BATCH_SIZE = 5000
+NUM_QUERIES = 50
+TOP_K = 5
+
+
+def make_backend(name: str, directory: str):
+    if name == "chroma":
+        return ChromaBackend(persist_dir=directory, collection_name="bench")
+    return NumpyBackend(index_dir=directory)
+
+
+def random_vectors(rng, count: int) -> np.ndarray:
+    """Unit-length float32 vectors, like normalized sentence embeddings"""
+    vectors = rng.standard_normal((count, DIMENSION), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def fill(backend, rng, count: int) -> float:
+    """Add count chunks across 100-chunk documents; returns seconds"""
+    elapsed = 0.0
+    for start in range(0, count, ADD_BATCH_SIZE):
+        size = min(ADD_BATCH_SIZE, count - start)
+        vectors = random_vectors(rng, size)
+        ids = [f"chunk_{start + i}" for i in range(size)]
+        metadatas = [
+            {"document_id": f"doc_{(start + i) // 100}", "chunk_index": (start + i) % 100}
+            for i in range(size)
+        ]
+        texts = [f"chunk text {start + i}" for i in range(size)]
+
+        began = time.perf_counter()
+        backend.add(ids, vectors, texts, metadatas)
+        elapsed += time.perf_counter() - began
+    return elapsed
+
+
+def query_latency(backend, rng, document_ids=None) -> float:
+    """Average milliseconds per top-k query"""
+    queries = random_vectors(rng, NUM_QUERIES)
+    backend.query(queries[0], TOP_K, document_ids)  # warm caches / page in
+    began = time.perf_counter()
+    for query in queries:
+        backend.query(query, TOP_K, document_ids)
+    return (time.perf_counter() - began) / NUM_QUERIES * 1000
+
+
+def parse_args(argv):
+    sizes = [int(arg) for arg in argv if arg.isdigit()]
+    backends = ["chroma", "numpy"]
+    if "--backends" in argv:
+        backends = argv[argv.index("--backends") + 1].split(",")
+    return sizes or CHUNK_COUNTS, backends
+
+
+def main():
+    sizes, backends = parse_args(sys.argv[1:])
+
+    print("=" * 72)
+    print(f"Vector backend benchmark (dim={DIMENSION}, top_k={TOP_K}, {NUM_QUERIES} queries)")
+    print("=" * 72)
+    print(f"{'backend':>8} {'chunks':>9} {'add':>10} {'add/s':>10} {'query':>10} {'filtered':>10}")
+
+    for count in sizes:
+        for name in backends:
+            rng = np.random.default_rng(42)
+            with tempfile.TemporaryDirectory() as tmp:
+                backend = make_backend(name, tmp)
+                add_seconds = fill(backend, rng, count)
+                all_ms = query_latency(backend, rng)
+                filtered_ms = query_latency(backend, rng, ["doc_0", "doc_1"])
+                backend.close()
+
+            print(
+                f"{name:>8} {count:>9} {add_seconds:>9.2f}s {count / add_seconds:>10.0f} "
+                f"{all_ms:>8.2f}ms {filtered_ms:>8.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
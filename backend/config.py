@@ -24,29 +24,102 @@ class Settings:
     GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY", "")
     GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
     GEMINI_TEMPERATURE: float = float(os.getenv("GEMINI_TEMPERATURE", "0.1"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    
+    # Answer Cache
+    ANSWER_CACHE_ENABLED: bool = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+    ANSWER_CACHE_SIZE: int = int(os.getenv("ANSWER_CACHE_SIZE", "1000"))
+    ANSWER_CACHE_TTL_SECONDS: float = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "3600"))
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = float(os.getenv("ANSWER_CACHE_SIMILARITY_THRESHOLD", "0"))
     
     # Vector Database
     CHROMA_PERSIST_DIR: str = os.getenv("CHROMA_PERSIST_DIR", "./chroma_db")
     CHROMA_COLLECTION_NAME: str = os.getenv("CHROMA_COLLECTION_NAME", "research_documents")
+    VECTOR_BACKEND: str = os.getenv("VECTOR_BACKEND", "chroma")
+    NUMPY_INDEX_DIR: str = os.getenv("NUMPY_INDEX_DIR", "./vector_index")
+    VECTOR_QUANTIZATION: str = os.getenv("VECTOR_QUANTIZATION", "none")
     
     # Embedding Model
     EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+    EMBEDDING_WORKERS: int = int(os.getenv("EMBEDDING_WORKERS", "2"))
+    EMBEDDING_BATCH_WINDOW_MS: float = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "5"))
+    EMBEDDING_MAX_BATCH_SIZE: int = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", "64"))
+    QUERY_EMBEDDING_CACHE_SIZE: int = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "10000"))
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS: float = float(os.getenv("QUERY_EMBEDDING_CACHE_TTL_SECONDS", "86400"))
+    QUERY_EMBEDDING_CACHE_PATH: str = os.getenv("QUERY_EMBEDDING_CACHE_PATH", "")
+    WARMUP_ON_STARTUP: bool = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
     
     # Document Processing
     MAX_FILE_SIZE_MB: int = int(os.getenv("MAX_FILE_SIZE_MB", "50"))
+    UPLOAD_CHUNK_SIZE_KB: int = int(os.getenv("UPLOAD_CHUNK_SIZE_KB", "1024"))
     ALLOWED_EXTENSIONS: list = [".pdf", ".docx", ".txt", ".md"]
     CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "1000"))
     CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", "200"))
+    CHUNKER: str = os.getenv("CHUNKER", "native")
+    INGEST_BATCH_SIZE: int = int(os.getenv("INGEST_BATCH_SIZE", "256"))
+    INGEST_PIPELINE_QUEUE_SIZE: int = int(os.getenv("INGEST_PIPELINE_QUEUE_SIZE", "4"))
+    
+    # PDF Extraction
+    PDF_PARALLEL_EXTRACTION: bool = os.getenv("PDF_PARALLEL_EXTRACTION", "true").lower() == "true"
+    PDF_PARALLEL_MIN_PAGES: int = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "50"))
+    PDF_EXTRACT_WORKERS: int = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+    
+    # Background Ingestion
+    INGEST_BACKGROUND_DEFAULT: bool = os.getenv("INGEST_BACKGROUND_DEFAULT", "false").lower() == "true"
+    INGEST_WORKERS: int = int(os.getenv("INGEST_WORKERS", "2"))
+    INGEST_QUEUE_SIZE: int = int(os.getenv("INGEST_QUEUE_SIZE", "20"))
+    INGEST_JOB_RETENTION_SECONDS: float = float(os.getenv("INGEST_JOB_RETENTION_SECONDS", "3600"))
+    INGEST_RETRY_AFTER_SECONDS: int = int(os.getenv("INGEST_RETRY_AFTER_SECONDS", "10"))
+    
+    # Web Scraping
+    SCRAPER_TIMEOUT_SECONDS: float = float(os.getenv("SCRAPER_TIMEOUT_SECONDS", "10"))
+    SCRAPER_MAX_CONNECTIONS: int = int(os.getenv("SCRAPER_MAX_CONNECTIONS", "20"))
+    SCRAPER_MAX_PER_HOST: int = int(os.getenv("SCRAPER_MAX_PER_HOST", "4"))
+    SCRAPER_MAX_RESPONSE_MB: float = float(os.getenv("SCRAPER_MAX_RESPONSE_MB", "5"))
+    SCRAPER_CACHE_SIZE: int = int(os.getenv("SCRAPER_CACHE_SIZE", "200"))
+    
+    # Batch Upload
+    BATCH_UPLOAD_MAX_FILES: int = int(os.getenv("BATCH_UPLOAD_MAX_FILES", "50"))
+    BATCH_INGEST_CONCURRENCY: int = int(os.getenv("BATCH_INGEST_CONCURRENCY", "4"))
+    # Total decompressed size of the zip archives in one batch
+    BATCH_UPLOAD_MAX_ARCHIVE_MB: int = int(os.getenv("BATCH_UPLOAD_MAX_ARCHIVE_MB", "200"))
     
     # Upload Directory
     UPLOAD_DIR: Path = Path(os.getenv("UPLOAD_DIR", "./uploads"))
     
+    # Document metadata database (SQLite, shared by all workers)
+    METADATA_DB_PATH: str = os.getenv("METADATA_DB_PATH", str(UPLOAD_DIR / "documents_metadata.db"))
+    
+    # Persistent chunk embedding cache (SQLite, keyed by model + chunk text hash)
+    CHUNK_EMBEDDING_CACHE_ENABLED: bool = os.getenv("CHUNK_EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    CHUNK_EMBEDDING_CACHE_PATH: str = os.getenv("CHUNK_EMBEDDING_CACHE_PATH", str(UPLOAD_DIR / "chunk_embeddings.db"))
+    CHUNK_EMBEDDING_CACHE_MAX_ENTRIES: int = int(os.getenv("CHUNK_EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+    
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "60"))
     
     # Search Configuration
     DEFAULT_SEARCH_RESULTS: int = int(os.getenv("DEFAULT_SEARCH_RESULTS", "5"))
     MAX_SEARCH_RESULTS: int = int(os.getenv("MAX_SEARCH_RESULTS", "20"))
+    # vector (dense only), lexical (BM25 only) or hybrid (both, fused with RRF)
+    SEARCH_MODE: str = os.getenv("SEARCH_MODE", "vector").lower()
+    # Candidates fetched from each retriever before fusion, per requested result
+    HYBRID_CANDIDATE_MULTIPLIER: int = int(os.getenv("HYBRID_CANDIDATE_MULTIPLIER", "3"))
+    # Reciprocal rank fusion constant (higher flattens rank differences)
+    RRF_K: int = int(os.getenv("RRF_K", "60"))
+    # BM25 keyword index kept alongside the Chroma collection
+    LEXICAL_INDEX_PATH: str = os.getenv("LEXICAL_INDEX_PATH", str(Path(CHROMA_PERSIST_DIR) / "lexical_index.db"))
+    # Optional cross-encoder rerank of over-fetched candidates
+    RERANK_ENABLED: bool = os.getenv("RERANK_ENABLED", "false").lower() == "true"
+    RERANK_MODEL: str = os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+    RERANK_CANDIDATE_MULTIPLIER: int = int(os.getenv("RERANK_CANDIDATE_MULTIPLIER", "4"))
+    RERANK_MAX_CANDIDATES: int = int(os.getenv("RERANK_MAX_CANDIDATES", "50"))
+    RERANK_BATCH_SIZE: int = int(os.getenv("RERANK_BATCH_SIZE", "32"))
+    
+    # Prompt budgets (tokens estimated as characters / CHARS_PER_TOKEN)
+    CONTEXT_MAX_TOKENS: int = int(os.getenv("CONTEXT_MAX_TOKENS", "6000"))
+    HISTORY_MAX_TOKENS: int = int(os.getenv("HISTORY_MAX_TOKENS", "1500"))
+    CHARS_PER_TOKEN: int = int(os.getenv("CHARS_PER_TOKEN", "4"))
     
     # UB360.ai Branding
     BRAND_NAME: str = "UB360.ai"
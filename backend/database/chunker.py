@@ -0,0 +1,243 @@
+"""
+Text chunking
+Splits document text into overlapping chunks with their character offsets
+(settings.CHUNKER):
+- native:    single pass over the text (which may arrive in segments, e.g.
+             page by page), breaking at the best boundary
+             (paragraph, sentence, line, word) before CHUNK_SIZE and starting
+             the overlap at a sentence, line or word start
+- recursive: LangChain's RecursiveCharacterTextSplitter (needs the whole
+             text, so streamed segments are buffered until the end)
+"""
+from typing import List, Optional, Tuple
+
+from config import settings
+
+
+class TextChunker:
+    """Configured chunker, built once and reused for every document"""
+
+    STRATEGIES = ("native", "recursive")
+
+    # Sentence ends: punctuation followed by a space or line break, when the
+    # next sentence does not start lowercase (so "e.g. the" is not a break)
+    SENTENCE_ENDS = (". ", "? ", "! ", ".\n", "?\n", "!\n")
+
+    def __init__(
+        self,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        strategy: Optional[str] = None
+    ):
+        """
+        Configure the chunker
+
+        Args:
+            chunk_size: Maximum characters per chunk (default: settings.CHUNK_SIZE)
+            chunk_overlap: Characters shared by consecutive chunks (default: settings.CHUNK_OVERLAP)
+            strategy: native or recursive (default: settings.CHUNKER)
+        """
+        self.chunk_size = chunk_size or settings.CHUNK_SIZE
+        self.chunk_overlap = settings.CHUNK_OVERLAP if chunk_overlap is None else chunk_overlap
+        self.strategy = (strategy or settings.CHUNKER).lower()
+        if self.strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown chunker: {self.strategy}. Use one of {list(self.STRATEGIES)}")
+        if self.chunk_overlap >= self.chunk_size:
+            raise ValueError("CHUNK_OVERLAP must be smaller than CHUNK_SIZE")
+
+        self._splitter = None
+        if self.strategy == "recursive":
+            from langchain_text_splitters import RecursiveCharacterTextSplitter
+            self._splitter = RecursiveCharacterTextSplitter(
+                chunk_size=self.chunk_size,
+                chunk_overlap=self.chunk_overlap,
+                separators=["\n\n", "\n", ". ", " ", ""],
+                add_start_index=True
+            )
+
+    def split(self, text: str) -> List[Tuple[int, str]]:
+        """
+        Split text into chunks
+
+        Args:
+            text: Input text to chunk
+
+        Returns:
+            List of (start offset in text, chunk text)
+        """
+        stream = self.stream()
+        return stream.feed(text) + stream.finish()
+
+    def stream(self) -> "ChunkStream":
+        """
+        Start chunking a document whose text arrives in segments
+
+        Returns:
+            ChunkStream for one document
+        """
+        return ChunkStream(self)
+
+    @staticmethod
+    def _skip_space(text: str, position: int, length: int) -> int:
+        while position < length and text[position].isspace():
+            position += 1
+        return position
+
+    @classmethod
+    def _last_sentence_end(cls, text: str, lower: int, upper: int) -> int:
+        """Offset just past the last sentence end in text[lower:upper], or -1"""
+        while True:
+            index = max(text.rfind(end, lower, upper) for end in cls.SENTENCE_ENDS)
+            if index == -1:
+                return -1
+            if not text[index + 2:index + 3].islower():
+                return index + 1
+            upper = index + 1
+
+    @classmethod
+    def _first_sentence_start(cls, text: str, lower: int, upper: int) -> int:
+        """Offset of the first sentence start in text[lower:upper], or -1"""
+        while lower < upper:
+            found = [i for i in (text.find(end, lower, upper) for end in cls.SENTENCE_ENDS) if i != -1]
+            if not found:
+                return -1
+            index = min(found)
+            if index + 2 < upper and not text[index + 2].islower():
+                return index + 2
+            lower = index + 1
+        return -1
+
+    @classmethod
+    def _break_at(cls, text: str, start: int, limit: int) -> int:
+        """
+        End offset for a chunk starting at start: the last paragraph,
+        sentence, line or word boundary in the second half of the window,
+        else limit
+        """
+        lower = start + (limit - start) // 2
+
+        index = text.rfind("\n\n", lower, limit)
+        if index != -1:
+            return index
+
+        index = cls._last_sentence_end(text, lower, limit)
+        if index != -1:
+            return index
+
+        for separator in ("\n", " "):
+            index = text.rfind(separator, lower, limit)
+            if index != -1:
+                return index
+        return limit
+
+    @classmethod
+    def _overlap_start(cls, text: str, start: int, end: int, overlap: int) -> int:
+        """
+        First sentence, line or word start inside the last overlap characters
+        of the chunk text[start:end]
+        """
+        lower = max(end - overlap, start + 1)
+
+        index = cls._first_sentence_start(text, lower, end)
+        if index != -1:
+            return index
+
+        for separator in ("\n", " "):
+            index = text.find(separator, lower, end)
+            if index != -1:
+                return index + 1
+        return lower
+
+
+class ChunkStream:
+    """
+    Incremental chunking for one document
+
+    Text is fed in segments; a chunk is emitted as soon as the text it could
+    depend on (its CHUNK_SIZE window plus one character) has arrived, so the
+    chunks are identical to chunking the whole text at once. Only the text
+    from the next chunk's start onward is kept.
+    """
+
+    def __init__(self, chunker: TextChunker):
+        self.chunker = chunker
+        self._buffer = ""
+        # Offset of _buffer[0] in the document, and of the next chunk start
+        self._base = 0
+        self._position = 0
+        self._parts: List[str] = []
+
+    def feed(self, text: str) -> List[Tuple[int, str]]:
+        """
+        Add the next segment of text
+
+        Args:
+            text: Text following everything fed so far
+
+        Returns:
+            Chunks completed by this segment, as (start offset, chunk text)
+        """
+        if self.chunker._splitter is not None:
+            self._parts.append(text)
+            return []
+        self._buffer += text
+        return self._drain(final=False)
+
+    def finish(self) -> List[Tuple[int, str]]:
+        """
+        Flush the remaining chunks at the end of the document
+
+        Returns:
+            Remaining chunks, as (start offset, chunk text)
+        """
+        if self.chunker._splitter is not None:
+            text = "".join(self._parts)
+            self._parts = []
+            return [
+                (doc.metadata.get("start_index", -1), doc.page_content)
+                for doc in self.chunker._splitter.create_documents([text])
+            ]
+        return self._drain(final=True)
+
+    def _drain(self, final: bool) -> List[Tuple[int, str]]:
+        """Emit every chunk whose window is complete"""
+        chunker = self.chunker
+        size, overlap = chunker.chunk_size, chunker.chunk_overlap
+        text, base = self._buffer, self._base
+        length = len(text)
+        position = self._position - base
+        chunks = []
+
+        while True:
+            position = chunker._skip_space(text, position, length)
+            if position >= length:
+                break
+
+            limit = position + size
+            if limit >= length:
+                if not final:
+                    # Wait for more text: a later boundary may still fit
+                    break
+                end = length
+            else:
+                end = chunker._break_at(text, position, limit)
+
+            # Trim trailing whitespace so the chunk holds only content
+            chunk_end = end
+            while chunk_end > position and text[chunk_end - 1].isspace():
+                chunk_end -= 1
+            if chunk_end > position:
+                chunks.append((base + position, text[position:chunk_end]))
+
+            if end >= length:
+                position = length
+                break
+            next_position = chunker._overlap_start(text, position, end, overlap) if overlap else end
+            # Always move forward, even if the overlap would start earlier
+            position = next_position if next_position > position else end
+
+        # Drop text no later chunk can include
+        self._buffer = text[position:]
+        self._base = base + position
+        self._position = self._base
+        return chunks
@@ -0,0 +1,355 @@
+"""
+Embedding caches
+Keeps recently computed query embeddings so repeated questions skip the model,
+and chunk embeddings on disk so re-ingesting unchanged text skips it too
+"""
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+import numpy as np
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for cache keys (Unicode form, case and whitespace)
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Normalized text
+    """
+    text = unicodedata.normalize("NFKC", text)
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+class QueryEmbeddingCache:
+    """In-process LRU cache of query embeddings with TTL and optional persistence"""
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl_seconds: float = 86400,
+        persist_path: Optional[str] = None
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_size: Maximum number of cached embeddings
+            ttl_seconds: Lifetime of an entry (0 disables expiry)
+            persist_path: Optional .npz file to load from and save to
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.persist_path = Path(persist_path) if persist_path else None
+        self._entries: "OrderedDict[str, Tuple[np.ndarray, float]]" = OrderedDict()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        if self.persist_path:
+            self.load()
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        """Cache key for a model and query text"""
+        return f"{model_name}\x00{normalize_text(text)}"
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def get(self, model_name: str, text: str) -> Optional[np.ndarray]:
+        """
+        Look up a cached embedding
+
+        Args:
+            model_name: Embedding model name
+            text: Query text
+
+        Returns:
+            Cached embedding or None
+        """
+        key = self.make_key(model_name, text)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        embedding, created_at = entry
+        if self._is_expired(created_at, time.time()):
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return embedding
+
+    def put(self, model_name: str, text: str, embedding: np.ndarray) -> np.ndarray:
+        """
+        Store an embedding, evicting the least recently used entry if full
+
+        Args:
+            model_name: Embedding model name
+            text: Query text
+            embedding: Embedding vector
+
+        Returns:
+            The stored vector: a read-only copy, since every later hit
+            hands the same array to its caller
+        """
+        embedding = np.array(embedding, dtype=np.float32)
+        embedding.setflags(write=False)
+
+        key = self.make_key(model_name, text)
+        self._entries[key] = (embedding, time.time())
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return embedding
+
+    def clear(self):
+        """Drop all cached embeddings"""
+        self._entries.clear()
+
+    def load(self):
+        """Load persisted entries, skipping expired ones"""
+        if not self.persist_path or not self.persist_path.exists():
+            return
+
+        try:
+            data = np.load(self.persist_path)
+            now = time.time()
+            for key, vector, created_at in zip(data["keys"], data["vectors"], data["created"]):
+                if not self._is_expired(float(created_at), now):
+                    vector.setflags(write=False)
+                    self._entries[str(key)] = (vector, float(created_at))
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+            print(f"✅ Loaded {len(self._entries)} cached query embeddings")
+        except Exception as e:
+            print(f"⚠️  Could not load query embedding cache: {e}")
+
+    def save(self):
+        """Persist entries to disk (no-op without persist_path)"""
+        if not self.persist_path or not self._entries:
+            return
+
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            keys = list(self._entries.keys())
+            vectors = np.stack([self._entries[k][0] for k in keys])
+            created = np.array([self._entries[k][1] for k in keys])
+
+            # Write to a temp file first so a crash never leaves a torn cache
+            tmp_path = self.persist_path.with_suffix(".tmp.npz")
+            np.savez(tmp_path, keys=np.array(keys), vectors=vectors, created=created)
+            tmp_path.replace(self.persist_path)
+            print(f"💾 Saved {len(keys)} cached query embeddings")
+        except Exception as e:
+            print(f"⚠️  Could not save query embedding cache: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics
+
+        Returns:
+            Hit/miss counters and size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class ChunkEmbeddingCache:
+    """SQLite-backed cache of chunk embeddings keyed by (model, SHA-256 of text)"""
+
+    # SQLite's default limit on bound parameters is 999
+    LOOKUP_BATCH_SIZE = 500
+
+    # Writes between exact recounts (other workers share the database)
+    RECOUNT_INTERVAL = 100
+
+    def __init__(self, db_path: str, max_entries: int = 200000):
+        """
+        Open (and create if needed) the cache database
+
+        Args:
+            db_path: SQLite file
+            max_entries: Oldest entries are dropped beyond this many
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS chunk_embeddings (
+                model      TEXT NOT NULL,
+                text_hash  TEXT NOT NULL,
+                vector     BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_chunk_embeddings_created "
+            "ON chunk_embeddings(created_at)"
+        )
+        self._conn.commit()
+
+        # Running entry count, so writes and stats() avoid a COUNT(*) scan
+        self._size = self._count()
+        self._writes_since_count = 0
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _count(self) -> int:
+        """Exact number of entries (full scan; caller holds the lock or is __init__)"""
+        return self._conn.execute("SELECT COUNT(*) FROM chunk_embeddings").fetchone()[0]
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """Hash of the exact chunk text (no normalization: it changes the vector)"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, model_name: str, texts: List[str]) -> Dict[int, np.ndarray]:
+        """
+        Look up cached embeddings
+
+        Args:
+            model_name: Embedding model name
+            texts: Chunk texts
+
+        Returns:
+            Mapping of index in texts to embedding, for cached texts only
+        """
+        hashes = [self.text_hash(text) for text in texts]
+        found: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            unique = list(dict.fromkeys(hashes))
+            for start in range(0, len(unique), self.LOOKUP_BATCH_SIZE):
+                batch = unique[start:start + self.LOOKUP_BATCH_SIZE]
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM chunk_embeddings "
+                    f"WHERE model = ? AND text_hash IN ({', '.join('?' * len(batch))})",
+                    (model_name, *batch)
+                ).fetchall()
+                for text_hash, vector in rows:
+                    found[text_hash] = np.frombuffer(vector, dtype=np.float32)
+
+        result = {i: found[h] for i, h in enumerate(hashes) if h in found}
+        self.hits += len(result)
+        self.misses += len(texts) - len(result)
+        return result
+
+    def put_many(self, model_name: str, texts: List[str], embeddings: np.ndarray):
+        """
+        Store embeddings, dropping the oldest entries beyond max_entries
+
+        Args:
+            model_name: Embedding model name
+            texts: Chunk texts
+            embeddings: Embedding matrix (one row per text)
+        """
+        if not texts:
+            return
+
+        now = time.time()
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        rows = [
+            (model_name, self.text_hash(text), vectors[i].tobytes(), now)
+            for i, text in enumerate(texts)
+        ]
+
+        with self._lock:
+            with self._conn:
+                # Insert new texts (rowcount = rows added), refresh the rest
+                inserted = self._conn.executemany(
+                    "INSERT OR IGNORE INTO chunk_embeddings VALUES (?, ?, ?, ?)",
+                    rows
+                ).rowcount
+                if inserted < len(rows):
+                    self._conn.executemany(
+                        "UPDATE chunk_embeddings SET vector = ?, created_at = ? "
+                        "WHERE model = ? AND text_hash = ?",
+                        [
+                            (vector, created_at, model, text_hash)
+                            for model, text_hash, vector, created_at in rows
+                        ]
+                    )
+                self._size += inserted
+                self._writes_since_count += 1
+
+                # The running count misses other workers' writes: recount
+                # before evicting, and every RECOUNT_INTERVAL writes
+                if self._size > self.max_entries or self._writes_since_count >= self.RECOUNT_INTERVAL:
+                    self._size = self._count()
+                    self._writes_since_count = 0
+
+                excess = self._size - self.max_entries
+                if excess > 0:
+                    self._conn.execute(
+                        "DELETE FROM chunk_embeddings WHERE rowid IN ("
+                        "SELECT rowid FROM chunk_embeddings ORDER BY created_at LIMIT ?)",
+                        (excess,)
+                    )
+                    self._size -= excess
+                    self.evictions += excess
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics
+
+        Returns:
+            Hit/miss counters and size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": self._size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
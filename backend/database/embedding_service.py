@@ -0,0 +1,295 @@
+"""
+Embedding service
+Runs SentenceTransformer encodes on a dedicated thread pool so they never
+pin the event loop, and coalesces concurrent query encodes (and small
+document batches from concurrent ingestions) into batches
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Tuple, Optional
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from config import settings
+from database.embedding_cache import QueryEmbeddingCache, ChunkEmbeddingCache
+
+
+class EmbeddingService:
+    """Shared embedding model behind an executor with query micro-batching"""
+
+    def __init__(
+        self,
+        model_name: str = None,
+        max_workers: int = None,
+        batch_window_ms: float = None,
+        max_batch_size: int = None,
+        max_document_batch_size: int = None,
+        query_cache: QueryEmbeddingCache = None,
+        chunk_cache: Optional[ChunkEmbeddingCache] = None
+    ):
+        """
+        Load the embedding model and start the executor
+
+        Args:
+            model_name: SentenceTransformer model (default: settings.EMBEDDING_MODEL)
+            max_workers: Encode threads (default: settings.EMBEDDING_WORKERS)
+            batch_window_ms: How long to wait for more queries before encoding
+            max_batch_size: Flush a query batch as soon as it reaches this size
+            max_document_batch_size: Chunks per coalesced document encode
+                (default: settings.INGEST_BATCH_SIZE)
+            query_cache: Query embedding cache (built from settings if omitted)
+            chunk_cache: Chunk embedding cache (built from settings if omitted
+                and CHUNK_EMBEDDING_CACHE_ENABLED)
+        """
+        self.model_name = model_name or settings.EMBEDDING_MODEL
+        self.batch_window = (batch_window_ms if batch_window_ms is not None
+                             else settings.EMBEDDING_BATCH_WINDOW_MS) / 1000
+        self.max_batch_size = max_batch_size or settings.EMBEDDING_MAX_BATCH_SIZE
+        self.max_document_batch_size = max_document_batch_size or settings.INGEST_BATCH_SIZE
+
+        print(f"📦 Loading embedding model: {self.model_name}")
+        self.model = SentenceTransformer(self.model_name)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.EMBEDDING_WORKERS,
+            thread_name_prefix="embedding"
+        )
+
+        # Repeated questions skip the model entirely
+        self.query_cache = query_cache or QueryEmbeddingCache(
+            max_size=settings.QUERY_EMBEDDING_CACHE_SIZE,
+            ttl_seconds=settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+            persist_path=settings.QUERY_EMBEDDING_CACHE_PATH or None
+        )
+
+        # Unchanged chunks of re-ingested documents skip the model
+        if chunk_cache is None and settings.CHUNK_EMBEDDING_CACHE_ENABLED:
+            chunk_cache = ChunkEmbeddingCache(
+                db_path=settings.CHUNK_EMBEDDING_CACHE_PATH,
+                max_entries=settings.CHUNK_EMBEDDING_CACHE_MAX_ENTRIES
+            )
+        self.chunk_cache = chunk_cache
+
+        # Pending query encodes waiting for the current batch window.
+        # Only touched from the event loop thread.
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle = None
+
+        # Pending document batches smaller than max_document_batch_size,
+        # shared by concurrent ingestions. Only touched from the event loop.
+        self._pending_documents: List[Tuple[List[str], asyncio.Future]] = []
+        self._pending_document_texts = 0
+        self._document_flush_handle = None
+
+        # Metrics (encode counters are updated from executor threads)
+        self._metrics_lock = threading.Lock()
+        self.query_requests = 0
+        self.query_batches = 0
+        self.document_requests = 0
+        self.document_batches = 0
+        self.encoded_texts = 0
+        self.encode_seconds = 0.0
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode on an executor thread into one contiguous float32 matrix"""
+        start_time = time.perf_counter()
+        embeddings = np.ascontiguousarray(
+            self.model.encode(texts, show_progress_bar=False, convert_to_numpy=True),
+            dtype=np.float32
+        )
+        with self._metrics_lock:
+            self.encode_seconds += time.perf_counter() - start_time
+            self.encoded_texts += len(texts)
+        return embeddings
+
+    def warm_up(self):
+        """Run one synchronous encode so the first request is not slow"""
+        self._encode(["warm-up"])
+
+    def _encode_documents(self, texts: List[str]) -> np.ndarray:
+        """Encode chunks on an executor thread, reusing cached embeddings"""
+        if self.chunk_cache is None:
+            return self._encode(texts)
+
+        cached = self.chunk_cache.get_many(self.model_name, texts)
+        missing = [i for i in range(len(texts)) if i not in cached]
+        if cached and not missing:
+            return np.stack([cached[i] for i in range(len(texts))])
+
+        missing_texts = [texts[i] for i in missing]
+        encoded = self._encode(missing_texts)
+        self.chunk_cache.put_many(self.model_name, missing_texts, encoded)
+        if not cached:
+            return encoded
+
+        embeddings = np.empty((len(texts), encoded.shape[1]), dtype=np.float32)
+        embeddings[missing] = encoded
+        for i, vector in cached.items():
+            embeddings[i] = vector
+        return embeddings
+
+    async def encode_documents(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode document chunks off the event loop
+
+        Chunks already in the chunk embedding cache are not re-encoded.
+        Batches smaller than max_document_batch_size arriving in the same
+        window (e.g. the short papers of a batch upload) share one encode.
+
+        Args:
+            texts: Chunk texts
+
+        Returns:
+            Embedding matrix (one row per text)
+        """
+        loop = asyncio.get_running_loop()
+        self.document_requests += 1
+        if len(texts) >= self.max_document_batch_size:
+            self.document_batches += 1
+            return await loop.run_in_executor(self.executor, self._encode_documents, texts)
+
+        future = loop.create_future()
+        self._pending_documents.append((texts, future))
+        self._pending_document_texts += len(texts)
+
+        if self._pending_document_texts >= self.max_document_batch_size:
+            self._flush_documents()
+        elif self._document_flush_handle is None:
+            self._document_flush_handle = loop.call_later(self.batch_window, self._flush_documents)
+
+        return await future
+
+    def _flush_documents(self):
+        """Send the pending document batches to the executor as one encode call"""
+        if self._document_flush_handle is not None:
+            self._document_flush_handle.cancel()
+            self._document_flush_handle = None
+
+        batch = self._pending_documents
+        self._pending_documents = []
+        self._pending_document_texts = 0
+        if not batch:
+            return
+
+        texts = [text for batch_texts, _ in batch for text in batch_texts]
+        self.document_batches += 1
+
+        loop = asyncio.get_running_loop()
+        encode_future = loop.run_in_executor(self.executor, self._encode_documents, texts)
+        encode_future.add_done_callback(lambda done: self._resolve_documents(batch, done))
+
+    @staticmethod
+    def _resolve_documents(batch, done: asyncio.Future):
+        """Hand each waiting ingestion its rows of the batch result"""
+        error = done.exception() if not done.cancelled() else asyncio.CancelledError()
+        embeddings = done.result() if error is None else None
+
+        offset = 0
+        for texts, future in batch:
+            rows = slice(offset, offset + len(texts))
+            offset += len(texts)
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(embeddings[rows])
+
+    async def encode_query(self, text: str) -> np.ndarray:
+        """
+        Encode a single query, batched with other queries arriving in the
+        same few-millisecond window
+
+        Args:
+            text: Query text
+
+        Returns:
+            Query embedding vector
+        """
+        self.query_requests += 1
+        cached = self.query_cache.get(self.model_name, text)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+
+        embedding = await future
+        # Identical queries share one read-only vector with the cache
+        return self.query_cache.put(self.model_name, text, embedding)
+
+    def _flush(self):
+        """Send the pending queries to the executor as one encode call"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch = self._pending
+        self._pending = []
+        if not batch:
+            return
+
+        # Identical queries in the same window share one encode
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+        self.query_batches += 1
+
+        loop = asyncio.get_running_loop()
+        encode_future = loop.run_in_executor(self.executor, self._encode, unique_texts)
+        encode_future.add_done_callback(
+            lambda done: self._resolve(batch, unique_texts, done)
+        )
+
+    @staticmethod
+    def _resolve(batch, unique_texts: List[str], done: asyncio.Future):
+        """Hand each waiting caller its row of the batch result"""
+        error = done.exception() if not done.cancelled() else asyncio.CancelledError()
+        if error is None:
+            embeddings = done.result()
+            index = {text: i for i, text in enumerate(unique_texts)}
+
+        for text, future in batch:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(embeddings[index[text]])
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get embedding service metrics
+
+        Returns:
+            Request, batch and timing counters
+        """
+        encoded_queries = self.query_requests - self.query_cache.hits
+        avg_batch = encoded_queries / self.query_batches if self.query_batches else 0.0
+        return {
+            "model": self.model_name,
+            "query_requests": self.query_requests,
+            "query_batches": self.query_batches,
+            "avg_query_batch_size": round(avg_batch, 2),
+            "document_requests": self.document_requests,
+            "document_batches": self.document_batches,
+            "pending_document_chunks": self._pending_document_texts,
+            "encoded_texts": self.encoded_texts,
+            "encode_seconds": round(self.encode_seconds, 3),
+            "pending_queries": len(self._pending),
+            "query_cache": self.query_cache.stats(),
+            "chunk_cache": self.chunk_cache.stats() if self.chunk_cache else None,
+        }
+
+    def shutdown(self):
+        """Stop the executor and persist the query cache"""
+        self.executor.shutdown(wait=False)
+        self.query_cache.save()
+        if self.chunk_cache is not None:
+            self.chunk_cache.close()
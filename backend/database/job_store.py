@@ -0,0 +1,104 @@
+"""
+Ingestion job store using SQLite
+Keeps background job status in the shared metadata database so any uvicorn
+worker can answer a poll for a job another worker is running
+"""
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from config import settings
+from database.metadata_store import connect
+
+
+class JobStore:
+    """SQLite-backed ingestion job records"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the store (the database is opened on first use)
+
+        Args:
+            db_path: SQLite file (default: settings.METADATA_DB_PATH)
+        """
+        self.db_path = Path(db_path or settings.METADATA_DB_PATH)
+
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self):
+        if self._conn is None:
+            conn = connect(self.db_path)
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS ingestion_jobs (
+                    job_id      TEXT PRIMARY KEY,
+                    status      TEXT NOT NULL,
+                    finished_at REAL,
+                    job         TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_finished
+                    ON ingestion_jobs(finished_at);
+            """)
+            self._conn = conn
+        return self._conn
+
+    def save(self, job: Dict[str, Any]):
+        """
+        Insert or replace a job record
+
+        Args:
+            job: Job record (keys starting with "_" and the result are not stored)
+        """
+        stored = {
+            key: value for key, value in job.items()
+            if not key.startswith("_") and key != "result"
+        }
+        finished_at = time.time() if job["status"] in ("completed", "failed") else None
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO ingestion_jobs (job_id, status, finished_at, job) "
+                "VALUES (?, ?, ?, ?)",
+                (job["job_id"], job["status"], finished_at, json.dumps(stored, default=str))
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job record
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job record or None if unknown
+        """
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT job FROM ingestion_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return json.loads(row["job"]) if row else None
+
+    def delete_finished(self, older_than_seconds: float) -> int:
+        """
+        Remove finished jobs
+
+        Args:
+            older_than_seconds: Minimum age since the job finished
+
+        Returns:
+            Number of jobs removed
+        """
+        cutoff = time.time() - older_than_seconds
+        with self._lock:
+            cursor = self._connection().execute(
+                "DELETE FROM ingestion_jobs WHERE finished_at < ?", (cutoff,)
+            )
+        return cursor.rowcount
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,249 @@
+"""
+Lexical (keyword) index using SQLite FTS5
+BM25-ranked inverted index over chunk text, kept in sync with the Chroma
+collection so exact terms (equation names, surnames, course codes) that dense
+embeddings blur can still be retrieved
+"""
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from config import settings
+
+
+class LexicalIndex:
+    """BM25 keyword index over chunks, shared by all workers (WAL mode)"""
+
+    # Tokens are quoted before matching so FTS5 query syntax in user input
+    # (AND, NEAR, column filters, quotes) is treated as plain text
+    TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Open (and create if needed) the index database
+
+        Args:
+            db_path: SQLite file (default: settings.LEXICAL_INDEX_PATH)
+        """
+        self.db_path = Path(db_path or settings.LEXICAL_INDEX_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        """
+        Create tables and indexes
+
+        Chunk ids live in an ordinary table indexed by document, sharing
+        rowids with the FTS table, so deletes and document filters are
+        index lookups. Chunk ids are unique, so re-adding a chunk replaces
+        it. The chunk count is kept in index_meta.
+        """
+        with self._lock:
+            with self._conn:
+                columns = {
+                    row[1] for row in self._conn.execute("PRAGMA table_info(chunks_fts)")
+                }
+                if "document_id" in columns:
+                    # Old layout (ids as UNINDEXED FTS columns): the startup
+                    # sync rebuilds the index from the vector store
+                    print("🔄 Upgrading keyword index layout")
+                    self._conn.execute("DROP TABLE chunks_fts")
+
+                # porter: match "equations" to "equation"; diacritics folded
+                self._conn.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+                        chunk_text,
+                        tokenize = 'porter unicode61 remove_diacritics 2'
+                    )
+                """)
+                self._conn.execute("""
+                    CREATE TABLE IF NOT EXISTS chunk_rows (
+                        id          INTEGER PRIMARY KEY,
+                        chunk_id    TEXT NOT NULL,
+                        document_id TEXT NOT NULL
+                    )
+                """)
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_chunk_rows_document ON chunk_rows(document_id)"
+                )
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS index_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+                )
+                if "document_id" in columns:
+                    self._conn.execute("DELETE FROM chunk_rows")
+                    self._conn.execute("DELETE FROM index_meta")
+
+                has_unique = self._conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_chunk_rows_chunk'"
+                ).fetchone()
+                if not has_unique:
+                    # Indexes from before chunk ids were unique may hold
+                    # duplicates; keep the newest row of each chunk
+                    duplicates = self._conn.execute(
+                        "SELECT id FROM chunk_rows WHERE id NOT IN "
+                        "(SELECT MAX(id) FROM chunk_rows GROUP BY chunk_id)"
+                    ).fetchall()
+                    self._conn.executemany("DELETE FROM chunks_fts WHERE rowid = ?", duplicates)
+                    self._conn.executemany("DELETE FROM chunk_rows WHERE id = ?", duplicates)
+                    self._conn.execute(
+                        "CREATE UNIQUE INDEX idx_chunk_rows_chunk ON chunk_rows(chunk_id)"
+                    )
+                    self._conn.execute(
+                        "UPDATE index_meta SET value = (SELECT COUNT(*) FROM chunk_rows) "
+                        "WHERE key = 'chunk_count'"
+                    )
+
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO index_meta (key, value) "
+                    "SELECT 'chunk_count', COUNT(*) FROM chunk_rows"
+                )
+
+    def _adjust_count(self, delta: int):
+        """Update the stored chunk count (inside the caller's transaction)"""
+        self._conn.execute(
+            "UPDATE index_meta SET value = value + ? WHERE key = 'chunk_count'", (delta,)
+        )
+
+    def add(self, chunks: List[Tuple[str, str, str]]):
+        """
+        Index chunks, replacing chunks already indexed under the same id
+
+        Re-adding is idempotent, so a rebuild racing another worker's ingest
+        or a retried batch never leaves duplicates.
+
+        Args:
+            chunks: (chunk_id, document_id, chunk_text) tuples
+        """
+        if not chunks:
+            return
+
+        with self._lock:
+            with self._conn:
+                # rowid -> text (a chunk repeated in the batch keeps its last text)
+                texts: Dict[int, str] = {}
+                added = 0
+                for chunk_id, document_id, chunk_text in chunks:
+                    # The insert takes the write lock, so the lookup below
+                    # cannot race another worker
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO chunk_rows (chunk_id, document_id) VALUES (?, ?)",
+                        (chunk_id, document_id)
+                    )
+                    if cursor.rowcount:
+                        rowid = cursor.lastrowid
+                        added += 1
+                    else:
+                        rowid = self._conn.execute(
+                            "SELECT id FROM chunk_rows WHERE chunk_id = ?", (chunk_id,)
+                        ).fetchone()[0]
+                        self._conn.execute(
+                            "UPDATE chunk_rows SET document_id = ? WHERE id = ?", (document_id, rowid)
+                        )
+                        self._conn.execute("DELETE FROM chunks_fts WHERE rowid = ?", (rowid,))
+                    texts[rowid] = chunk_text
+                self._conn.executemany(
+                    "INSERT INTO chunks_fts (rowid, chunk_text) VALUES (?, ?)", texts.items()
+                )
+                self._adjust_count(added)
+
+    def delete_document(self, document_id: str) -> int:
+        """
+        Remove all chunks of a document
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            Number of chunks removed
+        """
+        with self._lock:
+            with self._conn:
+                rowids = self._conn.execute(
+                    "SELECT id FROM chunk_rows WHERE document_id = ?", (document_id,)
+                ).fetchall()
+                self._conn.executemany("DELETE FROM chunks_fts WHERE rowid = ?", rowids)
+                self._conn.execute("DELETE FROM chunk_rows WHERE document_id = ?", (document_id,))
+                self._adjust_count(-len(rowids))
+        return len(rowids)
+
+    @classmethod
+    def _match_expression(cls, query: str) -> Optional[str]:
+        """Turn free text into an FTS5 OR-query of quoted terms"""
+        terms = list(dict.fromkeys(token.lower() for token in cls.TOKEN_PATTERN.findall(query)))
+        if not terms:
+            return None
+        return " OR ".join(f'"{term}"' for term in terms)
+
+    def search(
+        self,
+        query: str,
+        n_results: int = 5,
+        document_ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank chunks by BM25
+
+        Args:
+            query: Search query
+            n_results: Number of results to return
+            document_ids: Optional filter by document IDs
+
+        Returns:
+            List of dicts with chunk_id, document_id and bm25_score
+            (higher is better), best first
+        """
+        expression = self._match_expression(query)
+        if expression is None:
+            return []
+
+        sql = (
+            "SELECT r.chunk_id, r.document_id, bm25(chunks_fts) AS rank "
+            "FROM chunks_fts JOIN chunk_rows r ON r.id = chunks_fts.rowid "
+            "WHERE chunks_fts MATCH ?"
+        )
+        params: List[Any] = [expression]
+        if document_ids:
+            sql += f" AND r.document_id IN ({', '.join('?' * len(document_ids))})"
+            params.extend(document_ids)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(n_results)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        # FTS5's bm25() is negated so that ascending order is best first
+        return [
+            {"chunk_id": chunk_id, "document_id": document_id, "bm25_score": -rank}
+            for chunk_id, document_id, rank in rows
+        ]
+
+    def count(self) -> int:
+        """Number of indexed chunks"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT value FROM index_meta WHERE key = 'chunk_count'"
+            ).fetchone()[0]
+
+    def clear(self):
+        """Drop all indexed chunks"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM chunks_fts")
+                self._conn.execute("DELETE FROM chunk_rows")
+                self._conn.execute("UPDATE index_meta SET value = 0 WHERE key = 'chunk_count'")
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,424 @@
+"""
+Document metadata store using SQLite
+Indexed, transactional replacement for documents_metadata.json that is safe
+to share between uvicorn workers (WAL mode)
+"""
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from config import settings
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """
+    Open a connection to a shared metadata database
+
+    Args:
+        db_path: SQLite file (its directory is created if needed)
+
+    Returns:
+        WAL-mode connection usable from any thread (callers serialize access)
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(
+        str(db_path),
+        check_same_thread=False,
+        isolation_level=None,  # explicit transactions
+        timeout=30
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class MetadataStore:
+    """SQLite-backed document metadata with O(1) writes and indexed lookups"""
+
+    COLUMNS = [
+        "document_id",
+        "filename",
+        "document_type",
+        "upload_date",
+        "file_size",
+        "file_path",
+        "num_chunks",
+        "metadata",
+        "content_hash",
+        "ingest_signature",
+    ]
+
+    # Column list and placeholders matching _to_row
+    _INSERT_COLUMNS = f"({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+    # Columns added after the first release (migrated with ALTER TABLE)
+    ADDED_COLUMNS = {
+        "content_hash": "TEXT",
+        "ingest_signature": "TEXT",
+    }
+
+    def __init__(self, db_path: Optional[str] = None, legacy_json_path: Optional[Path] = None):
+        """
+        Open (and create if needed) the metadata database
+
+        Args:
+            db_path: SQLite file (default: settings.METADATA_DB_PATH)
+            legacy_json_path: documents_metadata.json to import on first run
+        """
+        self.db_path = Path(db_path or settings.METADATA_DB_PATH)
+
+        self._lock = threading.Lock()
+        self._conn = connect(self.db_path)
+        self._create_schema()
+
+        if legacy_json_path is not None:
+            self._import_legacy_json(Path(legacy_json_path))
+
+    def _create_schema(self):
+        """Create tables and indexes"""
+        with self._lock:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    document_id   TEXT PRIMARY KEY,
+                    filename      TEXT NOT NULL,
+                    document_type TEXT NOT NULL,
+                    upload_date   TEXT NOT NULL,
+                    file_size     INTEGER NOT NULL DEFAULT 0,
+                    file_path     TEXT,
+                    num_chunks    INTEGER NOT NULL DEFAULT 0,
+                    metadata      TEXT NOT NULL DEFAULT '{}'
+                );
+                CREATE INDEX IF NOT EXISTS idx_documents_filename ON documents(filename);
+                CREATE INDEX IF NOT EXISTS idx_documents_upload_date ON documents(upload_date);
+            """)
+
+            existing = {
+                row["name"] for row in self._conn.execute("PRAGMA table_info(documents)")
+            }
+            for column, column_type in self.ADDED_COLUMNS.items():
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE documents ADD COLUMN {column} {column_type}")
+
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_documents_content "
+                "ON documents(content_hash, ingest_signature)"
+            )
+
+    def _import_legacy_json(self, json_path: Path):
+        """One-time import of the old whole-file JSON metadata"""
+        if not json_path.exists():
+            return
+
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for record in legacy.values():
+                        self._conn.execute(
+                            f"INSERT OR IGNORE INTO documents {self._INSERT_COLUMNS}",
+                            self._to_row(record)
+                        )
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+
+            json_path.rename(json_path.with_suffix(".json.migrated"))
+            print(f"✅ Migrated {len(legacy)} documents from {json_path.name} to SQLite")
+        except Exception as e:
+            print(f"❌ Error migrating {json_path}: {e}")
+
+    @staticmethod
+    def _to_row(record: Dict[str, Any]) -> tuple:
+        """Convert a metadata dict to a documents row"""
+        return (
+            record["document_id"],
+            record["filename"],
+            record["document_type"],
+            str(record["upload_date"]),
+            record.get("file_size", 0),
+            record.get("file_path"),
+            record.get("num_chunks", 0),
+            json.dumps(record.get("metadata", {}), default=str),
+            record.get("content_hash"),
+            record.get("ingest_signature"),
+        )
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a documents row to a metadata dict"""
+        record = dict(row)
+        record["metadata"] = json.loads(record["metadata"] or "{}")
+        return record
+
+    def upsert(self, record: Dict[str, Any]):
+        """
+        Insert or replace a document record
+
+        Args:
+            record: Document metadata (document_id, filename, ...)
+        """
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO documents {self._INSERT_COLUMNS}",
+                self._to_row(record)
+            )
+
+    def get(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a document record by ID
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            Document metadata or None if not found
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM documents WHERE document_id = ?", (document_id,)
+            ).fetchone()
+        return self._from_row(row) if row else None
+
+    def exists(self, document_id: str) -> bool:
+        """Check whether a document exists"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM documents WHERE document_id = ?", (document_id,)
+            ).fetchone()
+        return row is not None
+
+    def delete(self, document_id: str) -> bool:
+        """
+        Delete a document record
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            True if a record was deleted
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM documents WHERE document_id = ?", (document_id,)
+            )
+        return cursor.rowcount > 0
+
+    def update(self, document_id: str, **fields) -> bool:
+        """
+        Update selected columns of a document record
+
+        Args:
+            document_id: Document ID
+            **fields: Column values to set (metadata may be a dict)
+
+        Returns:
+            True if a record was updated
+        """
+        unknown = set(fields) - set(self.COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown metadata columns: {sorted(unknown)}")
+
+        if "metadata" in fields:
+            fields["metadata"] = json.dumps(fields["metadata"], default=str)
+
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE documents SET {assignments} WHERE document_id = ?",
+                (*fields.values(), document_id)
+            )
+        return cursor.rowcount > 0
+
+    def list_all(self) -> List[Dict[str, Any]]:
+        """
+        List all document records, newest first
+
+        Returns:
+            List of document metadata
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM documents ORDER BY upload_date DESC"
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def list_names(self) -> List[Dict[str, str]]:
+        """
+        List document IDs and filenames only
+
+        Returns:
+            List of dicts with 'id' and 'name' keys
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT document_id, filename FROM documents"
+            ).fetchall()
+        return [{"id": row["document_id"], "name": row["filename"]} for row in rows]
+
+    def find_id_by_filename(self, filename: str) -> Optional[str]:
+        """
+        Get document ID by filename
+
+        Args:
+            filename: Document filename
+
+        Returns:
+            Document ID or None if not found
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT document_id FROM documents WHERE filename = ? LIMIT 1", (filename,)
+            ).fetchone()
+        return row["document_id"] if row else None
+
+    def find_by_content(
+        self,
+        content_hash: str,
+        ingest_signature: str,
+        document_type: str,
+        url: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find a document with identical content that was ingested the same way
+
+        Args:
+            content_hash: SHA-256 of the original file bytes
+            ingest_signature: Embedding model and chunking settings used
+            document_type: Only documents of this type match (their chunks
+                carry type-specific metadata)
+            url: For web pages, only documents scraped from this URL match
+
+        Returns:
+            Oldest matching document metadata or None
+        """
+        sql = (
+            "SELECT * FROM documents WHERE content_hash = ? AND ingest_signature = ? "
+            "AND document_type = ?"
+        )
+        params: List[Any] = [content_hash, ingest_signature, document_type]
+        if url is not None:
+            sql += " AND json_extract(metadata, '$.url') = ?"
+            params.append(url)
+        sql += " ORDER BY upload_date LIMIT 1"
+
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        return self._from_row(row) if row else None
+
+    def count(self) -> int:
+        """Number of stored documents"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+class CorpusChangeLog:
+    """
+    Append-only log of document changes kept in the metadata database
+
+    Every worker records ingests, deletes and renames here, and reads the
+    entries it has not seen yet, so per-process caches can invalidate on
+    changes made by other workers.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 10000):
+        """
+        Initialize the log (the database is opened on first use)
+
+        Args:
+            db_path: SQLite file (default: settings.METADATA_DB_PATH)
+            max_entries: Entries kept before the oldest are pruned
+        """
+        self.db_path = Path(db_path or settings.METADATA_DB_PATH)
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = connect(self.db_path)
+            # AUTOINCREMENT keeps versions increasing after pruning
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS corpus_changes (
+                    version     INTEGER PRIMARY KEY AUTOINCREMENT,
+                    document_id TEXT
+                )
+            """)
+            self._conn = conn
+        return self._conn
+
+    def record(self, document_ids: Optional[List[str]] = None):
+        """
+        Record changed documents
+
+        Args:
+            document_ids: Changed documents (None = every document)
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT INTO corpus_changes (document_id) VALUES (?)",
+                    [(document_id,) for document_id in (document_ids or [None])]
+                )
+                conn.execute(
+                    "DELETE FROM corpus_changes WHERE version <= "
+                    "(SELECT MAX(version) FROM corpus_changes) - ?",
+                    (self.max_entries,)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def changes_since(self, version: int) -> tuple:
+        """
+        Read changes recorded after a version
+
+        Args:
+            version: Last version the caller has applied
+
+        Returns:
+            (latest version, changed document IDs). The IDs are None when
+            everything may have changed: a full clear was recorded, or the
+            entries after `version` were already pruned.
+        """
+        with self._lock:
+            conn = self._connection()
+            oldest, latest = conn.execute(
+                "SELECT MIN(version), MAX(version) FROM corpus_changes"
+            ).fetchone()
+            if latest is None or latest <= version:
+                return max(version, latest or 0), []
+            if oldest > version + 1:
+                return latest, None
+
+            rows = conn.execute(
+                "SELECT document_id FROM corpus_changes WHERE version > ?",
+                (version,)
+            ).fetchall()
+
+        changed = [row[0] for row in rows]
+        if None in changed:
+            return latest, None
+        return latest, changed
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,634 @@
+"""
+Vector index backends
+VectorStore talks to the index through VectorBackend so the storage engine
+can be chosen per deployment (settings.VECTOR_BACKEND):
+- chroma: ChromaDB persistent collection (HNSW, approximate)
+- numpy:  exact brute-force search over a memory-mapped matrix (float32,
+          or float16/int8 quantized), faster than a Chroma round-trip for
+          small collections
+"""
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from config import settings
+
+
+class VectorBackend(ABC):
+    """Storage and nearest-neighbour search for chunk embeddings"""
+
+    name = "base"
+    # Element type vectors are stored as
+    storage = "float32"
+
+    @abstractmethod
+    def add(
+        self,
+        ids: List[str],
+        embeddings: np.ndarray,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]]
+    ):
+        """
+        Store chunks
+
+        Args:
+            ids: Chunk IDs
+            embeddings: Embedding matrix (one row per chunk)
+            documents: Chunk texts
+            metadatas: Chunk metadata (must include document_id)
+        """
+
+    @abstractmethod
+    def query(
+        self,
+        embedding: np.ndarray,
+        n_results: int,
+        document_ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the nearest chunks by squared L2 distance
+
+        Args:
+            embedding: Query embedding vector
+            n_results: Number of results to return
+            document_ids: Optional filter by document IDs
+
+        Returns:
+            Dicts with id, document, metadata and distance, nearest first
+        """
+
+    @abstractmethod
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        document_id: Optional[str] = None,
+        include_embeddings: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Fetch stored chunks
+
+        Args:
+            ids: Only these chunk IDs
+            document_id: Only chunks of this document
+            include_embeddings: Also return the embedding matrix
+            limit: Maximum number of chunks
+            offset: Chunks to skip (for paging)
+
+        Returns:
+            Dict with ids, documents, metadatas and embeddings (ndarray or None)
+        """
+
+    @abstractmethod
+    def delete_document(self, document_id: str) -> int:
+        """
+        Delete all chunks of a document
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            Number of chunks deleted
+        """
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored chunks"""
+
+    def close(self):
+        """Release resources"""
+
+
+class ChromaBackend(VectorBackend):
+    """ChromaDB persistent collection"""
+
+    name = "chroma"
+
+    def __init__(self, persist_dir: Optional[str] = None, collection_name: Optional[str] = None):
+        """
+        Open (and create if needed) the Chroma collection
+
+        Args:
+            persist_dir: Chroma directory (default: settings.CHROMA_PERSIST_DIR)
+            collection_name: Collection (default: settings.CHROMA_COLLECTION_NAME)
+        """
+        import chromadb
+
+        self.client = chromadb.PersistentClient(path=persist_dir or settings.CHROMA_PERSIST_DIR)
+        self.collection = self.client.get_or_create_collection(
+            name=collection_name or settings.CHROMA_COLLECTION_NAME,
+            metadata={"description": "Research documents collection"}
+        )
+
+    def add(self, ids, embeddings, documents, metadatas):
+        # Chroma takes the matrix as-is; no per-float Python objects
+        self.collection.add(
+            ids=ids,
+            embeddings=np.ascontiguousarray(embeddings, dtype=np.float32),
+            documents=documents,
+            metadatas=metadatas
+        )
+
+    def query(self, embedding, n_results, document_ids=None):
+        # Build where filter if document_ids provided
+        where_filter = None
+        if document_ids:
+            where_filter = {"document_id": {"$in": document_ids}}
+
+        results = self.collection.query(
+            query_embeddings=np.asarray(embedding, dtype=np.float32).reshape(1, -1),
+            n_results=n_results,
+            where=where_filter,
+            include=["documents", "metadatas", "distances"]
+        )
+
+        if not results["documents"] or not results["documents"][0]:
+            return []
+
+        return [
+            {"id": chunk_id, "document": document, "metadata": metadata, "distance": distance}
+            for chunk_id, document, metadata, distance in zip(
+                results["ids"][0],
+                results["documents"][0],
+                results["metadatas"][0],
+                results["distances"][0]
+            )
+        ]
+
+    def get(self, ids=None, document_id=None, include_embeddings=False, limit=None, offset=0):
+        include = ["documents", "metadatas"]
+        if include_embeddings:
+            include.append("embeddings")
+
+        results = self.collection.get(
+            ids=ids,
+            where={"document_id": document_id} if document_id else None,
+            limit=limit,
+            offset=offset or None,
+            include=include
+        )
+
+        embeddings = None
+        if include_embeddings:
+            embeddings = np.asarray(results["embeddings"], dtype=np.float32)
+        return {
+            "ids": results["ids"],
+            "documents": results["documents"],
+            "metadatas": results["metadatas"],
+            "embeddings": embeddings,
+        }
+
+    def delete_document(self, document_id):
+        results = self.collection.get(where={"document_id": document_id}, include=[])
+        if results["ids"]:
+            self.collection.delete(ids=results["ids"])
+        return len(results["ids"])
+
+    def count(self):
+        return self.collection.count()
+
+
+class NumpyBackend(VectorBackend):
+    """
+    Exact search over a memory-mapped embedding matrix
+
+    Vectors live in <index_dir>/vectors.<generation>.<dtype> (row-major,
+    grown by doubling); chunk text and metadata live in <index_dir>/chunks.db
+    keyed by row. Deleted rows are tombstoned and reclaimed by compaction once
+    they outnumber live rows; compaction writes the next generation's file
+    before switching the database over, so a crash never mixes the two.
+
+    Vectors can be stored quantized (settings.VECTOR_QUANTIZATION):
+    float16 halves the matrix, int8 quarters it using one scale per vector
+    (max |x| / 127). Distances are computed on the dequantized vectors.
+
+    State is held per process, so use it with a single worker per index
+    directory.
+    """
+
+    name = "numpy"
+    INITIAL_CAPACITY = 1024
+    # Quantized rows are dequantized this many at a time while scoring
+    BLOCK_ROWS = 4096
+    # Storage type -> (numpy dtype, file suffix)
+    STORAGE_TYPES = {
+        "float32": (np.float32, "f32"),
+        "float16": (np.float16, "f16"),
+        "int8": (np.int8, "i8"),
+    }
+
+    def __init__(self, index_dir: Optional[str] = None, quantization: Optional[str] = None):
+        """
+        Open (and create if needed) the index
+
+        Args:
+            index_dir: Directory for the matrix and chunk database
+                (default: settings.NUMPY_INDEX_DIR)
+            quantization: float32, float16 or int8 (default:
+                settings.VECTOR_QUANTIZATION); an existing index stored
+                differently is converted on open
+        """
+        self.index_dir = Path(index_dir or settings.NUMPY_INDEX_DIR)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+        storage = (quantization or settings.VECTOR_QUANTIZATION).lower()
+        if storage == "none":
+            storage = "float32"
+        if storage not in self.STORAGE_TYPES:
+            raise ValueError(f"Unknown vector quantization: {storage}. Use one of {sorted(self.STORAGE_TYPES)}")
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self.index_dir / "chunks.db"),
+            check_same_thread=False,
+            timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                row         INTEGER PRIMARY KEY,
+                chunk_id    TEXT NOT NULL UNIQUE,
+                document_id TEXT NOT NULL,
+                document    TEXT NOT NULL,
+                metadata    TEXT NOT NULL,
+                scale       REAL NOT NULL DEFAULT 1.0
+            );
+            CREATE INDEX IF NOT EXISTS idx_chunks_document ON chunks(document_id);
+            CREATE TABLE IF NOT EXISTS index_info (
+                key   TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(chunks)")}
+        if "scale" not in existing:
+            self._conn.execute("ALTER TABLE chunks ADD COLUMN scale REAL NOT NULL DEFAULT 1.0")
+        self._conn.commit()
+
+        self._load(storage)
+
+    def _info(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM index_info WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_info(self, key: str, value: Any):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO index_info (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    def _vectors_file(self, generation: int, storage: str) -> Path:
+        return self.index_dir / f"vectors.{generation}.{self.STORAGE_TYPES[storage][1]}"
+
+    def _load(self, storage: str):
+        """Map the vector file and rebuild per-row bookkeeping from the database"""
+        dim = self._info("dim")
+        self.dim = int(dim) if dim else None
+        self._size = int(self._info("size") or 0)
+        self._generation = int(self._info("generation") or 0)
+        # Indexes created before quantization support are float32
+        self.storage = self._info("storage") or ("float32" if self.dim else storage)
+        self.dtype = self.STORAGE_TYPES[self.storage][0]
+        self.vectors_path = self._vectors_file(self._generation, self.storage)
+
+        # Leftovers of an interrupted compaction
+        for path in self.index_dir.glob("vectors.*"):
+            if path != self.vectors_path:
+                path.unlink()
+        self._capacity = 0
+        self._vectors = None
+
+        # Per-row state (row index -> document code / scale / squared norm /
+        # liveness), allocated to the matrix capacity; rows [0, size) are used
+        self._doc_codes = np.full(self._size, -1, dtype=np.int32)
+        self._alive = np.zeros(self._size, dtype=bool)
+        self._scales = np.ones(self._size, dtype=np.float32)
+        self._norms = np.zeros(self._size, dtype=np.float32)
+        self._doc_code_map: Dict[str, int] = {}
+
+        if self.dim is None:
+            return
+
+        itemsize = np.dtype(self.dtype).itemsize
+        self._map_vectors(self.vectors_path.stat().st_size // (self.dim * itemsize))
+
+        for row, document_id, scale in self._conn.execute("SELECT row, document_id, scale FROM chunks"):
+            if row < self._size:
+                self._doc_codes[row] = self._doc_code(document_id)
+                self._alive[row] = True
+                self._scales[row] = scale
+
+        self._compute_norms()
+
+        if self.storage != storage:
+            self._rewrite(storage)
+
+    def _map_vectors(self, capacity: int):
+        """(Re)open the vector file as a memmap with the given row capacity"""
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(capacity * self.dim * np.dtype(self.dtype).itemsize)
+        self._vectors = np.memmap(self.vectors_path, dtype=self.dtype, mode="r+", shape=(capacity, self.dim))
+        self._capacity = capacity
+        self._resize_rows(capacity)
+
+    def _resize_rows(self, capacity: int):
+        """Reallocate per-row state for the given capacity, keeping rows [0, size)"""
+        if len(self._alive) == capacity:
+            return
+        size = min(self._size, len(self._alive), capacity)
+        for name, fill, dtype in (
+            ("_doc_codes", -1, np.int32),
+            ("_alive", False, bool),
+            ("_scales", 1.0, np.float32),
+            ("_norms", 0.0, np.float32),
+        ):
+            resized = np.full(capacity, fill, dtype=dtype)
+            resized[:size] = getattr(self, name)[:size]
+            setattr(self, name, resized)
+
+    def _doc_code(self, document_id: str) -> int:
+        """Small integer code for a document ID (for vectorized filtering)"""
+        if document_id not in self._doc_code_map:
+            self._doc_code_map[document_id] = len(self._doc_code_map)
+        return self._doc_code_map[document_id]
+
+    def _encode(self, vectors: np.ndarray, storage: Optional[str] = None):
+        """Quantize float32 rows; returns (stored rows, per-row scales)"""
+        storage = storage or self.storage
+        scales = np.ones(len(vectors), dtype=np.float32)
+        if storage == "int8":
+            scales = np.abs(vectors).max(axis=1) / 127
+            scales[scales == 0] = 1.0
+            codes = np.rint(vectors / scales[:, None])
+            return np.clip(codes, -127, 127).astype(np.int8), scales.astype(np.float32)
+        return vectors.astype(self.STORAGE_TYPES[storage][0], copy=False), scales
+
+    def _decode(self, rows) -> np.ndarray:
+        """Dequantize stored rows (a slice or an index array) to float32"""
+        vectors = np.asarray(self._vectors[rows], dtype=np.float32)
+        if self.storage == "int8":
+            vectors *= self._scales[rows][:, None]
+        return vectors
+
+    def _compute_norms(self):
+        """Squared norms of the dequantized rows"""
+        for start in range(0, self._size, self.BLOCK_ROWS):
+            end = min(start + self.BLOCK_ROWS, self._size)
+            block = self._decode(slice(start, end))
+            self._norms[start:end] = np.einsum("ij,ij->i", block, block)
+
+    def _dot(self, query: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Dot products of the query with live-or-not rows [0, size) or the given rows"""
+        total = self._size if rows is None else len(rows)
+        if self.storage == "float32":
+            return (self._vectors[:total] if rows is None else self._vectors[rows]) @ query
+
+        # Upcast block by block so scoring never holds a float32 copy of the matrix
+        out = np.empty(total, dtype=np.float32)
+        for start in range(0, total, self.BLOCK_ROWS):
+            end = min(start + self.BLOCK_ROWS, total)
+            selected = slice(start, end) if rows is None else rows[start:end]
+            out[start:end] = self._vectors[selected].astype(np.float32) @ query
+        if self.storage == "int8":
+            out *= self._scales[:total] if rows is None else self._scales[rows]
+        return out
+
+    def add(self, ids, embeddings, documents, metadatas):
+        if not ids:
+            return
+
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._map_vectors(self.INITIAL_CAPACITY)
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match index ({self.dim})")
+
+            start, end = self._size, self._size + len(ids)
+            if end > self._capacity:
+                capacity = self._capacity
+                while capacity < end:
+                    capacity *= 2
+                self._map_vectors(capacity)
+
+            # Vectors first: rows past the committed size are ignored on load
+            stored, scales = self._encode(vectors)
+            self._vectors[start:end] = stored
+            self._vectors.flush()
+
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO chunks (row, chunk_id, document_id, document, metadata, scale) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (start + i, chunk_id, metadata["document_id"], document, json.dumps(metadata), scale)
+                        for i, (chunk_id, document, metadata, scale) in enumerate(
+                            zip(ids, documents, metadatas, scales.tolist())
+                        )
+                    ]
+                )
+                self._set_info("dim", self.dim)
+                self._set_info("size", end)
+                self._set_info("storage", self.storage)
+
+            # Per-row state was grown with the matrix, so this is a slice write
+            self._size = end
+            self._doc_codes[start:end] = [self._doc_code(m["document_id"]) for m in metadatas]
+            self._alive[start:end] = True
+            self._scales[start:end] = scales
+            # Norms of what was stored, so distances match the dequantized vectors
+            decoded = self._decode(slice(start, end))
+            self._norms[start:end] = np.einsum("ij,ij->i", decoded, decoded)
+
+    def query(self, embedding, n_results, document_ids=None):
+        query = np.asarray(embedding, dtype=np.float32)
+        with self._lock:
+            if self.dim is None or self._size == 0:
+                return []
+
+            if document_ids:
+                # Score only the requested documents' rows
+                codes = [self._doc_code_map[d] for d in document_ids if d in self._doc_code_map]
+                rows = np.flatnonzero(np.isin(self._doc_codes[:self._size], codes))
+                if rows.size == 0:
+                    return []
+                dots, norms = self._dot(query, rows), self._norms[rows]
+            else:
+                rows = np.flatnonzero(self._alive[:self._size])
+                if rows.size == 0:
+                    return []
+                dots, norms = self._dot(query), self._norms[:self._size]
+
+            # ||x - q||^2 = ||x||^2 - 2 x.q + ||q||^2
+            distances = norms - 2 * dots + query @ query
+            if not document_ids:
+                distances = distances[rows]
+
+            k = min(n_results, rows.size)
+            top = np.argpartition(distances, k - 1)[:k]
+            top = top[np.argsort(distances[top])]
+            top_rows = rows[top].tolist()
+
+            by_row = self._rows(top_rows)
+
+        return [
+            {**by_row[row], "distance": max(float(distance), 0.0)}
+            for row, distance in zip(top_rows, distances[top].tolist())
+        ]
+
+    def _rows(self, rows: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Load chunk records for matrix rows"""
+        records = {}
+        for start in range(0, len(rows), 500):
+            batch = rows[start:start + 500]
+            for row, chunk_id, document, metadata in self._conn.execute(
+                f"SELECT row, chunk_id, document, metadata FROM chunks WHERE row IN ({', '.join('?' * len(batch))})",
+                batch
+            ):
+                records[row] = {"id": chunk_id, "document": document, "metadata": json.loads(metadata)}
+        return records
+
+    def get(self, ids=None, document_id=None, include_embeddings=False, limit=None, offset=0):
+        sql = "SELECT row, chunk_id, document, metadata FROM chunks"
+        params: List[Any] = []
+        if ids is not None:
+            sql += f" WHERE chunk_id IN ({', '.join('?' * len(ids))})"
+            params.extend(ids)
+        elif document_id is not None:
+            sql += " WHERE document_id = ?"
+            params.append(document_id)
+        sql += " ORDER BY row"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall() if ids != [] else []
+            embeddings = None
+            if include_embeddings:
+                embeddings = (
+                    self._decode(np.array([row[0] for row in rows]))
+                    if rows else np.zeros((0, self.dim or 0), dtype=np.float32)
+                )
+
+        return {
+            "ids": [row[1] for row in rows],
+            "documents": [row[2] for row in rows],
+            "metadatas": [json.loads(row[3]) for row in rows],
+            "embeddings": embeddings,
+        }
+
+    def delete_document(self, document_id):
+        with self._lock:
+            rows = [row for (row,) in self._conn.execute(
+                "SELECT row FROM chunks WHERE document_id = ?", (document_id,)
+            )]
+            if not rows:
+                return 0
+
+            with self._conn:
+                self._conn.execute("DELETE FROM chunks WHERE document_id = ?", (document_id,))
+            self._alive[rows] = False
+            self._doc_codes[rows] = -1
+
+            live = int(self._alive[:self._size].sum())
+            if self._size - live > max(live, self.INITIAL_CAPACITY):
+                self._rewrite(self.storage)
+        return len(rows)
+
+    def _rewrite(self, storage: str):
+        """Rewrite the matrix without tombstoned rows, optionally in a new storage type"""
+        keep = np.flatnonzero(self._alive[:self._size])
+        generation = self._generation + 1
+        new_path = self._vectors_file(generation, storage)
+        dtype = self.STORAGE_TYPES[storage][0]
+
+        capacity = max(self.INITIAL_CAPACITY, len(keep))
+        new_vectors = np.memmap(new_path, dtype=dtype, mode="w+", shape=(capacity, self.dim))
+        scales = np.ones(len(keep), dtype=np.float32)
+        for start in range(0, len(keep), self.BLOCK_ROWS):
+            block = keep[start:start + self.BLOCK_ROWS]
+            if storage == self.storage:
+                new_vectors[start:start + len(block)] = self._vectors[block]
+                scales[start:start + len(block)] = self._scales[block]
+            else:
+                stored, block_scales = self._encode(self._decode(block), storage)
+                new_vectors[start:start + len(block)] = stored
+                scales[start:start + len(block)] = block_scales
+        new_vectors.flush()
+        del new_vectors
+
+        # Rows only move down, so renumbering in ascending order never collides
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE chunks SET row = ?, scale = ? WHERE row = ?",
+                [
+                    (new, scale, old)
+                    for new, (old, scale) in enumerate(zip(keep.tolist(), scales.tolist()))
+                    if new != old or storage != self.storage
+                ]
+            )
+            self._set_info("size", len(keep))
+            self._set_info("generation", generation)
+            self._set_info("storage", storage)
+
+        converted = storage != self.storage
+        self._size = len(keep)
+        self._doc_codes = self._doc_codes[keep]
+        self._alive = np.ones(self._size, dtype=bool)
+        self._scales = scales
+        self._norms = self._norms[keep]
+
+        # Mapping the new file grows the per-row state back to capacity
+        old_path = self.vectors_path
+        self._vectors = None
+        self._generation = generation
+        self.storage, self.dtype = storage, dtype
+        self.vectors_path = new_path
+        self._map_vectors(capacity)
+        old_path.unlink()
+
+        if converted:
+            self._compute_norms()
+        print(f"🧹 Rewrote vector index: {self._size} rows ({self.storage})")
+
+    def count(self):
+        with self._lock:
+            return int(self._alive[:self._size].sum())
+
+    def close(self):
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+            self._conn.close()
+
+
+def create_backend(name: Optional[str] = None) -> VectorBackend:
+    """
+    Build the configured vector backend
+
+    Args:
+        name: chroma or numpy (default: settings.VECTOR_BACKEND)
+
+    Returns:
+        Vector backend instance
+    """
+    backends = {
+        ChromaBackend.name: ChromaBackend,
+        NumpyBackend.name: NumpyBackend,
+    }
+    name = (name or settings.VECTOR_BACKEND).lower()
+    if name not in backends:
+        raise ValueError(f"Unknown vector backend: {name}. Use one of {sorted(backends)}")
+    return backends[name]()
@@ -1,57 +1,128 @@
 """
-Enhanced Vector Store using ChromaDB
+Enhanced Vector Store
+Chunking, embedding and retrieval on top of a pluggable vector backend
+(ChromaDB by default)
 """
-import chromadb
-from typing import List, Dict, Any, Optional
-from sentence_transformers import SentenceTransformer
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+import asyncio
+import numpy as np
+from bisect import bisect_right
+from typing import List, Dict, Any, Optional, Callable, AsyncIterator
 
 from config import settings
+from database.chunker import TextChunker
+from database.embedding_service import EmbeddingService
+from database.lexical_index import LexicalIndex
+from database.vector_backends import VectorBackend, create_backend
+
+SEARCH_MODES = ("vector", "lexical", "hybrid")
 
 
 class VectorStore:
-    """Enhanced vector database wrapper using ChromaDB"""
+    """Enhanced vector database wrapper"""
     
-    def __init__(self):
-        """Initialize ChromaDB and embedding model"""
-        # Initialize ChromaDB client
-        self.client = chromadb.PersistentClient(path=settings.CHROMA_PERSIST_DIR)
+    def __init__(
+        self,
+        embedder: Optional[EmbeddingService] = None,
+        backend: Optional[VectorBackend] = None
+    ):
+        """
+        Initialize the vector backend and embedding model
+        
+        Args:
+            embedder: Shared embedding service (a new one is created if omitted)
+            backend: Vector index (default: settings.VECTOR_BACKEND)
+        """
+        # Chunk vectors, text and metadata
+        self.backend = backend or create_backend()
         
-        # Load embedding model
-        print(f"📦 Loading embedding model: {settings.EMBEDDING_MODEL}")
-        self.embedding_model = SentenceTransformer(settings.EMBEDDING_MODEL)
+        # Chunking engine, configured once for every document
+        self.chunker = TextChunker()
         
-        # Get or create collection
-        self.collection = self.client.get_or_create_collection(
-            name=settings.CHROMA_COLLECTION_NAME,
-            metadata={"description": "Research documents collection"}
-        )
+        # Embeddings are computed on the embedding service's executor
+        self.embedder = embedder or EmbeddingService()
+        
+        # BM25 keyword index over the same chunks (for lexical/hybrid search)
+        self.lexical_index = LexicalIndex()
+        self._sync_lexical_index()
         
-        print(f"✅ Vector store initialized: {settings.CHROMA_COLLECTION_NAME}")
+        print(f"✅ Vector store initialized: {settings.CHROMA_COLLECTION_NAME} ({self.backend.name} backend)")
     
-    def _chunk_text(self, text: str) -> List[str]:
+    def _sync_lexical_index(self, page_size: int = 1000):
         """
-        Split text into chunks using RecursiveCharacterTextSplitter
+        Rebuild the keyword index from the vector backend if the two have
+        drifted apart
+        
+        Happens on first start after upgrading, or after a crash between the
+        vector write and the index write.
         
         Args:
-            text: Input text to chunk
+            page_size: Chunks read from the backend per request
+        """
+        total = self.backend.count()
+        if self.lexical_index.count() == total:
+            return
         
-        Returns:
-            List of text chunks
+        print(f"🔄 Rebuilding keyword index from {total} chunks...")
+        self.lexical_index.clear()
+        for offset in range(0, total, page_size):
+            page = self.backend.get(limit=page_size, offset=offset)
+            self.lexical_index.add([
+                (chunk_id, metadata.get("document_id", "unknown"), text)
+                for chunk_id, metadata, text in zip(page["ids"], page["metadatas"], page["documents"])
+            ])
+        print(f"✅ Keyword index rebuilt ({self.lexical_index.count()} chunks)")
+    
+    @property
+    def embedding_model(self):
+        """Underlying SentenceTransformer model"""
+        return self.embedder.model
+    
+    @property
+    def ingest_signature(self) -> str:
+        """
+        Settings that determine a document's chunks and vectors
+        
+        Documents with the same content and signature have identical chunks,
+        so one can be cloned from the other instead of re-embedded.
         """
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=settings.CHUNK_SIZE,
-            chunk_overlap=settings.CHUNK_OVERLAP,
-            separators=["\n\n", "\n", ". ", " ", ""]
+        return (
+            f"{settings.EMBEDDING_MODEL}|{settings.CHUNK_SIZE}|{settings.CHUNK_OVERLAP}"
+            f"|{self.chunker.strategy}"
         )
-        return splitter.split_text(text)
+    
+    @staticmethod
+    def _page_starts(pages: List[Dict[str, Any]]) -> List[int]:
+        """
+        Character offset in the document text where each page begins
+        
+        Uses the offsets recorded by PDFHandler when present, otherwise
+        rebuilds them from its "\n\n[Page X]\n" page separator.
+        
+        Args:
+            pages: Pages with page_number, text and optional char_start
+        
+        Returns:
+            Sorted start offsets, aligned with pages
+        """
+        if all("char_start" in page for page in pages):
+            return [page["char_start"] for page in pages]
+        
+        starts = []
+        position = 0
+        for page in pages:
+            starts.append(position)
+            position += len(f"\n\n[Page {page['page_number']}]\n") + len(page["text"])
+        
+        # PDFHandler strips the leading separator from the joined text
+        return [max(0, start - 2) for start in starts]
     
     async def add_document(
         self,
         document_id: str,
         text: str,
         metadata: Dict[str, Any],
-        pages: List[Dict[str, Any]] = None
+        pages: List[Dict[str, Any]] = None,
+        progress: Optional[Callable[..., None]] = None
     ) -> int:
         """
         Add document to vector store
@@ -61,90 +132,292 @@ class VectorStore:
             text: Document text content
             metadata: Document metadata
             pages: Optional list of pages with page numbers (for PDFs)
+            progress: Optional callback(stage, percent, **details)
         
         Returns:
             Number of chunks created
         """
-        # Chunk the text
-        chunks = self._chunk_text(text)
+        page_starts = self._page_starts(pages) if pages else []
         
-        if not chunks:
-            return 0
+        async def segments():
+            # Slice the text at page starts so chunks can be mapped to pages
+            length = len(text) or 1
+            if not page_starts or page_starts[0] > 0:
+                end = page_starts[0] if page_starts else len(text)
+                yield {"text": text[:end], "progress": end / length}
+            for index, start in enumerate(page_starts):
+                end = page_starts[index + 1] if index + 1 < len(page_starts) else len(text)
+                yield {
+                    "text": text[start:end],
+                    "page_number": pages[index]["page_number"],
+                    "progress": end / length
+                }
         
-        # Prepare data for ChromaDB
-        chunk_ids = []
-        chunk_metadatas = []
-        chunk_texts = []
-        
-        # If pages are provided, try to map chunks to pages
-        page_mapping = {}
-        if pages:
-            # Create a mapping of text positions to page numbers
-            current_pos = 0
-            for page in pages:
-                page_text = page["text"]
-                page_num = page["page_number"]
-                page_mapping[(current_pos, current_pos + len(page_text))] = page_num
-                current_pos += len(page_text) + 4  # Account for "\n\n[Page X]\n"
-        
-        for idx, chunk in enumerate(chunks):
-            if not chunk.strip():
-                continue
-            
-            chunk_id = f"{document_id}_chunk_{idx}"
-            
-            # Determine page number for this chunk
-            page_number = None
-            if pages:
-                # Find which page this chunk belongs to
-                chunk_start = text.find(chunk)
-                if chunk_start != -1:
-                    for (start, end), page_num in page_mapping.items():
-                        if start <= chunk_start < end:
-                            page_number = page_num
-                            break
-            
-            chunk_metadata = {
-                **metadata,
-                "document_id": document_id,
-                "chunk_index": idx,
-                "chunk_id": chunk_id
-            }
-            
-            # Add page number if available
-            if page_number:
-                chunk_metadata["page_number"] = page_number
+        return await self.add_document_stream(document_id, segments(), metadata, progress)
+    
+    async def add_document_stream(
+        self,
+        document_id: str,
+        segments: AsyncIterator[Dict[str, Any]],
+        metadata: Dict[str, Any],
+        progress: Optional[Callable[..., None]] = None
+    ) -> int:
+        """
+        Add a document whose text arrives in segments (pages, paragraphs, ...)
+        
+        Chunking and embedding/indexing run as two stages joined by a queue
+        of at most INGEST_PIPELINE_QUEUE_SIZE batches: each batch is written
+        as soon as it is chunked, while later segments are still being read,
+        so early chunks are searchable before the document is fully parsed.
+        If any stage fails, the chunks already written are removed.
+        
+        Args:
+            document_id: Unique document identifier
+            segments: Async iterator of {"text", "page_number" (optional),
+                "progress" (optional fraction of the document read)}; the
+                texts concatenated form the document text
+            metadata: Document metadata copied onto every chunk
+            progress: Optional callback(stage, percent, **details)
+        
+        Returns:
+            Number of chunks created
+        """
+        report = progress or (lambda *args, **kwargs: None)
+        batches: asyncio.Queue = asyncio.Queue(maxsize=settings.INGEST_PIPELINE_QUEUE_SIZE)
+        chunked = {"count": 0}
+        
+        producer = asyncio.ensure_future(
+            self._chunk_segments(document_id, segments, metadata, batches, chunked)
+        )
+        writing = None
+        written = 0
+        try:
+            while True:
+                batch = await batches.get()
+                if batch is None:
+                    break
+                
+                # Encode this batch while the previous one is being written
+                embeddings = await self.embedder.encode_documents(batch["texts"])
+                if writing is not None:
+                    await writing
+                    written += writing_size
+                    report(
+                        "embedding", 5 + 90 * batch["progress"],
+                        chunks_total=chunked["count"], chunks_done=written
+                    )
+                writing = asyncio.ensure_future(asyncio.to_thread(
+                    self._write_batch,
+                    document_id, batch["ids"], batch["texts"], batch["metadatas"], embeddings
+                ))
+                writing_size = len(batch["ids"])
             
-            chunk_ids.append(chunk_id)
-            chunk_metadatas.append(chunk_metadata)
-            chunk_texts.append(chunk)
+            if writing is not None:
+                await writing
+                written += writing_size
+                writing = None
+            # Re-raises extraction or chunking errors
+            await producer
+        except BaseException:
+            producer.cancel()
+            # Let an in-flight write land so the cleanup removes it too
+            await asyncio.gather(producer, *([writing] if writing else []), return_exceptions=True)
+            # Never leave a partly indexed document behind
+            await self.delete_document(document_id)
+            raise
         
-        if not chunk_ids:
+        if not written:
             return 0
         
-        # Generate embeddings
-        print(f"🔄 Generating embeddings for {len(chunk_ids)} chunks...")
-        embeddings = self.embedding_model.encode(
-            chunk_texts,
-            show_progress_bar=False
-        ).tolist()
+        report("embedding", 95, chunks_total=written, chunks_done=written)
+        print(f"✅ Added {written} chunks to vector store")
+        return written
+    
+    async def _chunk_segments(
+        self,
+        document_id: str,
+        segments: AsyncIterator[Dict[str, Any]],
+        metadata: Dict[str, Any],
+        batches: asyncio.Queue,
+        chunked: Dict[str, int]
+    ):
+        """
+        Chunking stage of add_document_stream
+        
+        Feeds segments through the chunker and queues chunk records in
+        INGEST_BATCH_SIZE batches, ending with None (also after an error,
+        which add_document_stream re-raises when it awaits this task).
+        """
+        stream = self.chunker.stream()
+        batch_size = settings.INGEST_BATCH_SIZE
+        # Start offset and page number of each page seen so far
+        page_starts: List[int] = []
+        page_numbers: List[int] = []
+        
+        async def chunk_lists():
+            # Chunks completed by each segment, with the fraction read so far
+            position = 0
+            fraction = 0.0
+            async for segment in segments:
+                text = segment["text"]
+                if segment.get("page_number") is not None:
+                    page_starts.append(position)
+                    page_numbers.append(segment["page_number"])
+                position += len(text)
+                fraction = segment.get("progress", fraction)
+                yield await asyncio.to_thread(stream.feed, text), fraction
+            yield await asyncio.to_thread(stream.finish), 1.0
+        
+        try:
+            index = 0
+            batch = {"ids": [], "texts": [], "metadatas": []}
+            async for chunks, fraction in chunk_lists():
+                for chunk_start, chunk in chunks:
+                    chunk_index = index
+                    index += 1
+                    if not chunk.strip():
+                        continue
+                    chunk_id = f"{document_id}_chunk_{chunk_index}"
+                    batch["ids"].append(chunk_id)
+                    batch["texts"].append(chunk)
+                    batch["metadatas"].append(self._chunk_metadata(
+                        document_id, chunk_id, chunk_index, chunk_start, chunk,
+                        metadata, page_starts, page_numbers
+                    ))
+                    chunked["count"] += 1
+                    if len(batch["ids"]) >= batch_size:
+                        await batches.put({**batch, "progress": fraction})
+                        batch = {"ids": [], "texts": [], "metadatas": []}
+            if batch["ids"]:
+                await batches.put({**batch, "progress": 1.0})
+        except asyncio.CancelledError:
+            # The writer stopped reading the queue
+            raise
+        except Exception:
+            await batches.put(None)
+            raise
+        await batches.put(None)
+    
+    @staticmethod
+    def _chunk_metadata(
+        document_id: str,
+        chunk_id: str,
+        index: int,
+        chunk_start: int,
+        chunk: str,
+        metadata: Dict[str, Any],
+        page_starts: List[int],
+        page_numbers: List[int]
+    ) -> Dict[str, Any]:
+        """Metadata for one chunk, with its character range and pages"""
+        chunk_metadata = {
+            **metadata,
+            "document_id": document_id,
+            "chunk_index": index,
+            "chunk_id": chunk_id
+        }
+        
+        if chunk_start >= 0:
+            chunk_end = chunk_start + len(chunk)
+            chunk_metadata["char_start"] = chunk_start
+            chunk_metadata["char_end"] = chunk_end
+            
+            # Add page number (and last page if the chunk spans pages) by
+            # bisecting the page start offsets
+            if page_starts:
+                first_page = bisect_right(page_starts, chunk_start) - 1
+                last_page = bisect_right(page_starts, chunk_end - 1) - 1
+                if first_page >= 0:
+                    chunk_metadata["page_number"] = page_numbers[first_page]
+                    if last_page > first_page:
+                        chunk_metadata["page_end"] = page_numbers[last_page]
         
-        # Add to ChromaDB
-        self.collection.add(
+        return chunk_metadata
+    
+    def _write_batch(
+        self,
+        document_id: str,
+        chunk_ids: List[str],
+        chunk_texts: List[str],
+        chunk_metadatas: List[Dict[str, Any]],
+        embeddings: np.ndarray
+    ):
+        """Write one batch to the vector backend and the keyword index"""
+        self.backend.add(
             ids=chunk_ids,
             embeddings=embeddings,
             documents=chunk_texts,
             metadatas=chunk_metadatas
         )
+        self.lexical_index.add([
+            (chunk_id, document_id, chunk) for chunk_id, chunk in zip(chunk_ids, chunk_texts)
+        ])
+    
+    async def copy_document(
+        self,
+        source_document_id: str,
+        document_id: str,
+        metadata: Dict[str, Any]
+    ) -> int:
+        """
+        Clone another document's chunks and embeddings under a new ID
+        
+        Args:
+            source_document_id: Document whose chunks are reused
+            document_id: New document identifier
+            metadata: Document-level metadata overriding the source's
+                (filename, upload_date, ...)
         
-        print(f"✅ Added {len(chunk_ids)} chunks to vector store")
-        return len(chunk_ids)
+        Returns:
+            Number of chunks copied (0 if the source has no chunks)
+        """
+        copied = 0
+        try:
+            while True:
+                # Page through the source so only one batch of embeddings is held
+                source = await asyncio.to_thread(
+                    self.backend.get,
+                    document_id=source_document_id,
+                    include_embeddings=True,
+                    limit=settings.INGEST_BATCH_SIZE,
+                    offset=copied
+                )
+                if not source["ids"]:
+                    break
+                
+                chunk_ids = []
+                chunk_metadatas = []
+                for source_metadata in source["metadatas"]:
+                    chunk_id = f"{document_id}_chunk_{source_metadata['chunk_index']}"
+                    chunk_ids.append(chunk_id)
+                    chunk_metadatas.append({
+                        **source_metadata,
+                        **metadata,
+                        "document_id": document_id,
+                        "chunk_id": chunk_id
+                    })
+                
+                await asyncio.to_thread(
+                    self._write_batch,
+                    document_id, chunk_ids, source["documents"], chunk_metadatas, source["embeddings"]
+                )
+                copied += len(chunk_ids)
+        except BaseException:
+            await self.delete_document(document_id)
+            raise
+        
+        if not copied:
+            return 0
+        
+        print(f"✅ Reused {copied} chunks from document {source_document_id}")
+        return copied
     
     async def search(
         self,
         query: str,
         n_results: int = 5,
-        document_ids: Optional[List[str]] = None
+        document_ids: Optional[List[str]] = None,
+        search_mode: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for similar chunks
@@ -153,48 +426,147 @@ class VectorStore:
             query: Search query
             n_results: Number of results to return
             document_ids: Optional filter by document IDs
+            search_mode: vector, lexical or hybrid (default: settings.SEARCH_MODE)
         
         Returns:
             List of search results with metadata
         """
+        mode = (search_mode or settings.SEARCH_MODE).lower()
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unsupported search mode: {mode}. Use one of {SEARCH_MODES}")
+        
         # Generate query embedding
-        query_embedding = self.embedding_model.encode([query]).tolist()
-        
-        # Build where filter if document_ids provided
-        where_filter = None
-        if document_ids:
-            where_filter = {"document_id": {"$in": document_ids}}
-        
-        # Query ChromaDB
-        results = self.collection.query(
-            query_embeddings=query_embedding,
-            n_results=n_results,
-            where=where_filter,
-            include=["documents", "metadatas", "distances"]
+        query_embedding = await self.embedder.encode_query(query)
+        
+        # Backend and index reads block; keep them off the event loop
+        if mode == "vector":
+            return await asyncio.to_thread(
+                self._vector_search, query_embedding, n_results, document_ids
+            )
+        
+        if mode == "lexical":
+            lexical_hits = await asyncio.to_thread(
+                self.lexical_index.search, query, n_results, document_ids
+            )
+            return await asyncio.to_thread(self._fetch_results, lexical_hits, query_embedding)
+        
+        # Hybrid: over-fetch from both retrievers (concurrently) and fuse by rank
+        candidates = n_results * settings.HYBRID_CANDIDATE_MULTIPLIER
+        vector_results, lexical_hits = await asyncio.gather(
+            asyncio.to_thread(self._vector_search, query_embedding, candidates, document_ids),
+            asyncio.to_thread(self.lexical_index.search, query, candidates, document_ids)
         )
+        return await asyncio.to_thread(
+            self._fuse, vector_results, lexical_hits, query_embedding, n_results
+        )
+    
+    def _vector_search(
+        self,
+        query_embedding: np.ndarray,
+        n_results: int,
+        document_ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Dense nearest-neighbour search in the vector backend"""
+        hits = self.backend.query(query_embedding, n_results, document_ids)
+        return [
+            self._format_result(hit["document"], hit["metadata"], hit["distance"])
+            for hit in hits
+        ]
+    
+    @staticmethod
+    def _format_result(text: str, metadata: Dict[str, Any], distance: float) -> Dict[str, Any]:
+        """Build a search result dict"""
+        return {
+            "chunk_text": text,
+            "metadata": metadata,
+            "distance": distance,
+            # Convert distance to similarity score (lower distance = higher similarity)
+            "similarity_score": 1 / (1 + distance),
+            "document_id": metadata.get("document_id", "unknown"),
+            "chunk_id": metadata.get("chunk_id", "unknown")
+        }
+    
+    def _fetch_results(
+        self,
+        lexical_hits: List[Dict[str, Any]],
+        query_embedding: np.ndarray
+    ) -> List[Dict[str, Any]]:
+        """
+        Load keyword hits from the vector backend as search results, in hit order
         
-        # Format results
-        search_results = []
-        if results["documents"] and results["documents"][0]:
-            documents = results["documents"][0]
-            metadatas = results["metadatas"][0]
-            distances = results["distances"][0]
-            
-            for i in range(len(documents)):
-                # Convert distance to similarity score (lower distance = higher similarity)
-                similarity_score = 1 / (1 + distances[i])
-                
-                search_results.append({
-                    "chunk_text": documents[i],
-                    "metadata": metadatas[i],
-                    "distance": distances[i],
-                    "similarity_score": similarity_score,
-                    "document_id": metadatas[i].get("document_id", "unknown"),
-                    "chunk_id": metadatas[i].get("chunk_id", "unknown")
-                })
+        Distances are computed against the query embedding (squared L2, the
+        backends' distance) so similarity scores stay comparable with dense
+        results.
+        """
+        if not lexical_hits:
+            return []
+        
+        chunk_ids = [hit["chunk_id"] for hit in lexical_hits]
+        rows = self.backend.get(ids=chunk_ids, include_embeddings=True)
+        if not rows["ids"]:
+            return []
+        
+        # One vectorized pass over the fetched embedding matrix
+        distances = np.sum((rows["embeddings"] - query_embedding) ** 2, axis=1).tolist()
+        by_id = {
+            chunk_id: (text, metadata, distance)
+            for chunk_id, text, metadata, distance
+            in zip(rows["ids"], rows["documents"], rows["metadatas"], distances)
+        }
         
+        search_results = []
+        for hit in lexical_hits:
+            if hit["chunk_id"] not in by_id:
+                continue
+            text, metadata, distance = by_id[hit["chunk_id"]]
+            result = self._format_result(text, metadata, distance)
+            result["bm25_score"] = hit["bm25_score"]
+            search_results.append(result)
         return search_results
     
+    def _fuse(
+        self,
+        vector_results: List[Dict[str, Any]],
+        lexical_hits: List[Dict[str, Any]],
+        query_embedding: np.ndarray,
+        n_results: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Reciprocal rank fusion of dense and keyword rankings
+        
+        score(chunk) = sum over rankings of 1 / (RRF_K + rank)
+        """
+        scores: Dict[str, float] = {}
+        for ranking in (
+            [r["chunk_id"] for r in vector_results],
+            [hit["chunk_id"] for hit in lexical_hits]
+        ):
+            for rank, chunk_id in enumerate(ranking, start=1):
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + 1 / (settings.RRF_K + rank)
+        
+        top_ids = sorted(scores, key=scores.get, reverse=True)[:n_results]
+        
+        # Keyword-only hits still need their text and metadata from the backend
+        results = {r["chunk_id"]: r for r in vector_results}
+        bm25_scores = {hit["chunk_id"]: hit["bm25_score"] for hit in lexical_hits}
+        missing = [
+            {"chunk_id": chunk_id, "bm25_score": bm25_scores[chunk_id]}
+            for chunk_id in top_ids if chunk_id not in results
+        ]
+        for result in self._fetch_results(missing, query_embedding):
+            results[result["chunk_id"]] = result
+        
+        fused = []
+        for chunk_id in top_ids:
+            if chunk_id not in results:
+                continue
+            result = results[chunk_id]
+            if chunk_id in bm25_scores:
+                result["bm25_score"] = bm25_scores[chunk_id]
+            result["fusion_score"] = scores[chunk_id]
+            fused.append(result)
+        return fused
+    
     async def delete_document(self, document_id: str) -> bool:
         """
         Delete all chunks for a document
@@ -206,14 +578,10 @@ class VectorStore:
             Success status
         """
         try:
-            # Get all chunk IDs for this document
-            results = self.collection.get(
-                where={"document_id": document_id}
-            )
-            
-            if results["ids"]:
-                self.collection.delete(ids=results["ids"])
-                print(f"✅ Deleted {len(results['ids'])} chunks for document {document_id}")
+            deleted = await asyncio.to_thread(self.backend.delete_document, document_id)
+            if deleted:
+                print(f"✅ Deleted {deleted} chunks for document {document_id}")
+            await asyncio.to_thread(self.lexical_index.delete_document, document_id)
             
             return True
         except Exception as e:
@@ -227,9 +595,16 @@ class VectorStore:
         Returns:
             Collection statistics
         """
-        count = self.collection.count()
+        count = self.backend.count()
         return {
             "total_chunks": count,
+            "backend": self.backend.name,
+            "vector_storage": self.backend.storage,
             "collection_name": settings.CHROMA_COLLECTION_NAME,
             "embedding_model": settings.EMBEDDING_MODEL
         }
+    
+    def close(self):
+        """Release the vector backend and keyword index"""
+        self.backend.close()
+        self.lexical_index.close()
@@ -69,10 +69,13 @@ class DOCXGenerator:
                 for cite_idx, citation in enumerate(citations[:5], 1):
                     doc_name = citation.get('document_name', 'Unknown')
                     page_num = citation.get('page_number')
+                    page_end = citation.get('page_end')
                     score = citation.get('relevance_score', 0)
                     
                     cite_text = f"{cite_idx}. {doc_name}"
-                    if page_num:
+                    if page_num and page_end and page_end != page_num:
+                        cite_text += f" (Pages {page_num}-{page_end})"
+                    elif page_num:
                         cite_text += f" (Page {page_num})"
                     cite_text += f" - Relevance: {score:.2%}"
                     
@@ -9,6 +9,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 import os
 from datetime import datetime
@@ -16,12 +17,21 @@ from datetime import datetime
 from config import settings
 from api.v1 import documents, queries, health, export
 from services.cleanup_scheduler import DataCleanupScheduler
+from services.registry import registry
+from services.ingestion_jobs import ingestion_queue
+from services.web_scraper import web_scraper
 from middleware.rate_limiter import rate_limiter
 
 # Initialize cleanup scheduler
 cleanup_scheduler = None
 
 
+def _log_warmup_result(task: asyncio.Task):
+    """Surface errors from the background warm-up task"""
+    if not task.cancelled() and task.exception() is not None:
+        print(f"❌ Warm-up task failed: {task.exception()}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
@@ -48,6 +58,18 @@ async def lifespan(app: FastAPI):
     cleanup_scheduler = DataCleanupScheduler()
     cleanup_scheduler.start()
     
+    # Start background ingestion workers
+    await ingestion_queue.start()
+    
+    # Load the shared embedding model and services once, off the event loop.
+    # /api/v1/health reports readiness until this finishes.
+    app.state.warmup_task = None
+    if settings.WARMUP_ON_STARTUP:
+        # Keep a reference so the task is not garbage-collected mid-run
+        app.state.warmup_task = asyncio.create_task(asyncio.to_thread(registry.warm_up))
+        app.state.warmup_task.add_done_callback(_log_warmup_result)
+        print("🔥 Warming up shared embedding model in the background")
+    
     print("=" * 60)
     print("📚 Research With UB360.ai is ready!")
     print(f"📖 API Documentation: http://localhost:8000/docs")
@@ -59,6 +81,11 @@ async def lifespan(app: FastAPI):
     print("\n👋 Shutting down Research With UB360.ai...")
     if cleanup_scheduler:
         cleanup_scheduler.stop()
+    if app.state.warmup_task is not None and not app.state.warmup_task.done():
+        app.state.warmup_task.cancel()
+    await ingestion_queue.stop()
+    await web_scraper.close()
+    registry.shutdown()
 
 
 # Initialize FastAPI app
@@ -124,7 +151,8 @@ async def http_exception_handler(request, exc):
             "success": False,
             "error": exc.detail,
             "status_code": exc.status_code
-        }
+        },
+        headers=getattr(exc, "headers", None)
     )
 
 
@@ -0,0 +1,312 @@
+"""
+Answer cache for RAG responses
+Serves repeat questions over the same retrieved context without calling Gemini
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from config import settings
+from database.embedding_cache import normalize_text
+from database.metadata_store import CorpusChangeLog
+
+
+class AnswerCache:
+    """
+    LRU cache of generated answers
+
+    Entries are keyed by query type, normalized question, document filter,
+    retrieved chunk ids, prompt template version and conversation history.
+    With a similarity threshold set, a question that misses exactly can
+    still reuse an answer for a near-duplicate question that retrieved the
+    same chunks.
+
+    Entries live in one process. Invalidations are also written to the
+    shared corpus change log, and sync() (called before lookups) applies
+    the changes other workers recorded, so multi-worker deployments stay
+    consistent. Log I/O runs on a worker thread and is polled at most once
+    per SYNC_INTERVAL seconds; get() and put() never touch the database.
+    """
+
+    # Seconds between change log polls
+    SYNC_INTERVAL = 0.25
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl_seconds: float = 3600,
+        similarity_threshold: float = 0.0,
+        change_log: Optional[CorpusChangeLog] = None
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_size: Maximum number of cached answers
+            ttl_seconds: Lifetime of an entry (0 disables expiry)
+            similarity_threshold: Cosine similarity for near-duplicate
+                questions (0 disables semantic matching)
+            change_log: Shared log of document changes (None = this
+                process only)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.change_log = change_log
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Context key -> exact keys sharing it, for near-duplicate lookups
+        self._groups: Dict[str, set] = {}
+        # Last change log version applied (None = not read yet)
+        self._seen_version: Optional[int] = None
+        self._last_sync = 0.0
+        # Bumped whenever entries are invalidated, so put() can tell that
+        # the corpus changed while an answer was being generated
+        self.generation = 0
+
+        # Metrics
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _digest(parts: List[Any]) -> str:
+        return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+    @classmethod
+    def context_key(
+        cls,
+        query_type: str,
+        document_ids: Optional[List[str]],
+        chunk_ids: List[str],
+        prompt_version: str,
+        history: str = ""
+    ) -> str:
+        """Key for everything except the question itself"""
+        return cls._digest([
+            query_type,
+            sorted(document_ids) if document_ids else None,
+            sorted(chunk_ids),
+            prompt_version,
+            history,
+        ])
+
+    @classmethod
+    def exact_key(cls, context_key: str, question: str) -> str:
+        """Key for a specific question in a given context"""
+        return cls._digest([context_key, normalize_text(question)])
+
+    @staticmethod
+    def _unit(embedding: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        if embedding is None:
+            return None
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _is_expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return self.ttl_seconds > 0 and now - entry["created_at"] > self.ttl_seconds
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        group = self._groups.get(entry["context_key"])
+        if group is not None:
+            group.discard(key)
+            if not group:
+                del self._groups[entry["context_key"]]
+
+    async def sync(self):
+        """Apply document changes recorded by any worker since the last poll"""
+        now = time.monotonic()
+        if self.change_log is None or now - self._last_sync < self.SYNC_INTERVAL:
+            return
+        # Set before awaiting so concurrent lookups don't poll as well
+        self._last_sync = now
+
+        seen = self._seen_version
+        try:
+            latest, changed = await asyncio.to_thread(self.change_log.changes_since, seen or 0)
+        except Exception as e:
+            print(f"⚠️ Answer cache change log unavailable, clearing cache: {e}")
+            self._drop(None)
+            return
+
+        if seen is not None and latest > seen:
+            self._drop(changed)
+        self._seen_version = max(latest, self._seen_version or 0)
+
+    def get(
+        self,
+        context_key: str,
+        question: str,
+        question_embedding: Optional[np.ndarray] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached answer
+
+        Args:
+            context_key: Output of context_key()
+            question: User's question
+            question_embedding: Query embedding for near-duplicate matching
+
+        Returns:
+            Cached {"answer", "citations", "metadata"} or None
+        """
+        now = time.time()
+        key = self.exact_key(context_key, question)
+        entry = self._entries.get(key)
+
+        if entry is not None and self._is_expired(entry, now):
+            self._remove(key)
+            entry = None
+
+        if entry is None and self.similarity_threshold > 0:
+            entry = self._find_similar(context_key, question_embedding, now)
+            if entry is not None:
+                self.semantic_hits += 1
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(entry["key"])
+        self.hits += 1
+        return entry["result"]
+
+    def _find_similar(
+        self,
+        context_key: str,
+        question_embedding: Optional[np.ndarray],
+        now: float
+    ) -> Optional[Dict[str, Any]]:
+        """Best entry in the same context above the similarity threshold"""
+        query_vector = self._unit(question_embedding)
+        if query_vector is None:
+            return None
+
+        best_entry, best_score = None, self.similarity_threshold
+        for key in list(self._groups.get(context_key, ())):
+            entry = self._entries[key]
+            if self._is_expired(entry, now):
+                self._remove(key)
+                continue
+            if entry["embedding"] is None:
+                continue
+            score = float(np.dot(query_vector, entry["embedding"]))
+            if score >= best_score:
+                best_entry, best_score = entry, score
+
+        return best_entry
+
+    def put(
+        self,
+        context_key: str,
+        question: str,
+        result: Dict[str, Any],
+        document_filter: Optional[List[str]],
+        retrieved_document_ids: List[str],
+        question_embedding: Optional[np.ndarray] = None,
+        generation: Optional[int] = None
+    ):
+        """
+        Store an answer
+
+        Args:
+            context_key: Output of context_key()
+            question: User's question
+            result: {"answer", "citations", "metadata"} to return on a hit
+            document_filter: Document IDs the query was restricted to (None = all)
+            retrieved_document_ids: Documents the retrieved chunks came from
+            question_embedding: Query embedding for near-duplicate matching
+            generation: Value of self.generation when the context was
+                retrieved; if documents changed since, nothing is stored
+        """
+        if generation is not None and generation != self.generation:
+            return
+
+        key = self.exact_key(context_key, question)
+        self._remove(key)
+
+        self._entries[key] = {
+            "key": key,
+            "context_key": context_key,
+            "result": result,
+            "document_ids": set(document_filter or []) | set(retrieved_document_ids),
+            "unfiltered": not document_filter,
+            "embedding": self._unit(question_embedding),
+            "created_at": time.time(),
+        }
+        self._groups.setdefault(context_key, set()).add(key)
+
+        while len(self._entries) > self.max_size:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+
+    async def invalidate_documents(self, document_ids: Optional[List[str]] = None):
+        """
+        Drop answers affected by a change to the document set
+
+        Args:
+            document_ids: Changed documents. Answers that used them, and
+                answers to unfiltered questions (whose candidate set just
+                changed), are removed. None clears everything.
+        """
+        self._drop(document_ids)
+        if self.change_log is not None:
+            try:
+                await asyncio.to_thread(self.change_log.record, document_ids)
+            except Exception as e:
+                print(f"⚠️ Could not record document change for other workers: {e}")
+
+    def _drop(self, document_ids: Optional[List[str]]):
+        """Remove local entries affected by changed documents"""
+        self.generation += 1
+        if document_ids is None:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._groups.clear()
+            return
+
+        changed = set(document_ids)
+        stale = [
+            key for key, entry in self._entries.items()
+            if entry["unfiltered"] or entry["document_ids"] & changed
+        ]
+        for key in stale:
+            self._remove(key)
+        self.invalidations += len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics
+
+        Returns:
+            Hit/miss counters and size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+# Global answer cache instance
+answer_cache = AnswerCache(
+    max_size=settings.ANSWER_CACHE_SIZE,
+    ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+    similarity_threshold=settings.ANSWER_CACHE_SIMILARITY_THRESHOLD,
+    change_log=CorpusChangeLog()
+)
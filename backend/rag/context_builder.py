@@ -0,0 +1,256 @@
+"""
+Context builder
+Packs retrieved chunks and conversation history into a token budget so
+prompt size (and Gemini latency) stays bounded
+"""
+import math
+from typing import List, Dict, Any, Optional, Tuple
+
+from config import settings
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of text
+
+    Uses a characters-per-token ratio (settings.CHARS_PER_TOKEN); close enough
+    for budgeting without calling the Gemini tokenizer on every request.
+
+    Args:
+        text: Any text
+
+    Returns:
+        Estimated number of tokens
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / settings.CHARS_PER_TOKEN)
+
+
+class ContextBuilder:
+    """Dedupes and packs retrieved chunks and history to token budgets"""
+
+    def __init__(
+        self,
+        max_context_tokens: Optional[int] = None,
+        max_history_tokens: Optional[int] = None,
+        max_history_messages: int = 10
+    ):
+        """
+        Initialize budgets
+
+        Args:
+            max_context_tokens: Budget for document context (default: settings.CONTEXT_MAX_TOKENS)
+            max_history_tokens: Budget for conversation history (default: settings.HISTORY_MAX_TOKENS)
+            max_history_messages: Most recent messages considered
+        """
+        self.max_context_tokens = max_context_tokens or settings.CONTEXT_MAX_TOKENS
+        self.max_history_tokens = max_history_tokens or settings.HISTORY_MAX_TOKENS
+        self.max_history_messages = max_history_messages
+
+    @staticmethod
+    def _dedupe(search_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drop repeated text and trim chunk overlap, keeping rank order
+
+        Adjacent chunks of a document share CHUNK_OVERLAP characters. When
+        both are retrieved, the lower-ranked one loses the shared span (found
+        from char_start/char_end); chunks fully covered by higher-ranked ones
+        and exact duplicates (e.g. the same file uploaded twice) are dropped.
+
+        Args:
+            search_results: Search results, best first
+
+        Returns:
+            Copies of the kept results with a context_text field
+        """
+        kept = []
+        seen_texts = set()
+        # document_id -> [(char_start, char_end)] of kept chunks
+        spans: Dict[str, List[Tuple[int, int]]] = {}
+
+        for result in search_results:
+            text = result["chunk_text"]
+            if text in seen_texts:
+                continue
+
+            metadata = result.get("metadata", {})
+            start = metadata.get("char_start")
+            end = metadata.get("char_end")
+            context_text = text
+
+            if start is not None and end is not None:
+                doc_spans = spans.setdefault(result["document_id"], [])
+                if any(s <= start and end <= e for s, e in doc_spans):
+                    continue
+
+                # Trim text already covered by a kept chunk at either edge
+                trim_start, trim_end = start, end
+                for s, e in doc_spans:
+                    if s <= trim_start < e:
+                        trim_start = e
+                    if s < trim_end <= e:
+                        trim_end = s
+                if trim_start < trim_end:
+                    context_text = text[trim_start - start:trim_end - start]
+                doc_spans.append((start, end))
+
+            seen_texts.add(text)
+            kept.append({**result, "context_text": context_text})
+
+        return kept
+
+    @staticmethod
+    def _merge_adjacent(packed: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Stitch neighbouring chunks of the same document into one span
+
+        Chunks are ordered by chunk_index within each document; a chunk that
+        starts at or before the end of the previous one is appended without
+        the overlapping characters. Each merged span takes the rank of its
+        best chunk and cites the full page range it covers.
+
+        Args:
+            packed: Packed results, best first
+
+        Returns:
+            Results with adjacent chunks merged, best first
+        """
+        groups: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        singles = []
+        for rank, result in enumerate(packed):
+            metadata = result.get("metadata", {})
+            if metadata.get("char_start") is None or metadata.get("chunk_index") is None:
+                singles.append((rank, result))
+            else:
+                groups.setdefault(result["document_id"], []).append((rank, result))
+
+        merged = list(singles)
+        for members in groups.values():
+            members.sort(key=lambda item: item[1]["metadata"]["chunk_index"])
+            span = None
+            for rank, result in members:
+                metadata = result["metadata"]
+                start, end = metadata["char_start"], metadata["char_end"]
+                if span is not None and start <= span["end"]:
+                    # Append only the text past the current span's end
+                    text = result["chunk_text"]
+                    span["text"] += text[span["end"] - start:] if end > span["end"] else ""
+                    span["end"] = max(span["end"], end)
+                    span["rank"] = min(span["rank"], rank)
+                    span["members"].append(result)
+                    continue
+                if span is not None:
+                    merged.append(ContextBuilder._finish_span(span))
+                span = {
+                    "rank": rank,
+                    "end": end,
+                    "text": result["chunk_text"],
+                    "members": [result],
+                }
+            if span is not None:
+                merged.append(ContextBuilder._finish_span(span))
+
+        merged.sort(key=lambda item: item[0])
+        return [result for _, result in merged]
+
+    @staticmethod
+    def _finish_span(span: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Build a (rank, result) for a merged span"""
+        members = span["members"]
+        if len(members) == 1:
+            return span["rank"], members[0]
+
+        first = members[0]
+        pages = [
+            page for m in members
+            for page in (m["metadata"].get("page_number"), m["metadata"].get("page_end"))
+            if page is not None
+        ]
+        metadata = {
+            **first["metadata"],
+            "char_end": span["end"],
+        }
+        if pages:
+            metadata["page_number"] = min(pages)
+            if max(pages) > min(pages):
+                metadata["page_end"] = max(pages)
+
+        best = max(members, key=lambda m: m.get("similarity_score", 0.0))
+        return span["rank"], {
+            **best,
+            "chunk_id": first["chunk_id"],
+            "chunk_ids": [m["chunk_id"] for m in members],
+            "chunk_text": span["text"],
+            "context_text": span["text"],
+            "metadata": metadata,
+        }
+
+    def pack(
+        self,
+        search_results: List[Dict[str, Any]],
+        max_tokens: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Select chunks, best first, until the context budget is used, then
+        merge adjacent chunks of the same document
+
+        Args:
+            search_results: Search results, best first
+            max_tokens: Override for the context budget
+
+        Returns:
+            (packed results with context_text, estimated context tokens)
+        """
+        budget = max_tokens or self.max_context_tokens
+        packed = []
+        used = 0
+
+        for result in self._dedupe(search_results):
+            tokens = estimate_tokens(result["context_text"])
+            if used + tokens > budget:
+                if packed:
+                    # Smaller, lower-ranked chunks may still fit
+                    continue
+                # Always keep the best chunk, cut to the budget
+                result["context_text"] = result["context_text"][:budget * settings.CHARS_PER_TOKEN]
+                tokens = estimate_tokens(result["context_text"])
+            packed.append(result)
+            used += tokens
+
+        return self._merge_adjacent(packed), used
+
+    def trim_history(
+        self,
+        history: List[Dict[str, str]],
+        max_tokens: Optional[int] = None
+    ) -> Tuple[List[Dict[str, str]], int]:
+        """
+        Keep the most recent messages that fit the history budget
+
+        Args:
+            history: Conversation messages, oldest first
+            max_tokens: Override for the history budget
+
+        Returns:
+            (kept messages oldest first, estimated history tokens)
+        """
+        budget = max_tokens or self.max_history_tokens
+        kept = []
+        used = 0
+
+        for message in reversed(history[-self.max_history_messages:]):
+            content = message.get("content", "")
+            tokens = estimate_tokens(content)
+            if used + tokens > budget:
+                if not kept:
+                    # Keep the start of an over-long latest message
+                    content = content[:budget * settings.CHARS_PER_TOKEN]
+                    kept.append({**message, "content": content})
+                    used += estimate_tokens(content)
+                break
+            kept.append(message)
+            used += tokens
+
+        kept.reverse()
+        return kept, used
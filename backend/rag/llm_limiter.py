@@ -0,0 +1,77 @@
+"""
+Bounded concurrency for Gemini calls
+Caps in-flight LLM requests per worker and tracks queueing metrics
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any
+
+from config import settings
+
+
+class LLMConcurrencyLimiter:
+    """Semaphore around LLM calls with queue-depth and wait-time metrics"""
+
+    def __init__(self, max_concurrency: int = 8):
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Metrics
+        self.in_flight = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.total_calls = 0
+        self.failed_calls = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        """Wait for a free slot, then hold it for the duration of the call"""
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        wait_start = time.perf_counter()
+
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        wait_time = time.perf_counter() - wait_start
+        self.total_wait_seconds += wait_time
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_time)
+        self.total_calls += 1
+        self.in_flight += 1
+
+        try:
+            yield
+        except BaseException:
+            self.failed_calls += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get limiter metrics
+
+        Returns:
+            Current queue depth, in-flight calls and wait times
+        """
+        avg_wait = self.total_wait_seconds / self.total_calls if self.total_calls else 0.0
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "max_queue_depth": self.max_waiting,
+            "total_calls": self.total_calls,
+            "failed_calls": self.failed_calls,
+            "avg_wait_seconds": round(avg_wait, 4),
+            "max_wait_seconds": round(self.max_wait_seconds, 4),
+        }
+
+
+# Global LLM limiter instance
+llm_limiter = LLMConcurrencyLimiter(max_concurrency=settings.LLM_MAX_CONCURRENCY)
@@ -6,6 +6,9 @@ Professor Persona Prompts with UB360.ai Promotion
 class PromptTemplates:
     """Collection of professor-style prompt templates with UB360.ai branding"""
     
+    # Bump whenever a template changes so cached answers are not reused
+    VERSION = "1"
+    
     # Professor System Context
     SYSTEM_CONTEXT = """You are Professor UB360, a distinguished senior university professor and research mentor at UB360.ai Research Academy.
 
@@ -1,7 +1,7 @@
 """
 RAG Engine with Google Gemini integration
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
@@ -11,13 +11,28 @@ from datetime import datetime
 from config import settings
 from database.vector_store import VectorStore
 from rag.prompts import PromptTemplates
+from rag.llm_limiter import llm_limiter
+from rag.answer_cache import answer_cache
+from rag.reranker import CrossEncoderReranker
+from rag.context_builder import ContextBuilder
 
 
 class RAGEngine:
     """RAG Engine using Google Gemini"""
     
-    def __init__(self):
-        """Initialize RAG engine with Gemini"""
+    def __init__(
+        self,
+        vector_store: Optional[VectorStore] = None,
+        reranker: Optional[CrossEncoderReranker] = None
+    ):
+        """
+        Initialize RAG engine with Gemini
+        
+        Args:
+            vector_store: Shared vector store (a new one is created if omitted)
+            reranker: Shared cross-encoder reranker (created when omitted and
+                RERANK_ENABLED)
+        """
         # Initialize Gemini LLM
         print(f"🤖 Initializing Google Gemini: {settings.GEMINI_MODEL}")
         self.llm = ChatGoogleGenerativeAI(
@@ -26,12 +41,26 @@ class RAGEngine:
             temperature=settings.GEMINI_TEMPERATURE
         )
         
-        # Initialize vector store
-        self.vector_store = VectorStore()
+        # Use shared vector store when provided
+        self.vector_store = vector_store or VectorStore()
+        
+        # Optional second-stage reranking of retrieved chunks
+        if reranker is None and settings.RERANK_ENABLED:
+            reranker = CrossEncoderReranker()
+        self.reranker = reranker
         
         # Initialize prompt templates
         self.prompts = PromptTemplates()
         
+        # Keeps context and history within token budgets
+        self.context_builder = ContextBuilder()
+        
+        # Shared cap on in-flight Gemini calls for this worker
+        self.llm_limiter = llm_limiter
+        
+        # Shared cache of generated answers (invalidated by DocumentManager)
+        self.answer_cache = answer_cache
+        
         # Query history (in-memory for Phase 1)
         self.query_history = []
         
@@ -54,12 +83,89 @@ class RAGEngine:
                 "document_id": result["document_id"],
                 "document_name": metadata.get("filename", "Unknown"),
                 "chunk_id": result["chunk_id"],
+                "chunk_ids": result.get("chunk_ids", [result["chunk_id"]]),
                 "page_number": metadata.get("page_number"),
+                "page_end": metadata.get("page_end"),
                 "relevance_score": result["similarity_score"],
                 "text_snippet": result["chunk_text"][:200] + "..." if len(result["chunk_text"]) > 200 else result["chunk_text"]
             })
         return citations
     
+    async def _run_chain(self, template: str, inputs: Dict[str, Any]) -> str:
+        """
+        Run a prompt through Gemini without blocking the event loop
+        
+        Args:
+            template: Prompt template string
+            inputs: Template variables
+        
+        Returns:
+            Generated text
+        """
+        prompt_template = ChatPromptTemplate.from_template(template)
+        chain = prompt_template | self.llm | StrOutputParser()
+        
+        async with self.llm_limiter.slot():
+            return await chain.ainvoke(inputs)
+    
+    async def _stream_chain(self, template: str, inputs: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Stream a prompt's output from Gemini token by token
+        
+        Args:
+            template: Prompt template string
+            inputs: Template variables
+        
+        Yields:
+            Text fragments as they arrive
+        """
+        prompt_template = ChatPromptTemplate.from_template(template)
+        chain = prompt_template | self.llm | StrOutputParser()
+        
+        async with self.llm_limiter.slot():
+            async for token in chain.astream(inputs):
+                yield token
+    
+    async def _retrieve(
+        self,
+        query: str,
+        n_results: int,
+        document_ids: Optional[List[str]] = None,
+        search_mode: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve context chunks, reranking an over-fetched candidate set
+        when a reranker is configured
+        
+        Args:
+            query: Search query
+            n_results: Number of chunks to return
+            document_ids: Optional filter by document IDs
+            search_mode: vector, lexical or hybrid (default: settings.SEARCH_MODE)
+        
+        Returns:
+            Search results, best first
+        """
+        if self.reranker is None:
+            return await self.vector_store.search(
+                query=query,
+                n_results=n_results,
+                document_ids=document_ids,
+                search_mode=search_mode
+            )
+        
+        candidates = max(
+            n_results,
+            min(n_results * settings.RERANK_CANDIDATE_MULTIPLIER, settings.RERANK_MAX_CANDIDATES)
+        )
+        search_results = await self.vector_store.search(
+            query=query,
+            n_results=candidates,
+            document_ids=document_ids,
+            search_mode=search_mode
+        )
+        return await self.reranker.rerank(query, search_results, n_results)
+    
     def _save_to_history(self, query: str, query_type: str, answer: str):
         """Save query to history"""
         self.query_history.append({
@@ -72,192 +178,129 @@ class RAGEngine:
         if len(self.query_history) > 100:
             self.query_history = self.query_history[-100:]
     
-    async def answer_question(
+    async def _prepare_answer(
         self,
         question: str,
         n_results: int = 5,
         document_ids: Optional[List[str]] = None,
-        conversation_history: List[Dict[str, str]] = None
+        conversation_history: List[Dict[str, str]] = None,
+        search_mode: Optional[str] = None
     ) -> Dict[str, Any]:
-        """
-        Answer a question using RAG or general knowledge (Professor UB360 mode)
-        
-        Args:
-            question: User's question
-            n_results: Number of context chunks to retrieve
-            document_ids: Optional filter by document IDs
-            conversation_history: Previous conversation messages for context
-        
-        Returns:
-            Answer with citations (if documents available)
-        """
-        # Format conversation history
+        """Retrieve context and build the prompt for answer_question"""
+        # Format conversation history (most recent messages within budget)
         if conversation_history is None:
             conversation_history = []
-        history_text = self.prompts.format_conversation_history(conversation_history)
+        history, history_tokens = self.context_builder.trim_history(conversation_history)
+        history_text = self.prompts.format_conversation_history(history)
         
         # Search for relevant context
-        search_results = await self.vector_store.search(
-            query=question,
-            n_results=n_results,
-            document_ids=document_ids
-        )
+        search_results = await self._retrieve(question, n_results, document_ids, search_mode)
         
         # If no documents, use general knowledge (Professor mode)
         if not search_results:
             print("📚 No documents found - Professor UB360 using general knowledge")
-            prompt_template = ChatPromptTemplate.from_template(self.prompts.GENERAL_CHAT_TEMPLATE)
-            chain = prompt_template | self.llm | StrOutputParser()
-            
-            answer = chain.invoke({
-                "question": question,
-                "conversation_history": history_text
-            })
-            
-            self._save_to_history(question, "answer", answer)
-            
             return {
-                "answer": answer,
+                "query": question,
+                "query_type": "answer",
+                "document_ids": document_ids,
+                "template": self.prompts.GENERAL_CHAT_TEMPLATE,
+                "inputs": {
+                    "question": question,
+                    "conversation_history": history_text
+                },
                 "citations": [],
                 "metadata": {
                     "context_found": False,
                     "mode": "general_knowledge",
                     "professor_mode": True,
-                    "used_conversation_history": len(conversation_history) > 0
+                    "used_conversation_history": len(conversation_history) > 0,
+                    "history_tokens": history_tokens
                 }
             }
         
         # With documents - use RAG with Professor persona
+        search_results, context_tokens = self.context_builder.pack(search_results)
         context = "\n\n".join([
-            f"[Source: {r['metadata'].get('filename', 'Unknown')}]\n{r['chunk_text']}"
+            f"[Source: {r['metadata'].get('filename', 'Unknown')}]\n{r['context_text']}"
             for r in search_results
         ])
         
-        # Create prompt with Professor UB360 persona and conversation history
-        prompt_template = ChatPromptTemplate.from_template(self.prompts.ANSWER_TEMPLATE)
-        chain = prompt_template | self.llm | StrOutputParser()
-        
-        # Generate answer with conversation context
-        answer = chain.invoke({
-            "context": context,
-            "question": question,
-            "conversation_history": history_text
-        })
-        
-        # Format citations
-        citations = self._format_citations(search_results)
-        
-        # Save to history
-        self._save_to_history(question, "answer", answer)
-        
         return {
-            "answer": answer,
-            "citations": citations,
+            "query": question,
+            "query_type": "answer",
+            "document_ids": document_ids,
+            "template": self.prompts.ANSWER_TEMPLATE,
+            "inputs": {
+                "context": context,
+                "question": question,
+                "conversation_history": history_text
+            },
+            "citations": self._format_citations(search_results),
             "metadata": {
                 "context_found": True,
                 "num_sources": len(search_results),
                 "professor_mode": True,
-                "used_conversation_history": len(conversation_history) > 0
+                "used_conversation_history": len(conversation_history) > 0,
+                "context_tokens": context_tokens,
+                "history_tokens": history_tokens
             }
         }
-
     
-    async def summarize_documents(
+    async def _prepare_summarize(
         self,
         query: str,
         n_results: int = 10,
-        document_ids: Optional[List[str]] = None
+        document_ids: Optional[List[str]] = None,
+        search_mode: Optional[str] = None
     ) -> Dict[str, Any]:
-        """
-        Summarize documents related to a query
-        
-        Args:
-            query: Topic or query to summarize
-            n_results: Number of chunks to include
-            document_ids: Optional filter by document IDs
-        
-        Returns:
-            Summary with citations
-        """
-        # Search for relevant content
-        search_results = await self.vector_store.search(
-            query=query,
-            n_results=n_results,
-            document_ids=document_ids
-        )
+        """Retrieve context and build the prompt for summarize_documents"""
+        search_results = await self._retrieve(query, n_results, document_ids, search_mode)
         
         if not search_results:
-            return {
-                "answer": "No documents found to summarize.",
-                "citations": [],
-                "metadata": {"context_found": False}
-            }
-        
-        # Combine context
-        context = "\n\n".join([r['chunk_text'] for r in search_results])
+            return self._no_context(query, "summarize", "No documents found to summarize.")
         
-        # Create prompt
-        prompt_template = ChatPromptTemplate.from_template(self.prompts.SUMMARIZE_TEMPLATE)
-        chain = prompt_template | self.llm | StrOutputParser()
-        
-        # Generate summary
-        summary = chain.invoke({
-            "context": context,
-            "topic": query
-        })
-        
-        # Format citations
-        citations = self._format_citations(search_results)
-        
-        # Save to history
-        self._save_to_history(query, "summarize", summary)
+        # Combine context (deduped and packed to the token budget)
+        search_results, context_tokens = self.context_builder.pack(search_results)
+        context = "\n\n".join([r['context_text'] for r in search_results])
         
         return {
-            "answer": summary,
-            "citations": citations,
+            "query": query,
+            "query_type": "summarize",
+            "document_ids": document_ids,
+            "template": self.prompts.SUMMARIZE_TEMPLATE,
+            "inputs": {
+                "context": context,
+                "topic": query
+            },
+            "citations": self._format_citations(search_results),
             "metadata": {
                 "context_found": True,
-                "num_sources": len(search_results)
+                "num_sources": len(search_results),
+                "context_tokens": context_tokens
             }
         }
     
-    async def compare_documents(
+    async def _prepare_compare(
         self,
         query: str,
         n_results: int = 10,
-        document_ids: Optional[List[str]] = None
+        document_ids: Optional[List[str]] = None,
+        search_mode: Optional[str] = None
     ) -> Dict[str, Any]:
-        """
-        Compare information across documents
-        
-        Args:
-            query: Comparison query
-            n_results: Number of chunks to include
-            document_ids: Optional filter by document IDs
-        
-        Returns:
-            Comparison with citations
-        """
-        search_results = await self.vector_store.search(
-            query=query,
-            n_results=n_results,
-            document_ids=document_ids
-        )
+        """Retrieve context and build the prompt for compare_documents"""
+        search_results = await self._retrieve(query, n_results, document_ids, search_mode)
         
         if not search_results:
-            return {
-                "answer": "No documents found to compare.",
-                "citations": [],
-                "metadata": {"context_found": False}
-            }
+            return self._no_context(query, "compare", "No documents found to compare.")
         
         # Group by document
+        search_results, context_tokens = self.context_builder.pack(search_results)
         docs_context = {}
         for result in search_results:
             doc_name = result['metadata'].get('filename', 'Unknown')
             if doc_name not in docs_context:
                 docs_context[doc_name] = []
-            docs_context[doc_name].append(result['chunk_text'])
+            docs_context[doc_name].append(result['context_text'])
         
         # Format context
         context = "\n\n".join([
@@ -265,125 +308,360 @@ class RAGEngine:
             for doc_name, chunks in docs_context.items()
         ])
         
-        # Create prompt
-        prompt_template = ChatPromptTemplate.from_template(self.prompts.COMPARE_TEMPLATE)
-        chain = prompt_template | self.llm | StrOutputParser()
-        
-        # Generate comparison
-        comparison = chain.invoke({
-            "context": context,
-            "query": query
-        })
-        
-        citations = self._format_citations(search_results)
-        self._save_to_history(query, "compare", comparison)
-        
         return {
-            "answer": comparison,
-            "citations": citations,
+            "query": query,
+            "query_type": "compare",
+            "document_ids": document_ids,
+            "template": self.prompts.COMPARE_TEMPLATE,
+            "inputs": {
+                "context": context,
+                "query": query
+            },
+            "citations": self._format_citations(search_results),
             "metadata": {
                 "context_found": True,
-                "num_documents": len(docs_context)
+                "num_documents": len(docs_context),
+                "context_tokens": context_tokens
             }
         }
     
-    async def extract_key_points(
+    async def _prepare_extract(
         self,
         query: str,
         n_results: int = 10,
-        document_ids: Optional[List[str]] = None
+        document_ids: Optional[List[str]] = None,
+        search_mode: Optional[str] = None
     ) -> Dict[str, Any]:
+        """Retrieve context and build the prompt for extract_key_points"""
+        search_results = await self._retrieve(query, n_results, document_ids, search_mode)
+        
+        if not search_results:
+            return self._no_context(query, "extract", "No documents found.")
+        
+        search_results, context_tokens = self.context_builder.pack(search_results)
+        context = "\n\n".join([r['context_text'] for r in search_results])
+        
+        return {
+            "query": query,
+            "query_type": "extract",
+            "document_ids": document_ids,
+            "template": self.prompts.EXTRACT_TEMPLATE,
+            "inputs": {
+                "context": context,
+                "topic": query
+            },
+            "citations": self._format_citations(search_results),
+            "metadata": {"context_found": True, "context_tokens": context_tokens}
+        }
+    
+    async def _prepare_timeline(
+        self,
+        query: str,
+        n_results: int = 10,
+        document_ids: Optional[List[str]] = None,
+        search_mode: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Retrieve context and build the prompt for extract_timeline"""
+        search_results = await self._retrieve(query, n_results, document_ids, search_mode)
+        
+        if not search_results:
+            return self._no_context(query, "timeline", "No documents found.")
+        
+        search_results, context_tokens = self.context_builder.pack(search_results)
+        context = "\n\n".join([r['context_text'] for r in search_results])
+        
+        return {
+            "query": query,
+            "query_type": "timeline",
+            "document_ids": document_ids,
+            "template": self.prompts.TIMELINE_TEMPLATE,
+            "inputs": {
+                "context": context,
+                "topic": query
+            },
+            "citations": self._format_citations(search_results),
+            "metadata": {"context_found": True, "context_tokens": context_tokens}
+        }
+    
+    def _no_context(self, query: str, query_type: str, message: str) -> Dict[str, Any]:
+        """Prepared result for queries that found nothing to work with"""
+        return {
+            "query": query,
+            "query_type": query_type,
+            "document_ids": None,
+            "template": None,
+            "answer": message,
+            "citations": [],
+            "metadata": {"context_found": False}
+        }
+    
+    async def _cache_lookup(self, prepared: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
-        Extract key points from documents
+        Look up a cached answer for a prepared query
         
         Args:
-            query: Topic for key points
-            n_results: Number of chunks to include
-            document_ids: Optional filter by document IDs
+            prepared: Output of one of the _prepare_* methods
         
         Returns:
-            Key points with citations
+            Cached result or None
         """
-        search_results = await self.vector_store.search(
-            query=query,
-            n_results=n_results,
-            document_ids=document_ids
+        if not settings.ANSWER_CACHE_ENABLED or prepared["template"] is None:
+            return None
+        
+        prepared["cache_key"] = self.answer_cache.context_key(
+            query_type=prepared["query_type"],
+            document_ids=prepared["document_ids"],
+            chunk_ids=[cid for c in prepared["citations"] for cid in c["chunk_ids"]],
+            prompt_version=self.prompts.VERSION,
+            history=prepared["inputs"].get("conversation_history", "")
         )
         
-        if not search_results:
-            return {
-                "answer": "No documents found.",
-                "citations": [],
-                "metadata": {"context_found": False}
-            }
+        # Near-duplicate matching needs the question embedding, which the
+        # query embedding cache already holds from retrieval
+        if self.answer_cache.similarity_threshold > 0:
+            prepared["query_embedding"] = await self.vector_store.embedder.encode_query(prepared["query"])
+        
+        # Pick up other workers' document changes, then look up in memory
+        await self.answer_cache.sync()
+        prepared["cache_generation"] = self.answer_cache.generation
+        return self.answer_cache.get(
+            prepared["cache_key"],
+            prepared["query"],
+            prepared.get("query_embedding")
+        )
+    
+    def _cache_store(self, prepared: Dict[str, Any], answer: str):
+        """Store a generated answer for a prepared query"""
+        if "cache_key" not in prepared:
+            return
+        
+        self.answer_cache.put(
+            context_key=prepared["cache_key"],
+            question=prepared["query"],
+            result={"answer": answer},
+            document_filter=prepared["document_ids"],
+            retrieved_document_ids=[c["document_id"] for c in prepared["citations"]],
+            question_embedding=prepared.get("query_embedding"),
+            generation=prepared.get("cache_generation")
+        )
+    
+    async def _complete(self, prepared: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generate the full answer for a prepared query
         
-        context = "\n\n".join([r['chunk_text'] for r in search_results])
+        Args:
+            prepared: Output of one of the _prepare_* methods
         
-        prompt_template = ChatPromptTemplate.from_template(self.prompts.EXTRACT_TEMPLATE)
-        chain = prompt_template | self.llm | StrOutputParser()
+        Returns:
+            Answer with citations and metadata
+        """
+        if prepared["template"] is None:
+            answer = prepared["answer"]
+        else:
+            cached = await self._cache_lookup(prepared)
+            if cached is not None:
+                answer = cached["answer"]
+                prepared["metadata"]["cached"] = True
+            else:
+                answer = await self._run_chain(prepared["template"], prepared["inputs"])
+                self._cache_store(prepared, answer)
+            self._save_to_history(prepared["query"], prepared["query_type"], answer)
         
-        key_points = chain.invoke({
-            "context": context,
-            "topic": query
-        })
+        return {
+            "answer": answer,
+            "citations": prepared["citations"],
+            "metadata": prepared["metadata"]
+        }
+    
+    async def prepare_query(
+        self,
+        query_type: str,
+        question: str,
+        n_results: int = 5,
+        document_ids: Optional[List[str]] = None,
+        conversation_history: List[Dict[str, str]] = None,
+        search_mode: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Run retrieval for any query type without calling the LLM
         
-        citations = self._format_citations(search_results)
-        self._save_to_history(query, "extract", key_points)
+        Args:
+            query_type: One of answer, summarize, compare, extract, timeline
+            question: User's question or topic
+            n_results: Number of context chunks to retrieve
+            document_ids: Optional filter by document IDs
+            conversation_history: Previous conversation messages (answer only)
+            search_mode: vector, lexical or hybrid (default: settings.SEARCH_MODE)
         
-        return {
-            "answer": key_points,
-            "citations": citations,
-            "metadata": {"context_found": True}
+        Returns:
+            Prepared query (prompt, inputs, citations, metadata)
+        """
+        if query_type == "answer":
+            return await self._prepare_answer(question, n_results, document_ids, conversation_history, search_mode)
+        
+        preparers = {
+            "summarize": self._prepare_summarize,
+            "compare": self._prepare_compare,
+            "extract": self._prepare_extract,
+            "timeline": self._prepare_timeline,
         }
+        if query_type not in preparers:
+            raise ValueError(f"Unsupported query type: {query_type}")
+        
+        return await preparers[query_type](question, n_results, document_ids, search_mode)
     
-    async def extract_timeline(
+    async def stream_prepared(self, prepared: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a prepared query as events
+        
+        Citations are emitted first, then answer tokens as Gemini produces
+        them, then a final event with metadata.
+        
+        Args:
+            prepared: Output of prepare_query
+        
+        Yields:
+            Dicts with "event" (citations, token, done) and "data"
+        """
+        cached = await self._cache_lookup(prepared)
+        if cached is not None:
+            prepared["metadata"]["cached"] = True
+        
+        yield {
+            "event": "citations",
+            "data": {
+                "citations": prepared["citations"],
+                "metadata": prepared["metadata"]
+            }
+        }
+        
+        if prepared["template"] is None:
+            yield {"event": "token", "data": {"text": prepared["answer"]}}
+        elif cached is not None:
+            yield {"event": "token", "data": {"text": cached["answer"]}}
+            self._save_to_history(prepared["query"], prepared["query_type"], cached["answer"])
+        else:
+            parts = []
+            async for token in self._stream_chain(prepared["template"], prepared["inputs"]):
+                parts.append(token)
+                yield {"event": "token", "data": {"text": token}}
+            answer = "".join(parts)
+            self._cache_store(prepared, answer)
+            self._save_to_history(prepared["query"], prepared["query_type"], answer)
+        
+        yield {"event": "done", "data": {"metadata": prepared["metadata"]}}
+    
+    async def answer_question(
+        self,
+        question: str,
+        n_results: int = 5,
+        document_ids: Optional[List[str]] = None,
+        conversation_history: List[Dict[str, str]] = None,
+        search_mode: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Answer a question using RAG or general knowledge (Professor UB360 mode)
+        
+        Args:
+            question: User's question
+            n_results: Number of context chunks to retrieve
+            document_ids: Optional filter by document IDs
+            conversation_history: Previous conversation messages for context
+            search_mode: vector, lexical or hybrid (default: settings.SEARCH_MODE)
+        
+        Returns:
+            Answer with citations (if documents available)
+        """
+        prepared = await self._prepare_answer(question, n_results, document_ids, conversation_history, search_mode)
+        return await self._complete(prepared)
+    
+    async def summarize_documents(
         self,
         query: str,
         n_results: int = 10,
-        document_ids: Optional[List[str]] = None
+        document_ids: Optional[List[str]] = None,
+        search_mode: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Extract timeline/chronological information
+        Summarize documents related to a query
         
         Args:
-            query: Topic for timeline
+            query: Topic or query to summarize
             n_results: Number of chunks to include
             document_ids: Optional filter by document IDs
+            search_mode: vector, lexical or hybrid (default: settings.SEARCH_MODE)
         
         Returns:
-            Timeline with citations
+            Summary with citations
         """
-        search_results = await self.vector_store.search(
-            query=query,
-            n_results=n_results,
-            document_ids=document_ids
-        )
+        prepared = await self._prepare_summarize(query, n_results, document_ids, search_mode)
+        return await self._complete(prepared)
+    
+    async def compare_documents(
+        self,
+        query: str,
+        n_results: int = 10,
+        document_ids: Optional[List[str]] = None,
+        search_mode: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Compare information across documents
         
-        if not search_results:
-            return {
-                "answer": "No documents found.",
-                "citations": [],
-                "metadata": {"context_found": False}
-            }
+        Args:
+            query: Comparison query
+            n_results: Number of chunks to include
+            document_ids: Optional filter by document IDs
+            search_mode: vector, lexical or hybrid (default: settings.SEARCH_MODE)
         
-        context = "\n\n".join([r['chunk_text'] for r in search_results])
+        Returns:
+            Comparison with citations
+        """
+        prepared = await self._prepare_compare(query, n_results, document_ids, search_mode)
+        return await self._complete(prepared)
+    
+    async def extract_key_points(
+        self,
+        query: str,
+        n_results: int = 10,
+        document_ids: Optional[List[str]] = None,
+        search_mode: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract key points from documents
         
-        prompt_template = ChatPromptTemplate.from_template(self.prompts.TIMELINE_TEMPLATE)
-        chain = prompt_template | self.llm | StrOutputParser()
+        Args:
+            query: Topic for key points
+            n_results: Number of chunks to include
+            document_ids: Optional filter by document IDs
+            search_mode: vector, lexical or hybrid (default: settings.SEARCH_MODE)
         
-        timeline = chain.invoke({
-            "context": context,
-            "topic": query
-        })
+        Returns:
+            Key points with citations
+        """
+        prepared = await self._prepare_extract(query, n_results, document_ids, search_mode)
+        return await self._complete(prepared)
+    
+    async def extract_timeline(
+        self,
+        query: str,
+        n_results: int = 10,
+        document_ids: Optional[List[str]] = None,
+        search_mode: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract timeline/chronological information
         
-        citations = self._format_citations(search_results)
-        self._save_to_history(query, "timeline", timeline)
+        Args:
+            query: Topic for timeline
+            n_results: Number of chunks to include
+            document_ids: Optional filter by document IDs
+            search_mode: vector, lexical or hybrid (default: settings.SEARCH_MODE)
         
-        return {
-            "answer": timeline,
-            "citations": citations,
-            "metadata": {"context_found": True}
-        }
+        Returns:
+            Timeline with citations
+        """
+        prepared = await self._prepare_timeline(query, n_results, document_ids, search_mode)
+        return await self._complete(prepared)
     
     async def get_query_history(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
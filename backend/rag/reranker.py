@@ -0,0 +1,118 @@
+"""
+Cross-encoder reranker
+Scores (question, chunk) pairs jointly so the few chunks sent to Gemini are
+the most relevant of a larger bi-encoder candidate set
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+
+from config import settings
+
+
+class CrossEncoderReranker:
+    """Small CPU cross-encoder that reorders retrieval candidates"""
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        batch_size: Optional[int] = None
+    ):
+        """
+        Configure the reranker (the model is loaded on first use)
+
+        Args:
+            model_name: CrossEncoder model (default: settings.RERANK_MODEL)
+            batch_size: Pairs scored per forward pass (default: settings.RERANK_BATCH_SIZE)
+        """
+        self.model_name = model_name or settings.RERANK_MODEL
+        self.batch_size = batch_size or settings.RERANK_BATCH_SIZE
+
+        self._model = None
+        self._model_lock = threading.Lock()
+        # One thread: a single CPU model gains nothing from concurrent predicts
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rerank")
+
+        # Metrics
+        self.calls = 0
+        self.scored_pairs = 0
+        self.rerank_seconds = 0.0
+
+    @property
+    def model(self):
+        """Loaded CrossEncoder model"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import CrossEncoder
+                    print(f"📦 Loading rerank model: {self.model_name}")
+                    self._model = CrossEncoder(self.model_name)
+        return self._model
+
+    def warm_up(self):
+        """Load the model and score one pair so the first query is not slow"""
+        self.model.predict([("warm-up", "warm-up")], show_progress_bar=False)
+
+    def _score(self, query: str, texts: List[str]) -> List[float]:
+        """Score pairs on the executor thread"""
+        start_time = time.perf_counter()
+        scores = self.model.predict(
+            [(query, text) for text in texts],
+            batch_size=self.batch_size,
+            show_progress_bar=False
+        )
+        self.rerank_seconds += time.perf_counter() - start_time
+        self.scored_pairs += len(texts)
+        return [float(score) for score in scores]
+
+    async def rerank(
+        self,
+        query: str,
+        results: List[Dict[str, Any]],
+        top_n: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Reorder search results by cross-encoder score
+
+        Args:
+            query: Search query
+            results: Candidate search results (from VectorStore.search)
+            top_n: Number of results to keep
+
+        Returns:
+            Best top_n results, each with a rerank_score
+        """
+        if not results:
+            return results
+
+        self.calls += 1
+        loop = asyncio.get_running_loop()
+        scores = await loop.run_in_executor(
+            self.executor, self._score, query, [r["chunk_text"] for r in results]
+        )
+
+        for result, score in zip(results, scores):
+            result["rerank_score"] = score
+
+        return sorted(results, key=lambda r: r["rerank_score"], reverse=True)[:top_n]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get reranker metrics
+
+        Returns:
+            Call, pair and timing counters
+        """
+        return {
+            "model": self.model_name,
+            "loaded": self._model is not None,
+            "calls": self.calls,
+            "scored_pairs": self.scored_pairs,
+            "rerank_seconds": round(self.rerank_seconds, 3),
+        }
+
+    def shutdown(self):
+        """Stop the executor"""
+        self.executor.shutdown(wait=False)
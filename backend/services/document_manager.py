@@ -2,168 +2,622 @@
 Document management service
 Handles document upload, storage, and metadata tracking
 """
+import asyncio
+import hashlib
+import mimetypes
+import threading
+import time
 import uuid
-import json
+import zipfile
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable, Iterator, AsyncIterator, Tuple
 from fastapi import UploadFile
 
 from config import settings
 from database.vector_store import VectorStore
+from database.metadata_store import MetadataStore
 from services.pdf_handler import PDFHandler
 from services.docx_handler import DOCXHandler
-from services.web_scraper import WebScraper
+from services.web_scraper import WebScraper, web_scraper
+from rag.answer_cache import answer_cache
+
+# Progress callback: (stage, percent, **details) -> None
+ProgressCallback = Callable[..., None]
+
+# Characters read per block when streaming plain text files
+TEXT_BLOCK_CHARS = 64 * 1024
+
+
+async def _iterate_in_thread(iterator: Iterator[Any], maxsize: int) -> AsyncIterator[Any]:
+    """
+    Consume a blocking iterator on a dedicated thread
+    
+    Items are handed over through a queue of at most maxsize, so the thread
+    runs ahead of the consumer by a bounded amount. If the consumer stops
+    early, the thread stops at its next item and closes the iterator.
+    
+    Args:
+        iterator: Blocking iterator (e.g. PDF pages being extracted)
+        maxsize: Items buffered between the thread and the consumer
+    
+    Yields:
+        Items of iterator; its exceptions are re-raised here
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    
+    def hand_over(kind: str, value: Any = None):
+        asyncio.run_coroutine_threadsafe(queue.put((kind, value)), loop).result()
+    
+    def pump():
+        try:
+            for item in iterator:
+                if stop.is_set():
+                    return
+                hand_over("item", item)
+            hand_over("done")
+        except BaseException as e:
+            if not stop.is_set():
+                hand_over("error", e)
+        finally:
+            if hasattr(iterator, "close"):
+                iterator.close()
+    
+    # Not the default executor: a long extraction would hold one of its
+    # workers, which the chunking and writing stages also run on
+    threading.Thread(target=pump, name="ingest-extract", daemon=True).start()
+    try:
+        while True:
+            kind, value = await queue.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            yield value
+    finally:
+        stop.set()
+        # Unblock a pending hand-over so the thread can see the stop flag
+        while not queue.empty():
+            queue.get_nowait()
+
+
+class FileTooLargeError(ValueError):
+    """Raised when an upload exceeds MAX_FILE_SIZE_MB"""
+    
+    def __init__(self, size_bytes: int):
+        # Bytes seen before the upload was rejected (a lower bound when streaming)
+        self.size_bytes = size_bytes
+        super().__init__(f"File too large. Max size: {settings.MAX_FILE_SIZE_MB}MB")
 
 
 class DocumentManager:
     """Manages document uploads and metadata"""
     
-    def __init__(self):
+    def __init__(self, vector_store: Optional[VectorStore] = None):
+        """
+        Initialize document manager
+        
+        Args:
+            vector_store: Shared vector store (a new one is created if omitted)
+        """
         self.upload_dir = settings.UPLOAD_DIR
-        self.metadata_file = self.upload_dir / "documents_metadata.json"
-        self.vector_store = VectorStore()
-        self._load_metadata()
-    
-    def _load_metadata(self):
-        """Load document metadata from file"""
-        if self.metadata_file.exists():
-            with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                self.documents_metadata = json.load(f)
-        else:
-            self.documents_metadata = {}
+        self.vector_store = vector_store or VectorStore()
+        
+        # Indexed SQLite metadata (imports legacy documents_metadata.json once)
+        self.metadata_store = MetadataStore(
+            legacy_json_path=self.upload_dir / "documents_metadata.json"
+        )
     
-    def _save_metadata(self):
-        """Save document metadata to file"""
-        with open(self.metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(self.documents_metadata, f, indent=2, default=str)
+    @staticmethod
+    def _with_datetime(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert upload_date string back to datetime"""
+        if isinstance(record["upload_date"], str):
+            record["upload_date"] = datetime.fromisoformat(record["upload_date"])
+        return record
     
     async def process_and_store(
         self,
         file: UploadFile,
-        contents: bytes
+        progress: Optional[ProgressCallback] = None
     ) -> Dict[str, Any]:
         """
         Process uploaded document and store in vector database
         
         Args:
             file: Uploaded file object
-            contents: File contents as bytes
+            progress: Optional callback(stage, percent, **details)
         
         Returns:
             Dictionary with document information
         """
+        upload = await self.save_upload(file)
+        return await self.ingest_upload(upload, progress)
+    
+    async def save_upload(self, file: UploadFile) -> Dict[str, Any]:
+        """
+        Stream an uploaded file to the upload directory
+        
+        The file is copied in UPLOAD_CHUNK_SIZE_KB chunks while its size and
+        SHA-256 are computed, so memory per upload stays constant. The copy
+        stops as soon as MAX_FILE_SIZE_MB is exceeded.
+        
+        Args:
+            file: Uploaded file object
+        
+        Returns:
+            Saved upload info for ingest_upload
+        
+        Raises:
+            FileTooLargeError: If the file exceeds MAX_FILE_SIZE_MB
+        """
+        filename = file.filename
+        max_bytes = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+        
+        # Reject up front when the client told us the size
+        if file.size is not None and file.size > max_bytes:
+            raise FileTooLargeError(file.size)
+        
         # Generate unique document ID
         document_id = str(uuid.uuid4())
         
         # Determine document type
-        file_ext = f".{file.filename.split('.')[-1].lower()}"
+        document_type = self._document_type(filename)
+        
+        # Stream file to upload directory
+        file_path = self.upload_dir / f"{document_id}_{filename}"
+        chunk_size = settings.UPLOAD_CHUNK_SIZE_KB * 1024
+        sha256 = hashlib.sha256()
+        file_size = 0
+        
+        try:
+            with open(file_path, 'wb') as f:
+                while chunk := await file.read(chunk_size):
+                    file_size += len(chunk)
+                    if file_size > max_bytes:
+                        raise FileTooLargeError(file_size)
+                    sha256.update(chunk)
+                    await asyncio.to_thread(f.write, chunk)
+        except BaseException:
+            file_path.unlink(missing_ok=True)
+            raise
+        
+        return {
+            "document_id": document_id,
+            "filename": filename,
+            "content_type": file.content_type,
+            "document_type": document_type,
+            "file_path": file_path,
+            "file_size": file_size,
+            "content_hash": sha256.hexdigest()
+        }
+    
+    @staticmethod
+    def _document_type(filename: str) -> str:
+        """Document type for a file name's extension (txt if unknown)"""
+        file_ext = f".{filename.split('.')[-1].lower()}"
         doc_type_map = {
             ".pdf": "pdf",
             ".docx": "docx",
             ".txt": "txt",
             ".md": "md"
         }
-        document_type = doc_type_map.get(file_ext, "txt")
+        return doc_type_map.get(file_ext, "txt")
+    
+    async def save_archive(
+        self,
+        file: UploadFile,
+        max_files: int,
+        max_total_bytes: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Unpack the supported documents in an uploaded zip archive
         
-        # Save file to upload directory
-        file_path = self.upload_dir / f"{document_id}_{file.filename}"
-        with open(file_path, 'wb') as f:
-            f.write(contents)
+        Each member is streamed to the upload directory like save_upload,
+        with the same MAX_FILE_SIZE_MB limit (enforced on the decompressed
+        bytes). Folders, hidden files and macOS metadata are ignored.
         
-        # Extract text and metadata based on document type
-        extracted_data = await self._extract_content(file_path, document_type)
+        Args:
+            file: Uploaded .zip file
+            max_files: Most documents the archive may contain
+            max_total_bytes: Most bytes the documents may decompress to
         
-        # Store in vector database with page tracking
-        num_chunks = await self.vector_store.add_document(
-            document_id=document_id,
-            text=extracted_data["text"],
-            metadata={
-                "filename": file.filename,
-                "document_type": document_type,
-                "upload_date": datetime.now().isoformat(),
-                "file_size": len(contents),
-                **extracted_data["metadata"]
-            },
-            pages=extracted_data.get("pages", [])
+        Returns:
+            Per document, saved upload info for ingest_upload, or
+            {"filename", "error"} if it was rejected
+        
+        Raises:
+            ValueError: If the archive holds more than max_files documents
+                or more than max_total_bytes (nothing is kept)
+        """
+        try:
+            return await asyncio.to_thread(
+                self._extract_archive, file.file, max_files, max_total_bytes
+            )
+        except zipfile.BadZipFile:
+            return [{"filename": file.filename, "error": "Not a valid zip archive"}]
+    
+    def _extract_archive(self, archive, max_files: int, max_total_bytes: int) -> List[Dict[str, Any]]:
+        """Blocking implementation of save_archive"""
+        entries: List[Dict[str, Any]] = []
+        try:
+            self._extract_members(archive, max_files, max_total_bytes, entries)
+        except BaseException:
+            for entry in entries:
+                if "file_path" in entry:
+                    entry["file_path"].unlink(missing_ok=True)
+            raise
+        return entries
+    
+    def _extract_members(
+        self,
+        archive,
+        max_files: int,
+        max_total_bytes: int,
+        entries: List[Dict[str, Any]]
+    ):
+        """Save the archive's documents, appending to entries as they are saved"""
+        max_bytes = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+        chunk_size = settings.UPLOAD_CHUNK_SIZE_KB * 1024
+        too_large = ValueError(
+            f"Archives too large. Max decompressed size per batch: {settings.BATCH_UPLOAD_MAX_ARCHIVE_MB}MB"
         )
+        total_bytes = 0
+        
+        with zipfile.ZipFile(archive) as zip_file:
+            members = [
+                member for member in zip_file.infolist()
+                if not member.is_dir()
+                and not Path(member.filename).name.startswith(".")
+                and not member.filename.startswith("__MACOSX/")
+            ]
+            if len(members) > max_files:
+                raise ValueError(f"Too many files. Max files per batch: {settings.BATCH_UPLOAD_MAX_FILES}")
+            # Declared sizes first (cheap); the bytes read are checked below
+            # because headers can understate them
+            if sum(member.file_size for member in members) > max_total_bytes:
+                raise too_large
+            
+            for member in members:
+                filename = Path(member.filename).name
+                file_ext = f".{filename.split('.')[-1].lower()}"
+                if file_ext not in settings.ALLOWED_EXTENSIONS:
+                    entries.append({
+                        "filename": filename,
+                        "error": f"File type {file_ext} not supported. Allowed: {settings.ALLOWED_EXTENSIONS}"
+                    })
+                    continue
+                if member.file_size > max_bytes:
+                    entries.append({"filename": filename, "error": str(FileTooLargeError(member.file_size))})
+                    continue
+                
+                document_id = str(uuid.uuid4())
+                file_path = self.upload_dir / f"{document_id}_{filename}"
+                sha256 = hashlib.sha256()
+                file_size = 0
+                try:
+                    with zip_file.open(member) as source, open(file_path, 'wb') as f:
+                        while chunk := source.read(chunk_size):
+                            file_size += len(chunk)
+                            if file_size > max_bytes:
+                                raise FileTooLargeError(file_size)
+                            if total_bytes + file_size > max_total_bytes:
+                                raise too_large
+                            sha256.update(chunk)
+                            f.write(chunk)
+                except FileTooLargeError as e:
+                    file_path.unlink(missing_ok=True)
+                    entries.append({"filename": filename, "error": str(e)})
+                    continue
+                except BaseException:
+                    file_path.unlink(missing_ok=True)
+                    raise
+                
+                total_bytes += file_size
+                entries.append({
+                    "document_id": document_id,
+                    "filename": filename,
+                    "content_type": mimetypes.guess_type(filename)[0] or "application/octet-stream",
+                    "document_type": self._document_type(filename),
+                    "file_path": file_path,
+                    "file_size": file_size,
+                    "content_hash": sha256.hexdigest()
+                })
+    
+    async def ingest_uploads(
+        self,
+        uploads: List[Dict[str, Any]],
+        concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Ingest several saved uploads concurrently
+        
+        Up to `concurrency` documents are extracted and embedded at once;
+        their small embedding batches are coalesced by the shared
+        EmbeddingService. A failed document does not stop the others.
+        
+        Args:
+            uploads: Outputs of save_upload / save_archive
+            concurrency: Documents ingested at once (default: settings.BATCH_INGEST_CONCURRENCY)
+        
+        Returns:
+            Per upload, in order: {"filename", "seconds"} plus "record"
+            (as returned by ingest_upload) or "error"
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.BATCH_INGEST_CONCURRENCY)
+        
+        async def ingest(upload: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    record = await self.ingest_upload(upload)
+                    result = {"record": record}
+                except Exception as e:
+                    print(f"❌ Batch ingestion of {upload['filename']} failed: {e}")
+                    result = {"error": str(e)}
+                result["filename"] = upload["filename"]
+                result["seconds"] = time.perf_counter() - started
+                return result
+        
+        return list(await asyncio.gather(*(ingest(upload) for upload in uploads)))
+    
+    async def ingest_upload(
+        self,
+        upload: Dict[str, Any],
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract, chunk, embed and index a saved upload
+        
+        Args:
+            upload: Output of save_upload
+            progress: Optional callback(stage, percent, **details)
+        
+        Returns:
+            Dictionary with document information
+        """
+        report = progress or (lambda *args, **kwargs: None)
+        document_id = upload["document_id"]
+        
+        try:
+            # Identical file already ingested with the same model/chunking:
+            # reuse its chunks and vectors instead of recomputing them
+            if upload.get("content_hash"):
+                record = await self._ingest_duplicate(upload, report)
+                if record is not None:
+                    return record
+            
+            # Extract, chunk and embed as a pipeline: pages are read on a
+            # worker thread while earlier pages are chunked and indexed
+            report("extracting", 5)
+            content = await asyncio.to_thread(
+                self._open_content, upload["file_path"], upload["document_type"]
+            )
+            
+            # Store in vector database with page tracking
+            num_chunks = await self.vector_store.add_document_stream(
+                document_id=document_id,
+                segments=_iterate_in_thread(content["segments"], settings.INGEST_PIPELINE_QUEUE_SIZE),
+                metadata={
+                    "filename": upload["filename"],
+                    "document_type": upload["document_type"],
+                    "upload_date": datetime.now().isoformat(),
+                    "file_size": upload["file_size"],
+                    **content["metadata"]
+                },
+                progress=report
+            )
+        except BaseException:
+            # Don't leave orphaned files or partial chunks behind (also when
+            # cancelled at shutdown); the file first, as it needs no await
+            Path(upload["file_path"]).unlink(missing_ok=True)
+            await self.vector_store.delete_document(document_id)
+            raise
         
         # Save metadata
-        self.documents_metadata[document_id] = {
+        record = {
             "document_id": document_id,
-            "filename": file.filename,
-            "document_type": document_type,
+            "filename": upload["filename"],
+            "document_type": upload["document_type"],
             "upload_date": datetime.now().isoformat(),
-            "file_size": len(contents),
-            "file_path": str(file_path),
+            "file_size": upload["file_size"],
+            "file_path": str(upload["file_path"]),
             "num_chunks": num_chunks,
             "metadata": {
-                "original_filename": file.filename,
-                "content_type": file.content_type,
-                **extracted_data["metadata"]
+                "original_filename": upload["filename"],
+                "content_type": upload["content_type"],
+                **content["metadata"]
+            },
+            "content_hash": upload.get("content_hash"),
+            "ingest_signature": self.vector_store.ingest_signature
+        }
+        self.metadata_store.upsert(record)
+        
+        # New document changes what unfiltered questions can retrieve
+        await answer_cache.invalidate_documents([document_id])
+        
+        return record
+    
+    async def _ingest_duplicate(
+        self,
+        upload: Dict[str, Any],
+        report: ProgressCallback
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Store an upload by cloning an identical, already indexed document
+        
+        Args:
+            upload: Output of save_upload
+            report: Progress callback
+        
+        Returns:
+            Document information, or None if there is nothing to reuse
+        """
+        signature = self.vector_store.ingest_signature
+        source = self.metadata_store.find_by_content(
+            upload["content_hash"], signature, document_type=upload["document_type"]
+        )
+        if source is None:
+            return None
+        
+        document_id = upload["document_id"]
+        upload_date = datetime.now().isoformat()
+        
+        # Source metadata minus what belongs to the original upload
+        extracted_metadata = {
+            key: value for key, value in source["metadata"].items()
+            if key not in ("original_filename", "content_type", "deduplicated_from")
+        }
+        
+        # A failed copy is cleaned up by ingest_upload
+        report("deduplicating", 50)
+        num_chunks = await self.vector_store.copy_document(
+            source["document_id"],
+            document_id,
+            metadata={
+                "filename": upload["filename"],
+                "upload_date": upload_date,
+                "file_size": upload["file_size"]
             }
+        )
+        
+        if num_chunks == 0:
+            # Source was deleted (or never had chunks); ingest normally
+            return None
+        
+        record = {
+            "document_id": document_id,
+            "filename": upload["filename"],
+            "document_type": upload["document_type"],
+            "upload_date": upload_date,
+            "file_size": upload["file_size"],
+            "file_path": str(upload["file_path"]),
+            "num_chunks": num_chunks,
+            "metadata": {
+                "original_filename": upload["filename"],
+                "content_type": upload["content_type"],
+                **extracted_metadata,
+                "deduplicated_from": source["document_id"]
+            },
+            "content_hash": upload["content_hash"],
+            "ingest_signature": signature
         }
-        self._save_metadata()
+        self.metadata_store.upsert(record)
         
-        return self.documents_metadata[document_id]
+        await answer_cache.invalidate_documents([document_id])
+        
+        print(f"♻️ {upload['filename']} matches document {source['document_id']}, skipped re-embedding")
+        return record
     
-    async def _extract_content(self, file_path: Path, document_type: str) -> Dict[str, Any]:
+    def _open_content(self, file_path: Path, document_type: str) -> Dict[str, Any]:
         """
-        Extract content from document based on type
+        Open a document for streaming extraction based on type
         
         Args:
             file_path: Path to document
             document_type: Type of document (pdf, docx, txt, md)
         
         Returns:
-            Dictionary with text, metadata, and optional pages
+            Dictionary with metadata and segments, an iterator of
+            {"text", "page_number" (PDFs), "progress"} whose texts form the
+            document text. Counts that need the whole text (word_count and
+            char_count for txt/md) are added to metadata once segments is
+            exhausted.
         """
         try:
             if document_type == "pdf":
-                # Extract PDF with page tracking
-                result = PDFHandler.extract_text_and_metadata(str(file_path))
+                # Extract PDF page by page with page tracking
+                opened = PDFHandler.open_pages(str(file_path))
                 return {
-                    "text": result["text"],
-                    "pages": result["pages"],
-                    "metadata": result["metadata"]
+                    "metadata": opened["metadata"],
+                    "segments": self._page_segments(
+                        opened["pages"], opened["metadata"].get("total_pages", 0)
+                    )
                 }
             
             elif document_type == "docx":
-                # Extract DOCX
-                result = DOCXHandler.extract_text_and_metadata(str(file_path))
+                # Extract DOCX paragraph by paragraph
+                opened = DOCXHandler.open_paragraphs(str(file_path))
                 return {
-                    "text": result["text"],
-                    "metadata": result["metadata"]
-                }
-            
-            elif document_type in ["txt", "md"]:
-                # Extract plain text
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    text = f.read()
-                return {
-                    "text": text,
-                    "metadata": {
-                        "word_count": len(text.split()),
-                        "char_count": len(text)
-                    }
+                    "metadata": opened["metadata"],
+                    "segments": self._paragraph_segments(
+                        opened["paragraphs"], opened["metadata"].get("total_paragraphs", 0)
+                    )
                 }
             
             else:
-                # Fallback
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    text = f.read()
+                # Plain text (and fallback), read in blocks
+                metadata = {}
                 return {
-                    "text": text,
-                    "metadata": {}
+                    "metadata": metadata,
+                    "segments": self._text_segments(
+                        file_path, metadata, count=document_type in ["txt", "md"]
+                    )
                 }
         
         except Exception as e:
             raise Exception(f"Error extracting content from {document_type}: {str(e)}")
     
+    @staticmethod
+    def _page_segments(pages: Iterator[Tuple[int, str]], total_pages: int) -> Iterator[Dict[str, Any]]:
+        """PDF pages with "[Page X]" markers, separated by blank lines"""
+        separator = ""
+        try:
+            for page_number, page_text in pages:
+                yield {
+                    "text": f"{separator}[Page {page_number}]\n{page_text}",
+                    "page_number": page_number,
+                    "progress": page_number / max(total_pages, 1)
+                }
+                separator = "\n\n"
+        finally:
+            # Stop extraction (and close the PDF) if ingestion is abandoned
+            pages.close()
+    
+    @staticmethod
+    def _paragraph_segments(paragraphs: Iterator[str], total: int) -> Iterator[Dict[str, Any]]:
+        """DOCX paragraphs separated by blank lines"""
+        for index, paragraph in enumerate(paragraphs):
+            yield {
+                "text": f"\n\n{paragraph}" if index else paragraph,
+                "progress": (index + 1) / max(total, 1)
+            }
+    
+    @staticmethod
+    def _text_segments(file_path: Path, metadata: Dict[str, Any], count: bool) -> Iterator[Dict[str, Any]]:
+        """
+        Text file in TEXT_BLOCK_CHARS blocks
+        
+        If count is set, word_count and char_count are added to metadata at
+        the end (a word split across two blocks is counted once).
+        """
+        size = max(Path(file_path).stat().st_size, 1)
+        words = 0
+        chars = 0
+        in_word = False
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            while True:
+                text = f.read(TEXT_BLOCK_CHARS)
+                if not text:
+                    break
+                if count:
+                    words += len(text.split()) - (in_word and not text[0].isspace())
+                    chars += len(text)
+                    in_word = not text[-1].isspace()
+                yield {"text": text, "progress": min(f.buffer.tell() / size, 1.0)}
+        
+        if count:
+            metadata["word_count"] = words
+            metadata["char_count"] = chars
+    
     async def process_url(self, url: str) -> Dict[str, Any]:
         """
         Process a URL and store its content
         
+        If the URL was already indexed with the same text (e.g. the server
+        answered 304 Not Modified), the existing document is returned.
+        
         Args:
             url: URL to process
         
@@ -174,12 +628,21 @@ class DocumentManager:
         if not WebScraper.is_valid_url(url):
             raise ValueError(f"Invalid URL: {url}")
         
+        # Scrape URL (pooled async client; unchanged pages are revalidated)
+        scraped_data = await web_scraper.scrape_url(url)
+        
+        # Hash of the saved text file, as for uploads
+        content_hash = hashlib.sha256(scraped_data["text"].encode("utf-8")).hexdigest()
+        signature = self.vector_store.ingest_signature
+        existing = self.metadata_store.find_by_content(
+            content_hash, signature, document_type="url", url=scraped_data["metadata"]["url"]
+        )
+        if existing is not None:
+            return existing
+        
         # Generate unique document ID
         document_id = str(uuid.uuid4())
         
-        # Scrape URL
-        scraped_data = WebScraper.scrape_url(url)
-        
         # Create a filename from URL
         from urllib.parse import urlparse
         parsed = urlparse(url)
@@ -204,7 +667,7 @@ class DocumentManager:
         )
         
         # Save metadata
-        self.documents_metadata[document_id] = {
+        record = {
             "document_id": document_id,
             "filename": filename,
             "document_type": "url",
@@ -212,11 +675,16 @@ class DocumentManager:
             "file_size": len(scraped_data["text"].encode()),
             "file_path": str(file_path),
             "num_chunks": num_chunks,
-            "metadata": scraped_data["metadata"]
+            "metadata": scraped_data["metadata"],
+            "content_hash": content_hash,
+            "ingest_signature": signature
         }
-        self._save_metadata()
+        self.metadata_store.upsert(record)
+        
+        # New document changes what unfiltered questions can retrieve
+        await answer_cache.invalidate_documents([document_id])
         
-        return self.documents_metadata[document_id]
+        return record
     
     async def list_documents(self) -> List[Dict[str, Any]]:
         """
@@ -225,17 +693,8 @@ class DocumentManager:
         Returns:
             List of document metadata
         """
-        documents = []
-        for doc_id, metadata in self.documents_metadata.items():
-            # Convert upload_date string back to datetime
-            metadata_copy = metadata.copy()
-            if isinstance(metadata_copy["upload_date"], str):
-                metadata_copy["upload_date"] = datetime.fromisoformat(metadata_copy["upload_date"])
-            documents.append(metadata_copy)
-        
-        # Sort by upload date (newest first)
-        documents.sort(key=lambda x: x["upload_date"], reverse=True)
-        return documents
+        # Sorted by upload date (newest first) by the store
+        return [self._with_datetime(record) for record in self.metadata_store.list_all()]
     
     async def get_document(self, document_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -247,12 +706,9 @@ class DocumentManager:
         Returns:
             Document metadata or None if not found
         """
-        metadata = self.documents_metadata.get(document_id)
-        if metadata:
-            metadata_copy = metadata.copy()
-            if isinstance(metadata_copy["upload_date"], str):
-                metadata_copy["upload_date"] = datetime.fromisoformat(metadata_copy["upload_date"])
-            return metadata_copy
+        record = self.metadata_store.get(document_id)
+        if record:
+            return self._with_datetime(record)
         return None
     
     async def delete_document(self, document_id: str) -> Dict[str, Any]:
@@ -265,21 +721,23 @@ class DocumentManager:
         Returns:
             Success status
         """
-        if document_id not in self.documents_metadata:
+        metadata = self.metadata_store.get(document_id)
+        if metadata is None:
             return {"success": False, "message": "Document not found"}
         
         # Delete from vector database
         await self.vector_store.delete_document(document_id)
         
         # Delete physical file
-        metadata = self.documents_metadata[document_id]
         file_path = Path(metadata["file_path"])
         if file_path.exists():
             file_path.unlink()
         
         # Remove from metadata
-        del self.documents_metadata[document_id]
-        self._save_metadata()
+        self.metadata_store.delete(document_id)
+        
+        # Drop cached answers built from this document
+        await answer_cache.invalidate_documents([document_id])
         
         return {"success": True, "message": "Document deleted successfully"}
     
@@ -290,13 +748,7 @@ class DocumentManager:
         Returns:
             List of dicts with 'id' and 'name' keys
         """
-        return [
-            {
-                "id": doc_id,
-                "name": metadata["filename"]
-            }
-            for doc_id, metadata in self.documents_metadata.items()
-        ]
+        return self.metadata_store.list_names()
     
     def get_document_id_by_name(self, filename: str) -> Optional[str]:
         """
@@ -308,10 +760,7 @@ class DocumentManager:
         Returns:
             Document ID or None if not found
         """
-        for doc_id, metadata in self.documents_metadata.items():
-            if metadata["filename"] == filename:
-                return doc_id
-        return None
+        return self.metadata_store.find_id_by_filename(filename)
     
     async def rename_document(self, document_id: str, new_name: str) -> Dict[str, Any]:
         """
@@ -324,23 +773,31 @@ class DocumentManager:
         Returns:
             Success status and updated metadata
         """
-        if document_id not in self.documents_metadata:
+        record = self.metadata_store.get(document_id)
+        if record is None:
             return {"success": False, "message": "Document not found"}
         
         # Update metadata
-        old_name = self.documents_metadata[document_id]["filename"]
-        self.documents_metadata[document_id]["filename"] = new_name
-        self.documents_metadata[document_id]["metadata"]["original_filename"] = new_name
+        old_name = record["filename"]
+        record["metadata"]["original_filename"] = new_name
+        file_path = record["file_path"]
         
         # Update file path (rename physical file)
-        old_path = Path(self.documents_metadata[document_id]["file_path"])
+        old_path = Path(record["file_path"])
         new_path = old_path.parent / f"{document_id}_{new_name}"
         
         if old_path.exists():
             old_path.rename(new_path)
-            self.documents_metadata[document_id]["file_path"] = str(new_path)
+            file_path = str(new_path)
         
-        self._save_metadata()
+        self.metadata_store.update(
+            document_id,
+            filename=new_name,
+            file_path=file_path,
+            metadata=record["metadata"]
+        )
+        # Cached answers cite the document by its old name
+        await answer_cache.invalidate_documents([document_id])
         
         return {
             "success": True,
@@ -364,10 +821,10 @@ class DocumentManager:
         Returns:
             Dict with file_path and filename
         """
-        if document_id not in self.documents_metadata:
+        metadata = self.metadata_store.get(document_id)
+        if metadata is None:
             raise ValueError("Document not found")
         
-        metadata = self.documents_metadata[document_id]
         original_path = Path(metadata["file_path"])
         
         if not original_path.exists():
@@ -24,16 +24,7 @@ class DOCXHandler:
         result = {
             "text": "",
             "paragraphs": [],
-            "metadata": {
-                "total_paragraphs": 0,
-                "author": None,
-                "title": None,
-                "subject": None,
-                "keywords": None,
-                "created": None,
-                "modified": None,
-                "last_modified_by": None
-            }
+            "metadata": {}
         }
         
         try:
@@ -50,34 +41,68 @@ class DOCXHandler:
                     })
             
             result["text"] = "\n\n".join(paragraphs_text)
-            result["metadata"]["total_paragraphs"] = len(paragraphs_text)
-            
-            # Extract metadata from core properties
-            core_props = doc.core_properties
-            
-            result["metadata"]["author"] = core_props.author
-            result["metadata"]["title"] = core_props.title
-            result["metadata"]["subject"] = core_props.subject
-            result["metadata"]["keywords"] = core_props.keywords
-            result["metadata"]["last_modified_by"] = core_props.last_modified_by
-            
-            # Handle dates
-            if core_props.created:
-                result["metadata"]["created"] = core_props.created.isoformat()
-            if core_props.modified:
-                result["metadata"]["modified"] = core_props.modified.isoformat()
-            
-            # Filter out None values from metadata (ChromaDB doesn't accept None)
-            result["metadata"] = {
-                k: v for k, v in result["metadata"].items() 
-                if v is not None
-            }
+            result["metadata"] = DOCXHandler._metadata(doc, len(paragraphs_text))
             
             return result
         
         except Exception as e:
             raise Exception(f"Error extracting DOCX: {str(e)}")
     
+    @staticmethod
+    def _metadata(doc, total_paragraphs: int) -> Dict[str, Any]:
+        """Core properties of an open document, without empty values"""
+        metadata = {
+            "total_paragraphs": total_paragraphs,
+            "author": None,
+            "title": None,
+            "subject": None,
+            "keywords": None,
+            "created": None,
+            "modified": None,
+            "last_modified_by": None
+        }
+        
+        # Extract metadata from core properties
+        core_props = doc.core_properties
+        
+        metadata["author"] = core_props.author
+        metadata["title"] = core_props.title
+        metadata["subject"] = core_props.subject
+        metadata["keywords"] = core_props.keywords
+        metadata["last_modified_by"] = core_props.last_modified_by
+        
+        # Handle dates
+        if core_props.created:
+            metadata["created"] = core_props.created.isoformat()
+        if core_props.modified:
+            metadata["modified"] = core_props.modified.isoformat()
+        
+        # Filter out None values from metadata (ChromaDB doesn't accept None)
+        return {k: v for k, v in metadata.items() if v is not None}
+    
+    @staticmethod
+    def open_paragraphs(file_path: str) -> Dict[str, Any]:
+        """
+        Read DOCX metadata and iterate over its non-empty paragraphs
+        
+        Args:
+            file_path: Path to DOCX file
+        
+        Returns:
+            Dictionary with metadata and paragraphs (an iterator of text)
+        """
+        try:
+            doc = Document(file_path)
+            paragraphs = [para for para in doc.paragraphs if para.text.strip()]
+            metadata = DOCXHandler._metadata(doc, len(paragraphs))
+        except Exception as e:
+            raise Exception(f"Error extracting DOCX: {str(e)}")
+        
+        return {
+            "metadata": metadata,
+            "paragraphs": (para.text for para in paragraphs)
+        }
+    
     @staticmethod
     def extract_text_simple(file_path: str) -> str:
         """
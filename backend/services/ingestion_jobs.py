@@ -0,0 +1,290 @@
+"""
+Background ingestion jobs
+Uploads are queued and processed by a small pool of async workers so the
+request returns immediately and clients poll for progress. Job status is
+written through to SQLite so a poll can be answered by any uvicorn worker.
+"""
+import asyncio
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+from config import settings
+from database.job_store import JobStore
+
+
+# Ingestion task: receives a progress callback, returns the stored document
+IngestionTask = Callable[[Callable[..., None]], Awaitable[Dict[str, Any]]]
+
+# Shown for jobs that shutdown interrupts or prevents from starting
+SHUTDOWN_ERROR = "Ingestion cancelled during shutdown"
+
+# Minimum seconds between progress writes to the job store
+PROGRESS_SAVE_INTERVAL = 0.5
+
+
+class QueueFullError(Exception):
+    """Raised when the ingestion queue cannot accept more jobs"""
+    pass
+
+
+class IngestionJobQueue:
+    """Bounded queue of ingestion jobs with progress tracking"""
+
+    def __init__(
+        self,
+        max_queue_size: int = 20,
+        num_workers: int = 2,
+        job_retention_seconds: float = 3600,
+        job_store: Optional[JobStore] = None
+    ):
+        """
+        Initialize the job queue
+
+        Args:
+            max_queue_size: Jobs that may wait before uploads are rejected
+            num_workers: Jobs processed concurrently
+            job_retention_seconds: How long finished jobs stay pollable
+            job_store: Shared store for job status (None = this process only)
+        """
+        self.max_queue_size = max_queue_size
+        self.num_workers = num_workers
+        self.job_retention_seconds = job_retention_seconds
+        self.job_store = job_store
+
+        # Jobs submitted to this worker
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._tasks: Dict[str, IngestionTask] = {}
+        # Job ID -> callback releasing what a job that never runs leaves behind
+        self._cleanups: Dict[str, Callable[[], None]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers = []
+
+    async def start(self):
+        """Start worker tasks on the running event loop"""
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(i))
+            for i in range(self.num_workers)
+        ]
+        print(f"✅ Ingestion workers started ({self.num_workers} workers, queue size {self.max_queue_size})")
+
+    async def stop(self):
+        """Cancel worker tasks and fail the jobs still waiting in the queue"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        while self._queue is not None and not self._queue.empty():
+            job_id = self._queue.get_nowait()
+            self._tasks.pop(job_id, None)
+            cleanup = self._cleanups.pop(job_id, None)
+            if cleanup is not None:
+                try:
+                    cleanup()
+                except Exception as e:
+                    print(f"⚠️ Cleanup of ingestion job {job_id} failed: {e}")
+            job = self.jobs.get(job_id)
+            if job is not None:
+                self._fail(job, SHUTDOWN_ERROR)
+        if self.job_store is not None:
+            self.job_store.close()
+        print("🛑 Ingestion workers stopped")
+
+    def has_capacity(self) -> bool:
+        """Whether a new job would be accepted right now"""
+        return self._queue is not None and not self._queue.full()
+
+    def submit(
+        self,
+        task: IngestionTask,
+        filename: str,
+        cleanup: Optional[Callable[[], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue an ingestion task
+
+        Args:
+            task: Coroutine function taking a progress callback
+            filename: Name shown in job status
+            cleanup: Called if the job is dropped before it starts (e.g.
+                to delete the saved upload); once running, the task cleans up
+
+        Returns:
+            The new job record
+
+        Raises:
+            QueueFullError: If the queue is full (caller should retry later)
+        """
+        if self._queue is None:
+            raise QueueFullError("Ingestion workers are not running")
+
+        self._prune_finished()
+
+        job_id = str(uuid.uuid4())
+        try:
+            self._queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            raise QueueFullError(
+                f"Ingestion queue is full ({self.max_queue_size} jobs waiting)"
+            )
+
+        self.jobs[job_id] = {
+            "job_id": job_id,
+            "filename": filename,
+            "status": "queued",
+            "stage": "queued",
+            "progress": 0.0,
+            "chunks_total": 0,
+            "chunks_done": 0,
+            "document_id": None,
+            "result": None,
+            "error": None,
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        self._tasks[job_id] = task
+        if cleanup is not None:
+            self._cleanups[job_id] = cleanup
+        self._save(self.jobs[job_id])
+        return self.jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get job status
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job record or None if unknown (or already pruned)
+        """
+        job = self.jobs.get(job_id)
+        if job is not None or self.job_store is None:
+            return job
+        # Submitted to another worker
+        try:
+            return self.job_store.get(job_id)
+        except Exception as e:
+            print(f"⚠️ Could not read ingestion job {job_id}: {e}")
+            return None
+
+    def _save(self, job: Dict[str, Any]):
+        """Write a job record through to the shared store"""
+        if self.job_store is None:
+            return
+        try:
+            self.job_store.save(job)
+            job["_saved_monotonic"] = time.monotonic()
+        except Exception as e:
+            print(f"⚠️ Could not save ingestion job {job['job_id']}: {e}")
+
+    def _fail(self, job: Dict[str, Any], error: str):
+        """Mark a job failed and record when it finished"""
+        job["status"] = "failed"
+        job["stage"] = "failed"
+        job["error"] = error
+        job["finished_at"] = datetime.now().isoformat()
+        job["_finished_monotonic"] = time.monotonic()
+        self._save(job)
+
+    def _progress_callback(self, job: Dict[str, Any]) -> Callable[..., None]:
+        """Build the callback ingestion code uses to report progress"""
+        def report(stage: str, progress: float, **details):
+            stage_changed = job["stage"] != stage
+            job["stage"] = stage
+            job["progress"] = round(min(max(progress, 0.0), 100.0), 1)
+            for key in ("chunks_total", "chunks_done"):
+                if key in details:
+                    job[key] = details[key]
+            # Throttled: progress is reported once per batch
+            since_save = time.monotonic() - job.get("_saved_monotonic", 0.0)
+            if stage_changed or since_save >= PROGRESS_SAVE_INTERVAL:
+                self._save(job)
+        return report
+
+    async def _worker(self, worker_id: int):
+        """Process queued jobs until cancelled"""
+        while True:
+            job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            task = self._tasks.pop(job_id, None)
+            self._cleanups.pop(job_id, None)
+
+            try:
+                if job is None or task is None:
+                    continue
+
+                job["status"] = "running"
+                job["started_at"] = datetime.now().isoformat()
+                self._save(job)
+
+                result = await task(self._progress_callback(job))
+
+                job["status"] = "completed"
+                job["stage"] = "completed"
+                job["progress"] = 100.0
+                job["document_id"] = result.get("document_id")
+                job["result"] = result
+            except asyncio.CancelledError:
+                if job is not None:
+                    job["status"] = "failed"
+                    job["stage"] = "failed"
+                    job["error"] = SHUTDOWN_ERROR
+                raise
+            except Exception as e:
+                print(f"❌ Ingestion job {job_id} failed: {e}")
+                job["status"] = "failed"
+                job["stage"] = "failed"
+                job["error"] = str(e)
+            finally:
+                if job is not None and job["status"] in ("completed", "failed"):
+                    job["finished_at"] = datetime.now().isoformat()
+                    job["_finished_monotonic"] = time.monotonic()
+                    self._save(job)
+                self._queue.task_done()
+
+    def _prune_finished(self):
+        """Forget finished jobs older than the retention period"""
+        cutoff = time.monotonic() - self.job_retention_seconds
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.get("_finished_monotonic", float("inf")) < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+        if self.job_store is not None:
+            try:
+                self.job_store.delete_finished(self.job_retention_seconds)
+            except Exception as e:
+                print(f"⚠️ Could not prune ingestion jobs: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue metrics
+
+        Returns:
+            Queue depth and counts of this worker's jobs by status
+        """
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue_size": self.max_queue_size,
+            "workers": self.num_workers,
+            "jobs": counts,
+        }
+
+
+# Global ingestion queue instance
+ingestion_queue = IngestionJobQueue(
+    max_queue_size=settings.INGEST_QUEUE_SIZE,
+    num_workers=settings.INGEST_WORKERS,
+    job_retention_seconds=settings.INGEST_JOB_RETENTION_SECONDS,
+    job_store=JobStore()
+)
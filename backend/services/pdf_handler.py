@@ -2,84 +2,232 @@
 PDF document handler
 Extracts text and metadata from PDF files
 """
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
 import PyPDF2
 import pdfplumber
-from typing import Dict, Any, List
-from pathlib import Path
+
+from config import settings
+
+
+# Shared process pool for parallel page extraction (created on first use)
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Lazily create the extraction process pool"""
+    global _process_pool
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                # spawn: never fork a process that holds the embedding model's threads
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=settings.PDF_EXTRACT_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _process_pool
+
+
+def shutdown_process_pool():
+    """Stop the extraction process pool"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+def _extract_page_range(file_path: str, start: int, end: int) -> List[Tuple[int, str]]:
+    """
+    Extract text for pages [start, end) (runs in a worker process)
+    
+    Args:
+        file_path: Path to PDF file
+        start: First page index (0-based)
+        end: Page index to stop before
+    
+    Returns:
+        List of (page_number, text) for pages with text
+    """
+    with pdfplumber.open(file_path) as pdf:
+        return PDFHandler._extract_pages(pdf, start, end)
+
+
+def _metadata_value(value: Any) -> Optional[str]:
+    """Convert a raw PDF info value to a string"""
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        value = value.decode("utf-8", errors="ignore")
+    value = str(value).strip()
+    return value or None
 
 
 class PDFHandler:
     """Handle PDF document processing"""
     
+    # Document info keys -> our metadata keys
+    INFO_KEYS = {
+        "Author": "author",
+        "Title": "title",
+        "Subject": "subject",
+        "Creator": "creator",
+        "Producer": "producer",
+        "CreationDate": "creation_date",
+    }
+    
     @staticmethod
-    def extract_text_and_metadata(file_path: str) -> Dict[str, Any]:
+    def _extract_pages(pdf, start: int, end: int) -> List[Tuple[int, str]]:
+        """Extract (page_number, text) for pages [start, end) of an open PDF"""
+        pages = []
+        for index in range(start, end):
+            page = pdf.pages[index]
+            page_text = page.extract_text()
+            if page_text:
+                pages.append((index + 1, page_text))
+            # Release the parsed layout objects; long PDFs otherwise keep them all
+            page.close()
+        return pages
+    
+    @staticmethod
+    def _page_ranges(total_pages: int, num_ranges: int) -> List[Tuple[int, int]]:
+        """Split [0, total_pages) into contiguous ranges of similar size"""
+        num_ranges = max(1, min(num_ranges, total_pages))
+        size, remainder = divmod(total_pages, num_ranges)
+        ranges = []
+        start = 0
+        for i in range(num_ranges):
+            end = start + size + (1 if i < remainder else 0)
+            ranges.append((start, end))
+            start = end
+        return ranges
+    
+    @staticmethod
+    def open_pages(file_path: str, parallel: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Read PDF metadata and start extracting page text lazily
+        
+        Args:
+            file_path: Path to PDF file
+            parallel: Split page ranges across worker processes. Defaults to
+                settings.PDF_PARALLEL_EXTRACTION for PDFs with at least
+                settings.PDF_PARALLEL_MIN_PAGES pages.
+        
+        Returns:
+            Dictionary with metadata and pages, an iterator of
+            (page_number, text) in page order for pages with text
+        """
+        metadata = {
+            "total_pages": 0,
+            "author": None,
+            "title": None,
+            "subject": None,
+            "creator": None,
+            "producer": None,
+            "creation_date": None
+        }
+        
+        try:
+            pdf = pdfplumber.open(file_path)
+        except Exception as e:
+            raise Exception(f"Error extracting PDF: {str(e)}")
+        
+        try:
+            total_pages = len(pdf.pages)
+            metadata["total_pages"] = total_pages
+            for info_key, meta_key in PDFHandler.INFO_KEYS.items():
+                metadata[meta_key] = _metadata_value(pdf.metadata.get(info_key))
+        except Exception as e:
+            pdf.close()
+            raise Exception(f"Error extracting PDF: {str(e)}")
+        
+        if parallel is None:
+            parallel = (
+                settings.PDF_PARALLEL_EXTRACTION
+                and total_pages >= settings.PDF_PARALLEL_MIN_PAGES
+            )
+        
+        if parallel:
+            pdf.close()
+            pages = PDFHandler._iter_pages_parallel(file_path, total_pages)
+        else:
+            pages = PDFHandler._iter_pages(pdf)
+        
+        return {
+            # Filter out None values from metadata (ChromaDB doesn't accept None)
+            "metadata": {k: v for k, v in metadata.items() if v is not None},
+            "pages": pages
+        }
+    
+    @staticmethod
+    def _iter_pages(pdf) -> Iterator[Tuple[int, str]]:
+        """Yield (page_number, text) from an open PDF, closing it at the end"""
+        try:
+            for index in range(len(pdf.pages)):
+                yield from PDFHandler._extract_pages(pdf, index, index + 1)
+        except Exception as e:
+            raise Exception(f"Error extracting PDF: {str(e)}")
+        finally:
+            pdf.close()
+    
+    @staticmethod
+    def _iter_pages_parallel(file_path: str, total_pages: int) -> Iterator[Tuple[int, str]]:
+        """Yield (page_number, text) from page ranges extracted in worker processes"""
+        # Each worker opens the file and extracts a contiguous page range
+        pool = _get_process_pool()
+        ranges = PDFHandler._page_ranges(total_pages, settings.PDF_EXTRACT_WORKERS * 2)
+        futures = [
+            pool.submit(_extract_page_range, file_path, start, end)
+            for start, end in ranges
+        ]
+        try:
+            for future in futures:
+                yield from future.result()
+        except Exception as e:
+            raise Exception(f"Error extracting PDF: {str(e)}")
+        finally:
+            for future in futures:
+                future.cancel()
+    
+    @staticmethod
+    def extract_text_and_metadata(file_path: str, parallel: Optional[bool] = None) -> Dict[str, Any]:
         """
         Extract text and metadata from PDF file
         
         Args:
             file_path: Path to PDF file
+            parallel: Split page ranges across worker processes (see open_pages)
         
         Returns:
             Dictionary with text, metadata, and page information
         """
+        opened = PDFHandler.open_pages(file_path, parallel)
         result = {
             "text": "",
             "pages": [],
-            "metadata": {
-                "total_pages": 0,
-                "author": None,
-                "title": None,
-                "subject": None,
-                "creator": None,
-                "producer": None,
-                "creation_date": None
-            }
+            "metadata": opened["metadata"]
         }
         
-        try:
-            # Extract text with page numbers using pdfplumber (better text extraction)
-            with pdfplumber.open(file_path) as pdf:
-                result["metadata"]["total_pages"] = len(pdf.pages)
-                
-                for page_num, page in enumerate(pdf.pages, start=1):
-                    page_text = page.extract_text()
-                    if page_text:
-                        result["pages"].append({
-                            "page_number": page_num,
-                            "text": page_text
-                        })
-                        result["text"] += f"\n\n[Page {page_num}]\n{page_text}"
-            
-            # Extract metadata using PyPDF2
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                
-                if pdf_reader.metadata:
-                    metadata = pdf_reader.metadata
-                    result["metadata"]["author"] = metadata.get('/Author')
-                    result["metadata"]["title"] = metadata.get('/Title')
-                    result["metadata"]["subject"] = metadata.get('/Subject')
-                    result["metadata"]["creator"] = metadata.get('/Creator')
-                    result["metadata"]["producer"] = metadata.get('/Producer')
-                    
-                    # Handle creation date
-                    creation_date = metadata.get('/CreationDate')
-                    if creation_date:
-                        result["metadata"]["creation_date"] = str(creation_date)
-            
-            # Clean up text
-            result["text"] = result["text"].strip()
-            
-            # Filter out None values from metadata (ChromaDB doesn't accept None)
-            result["metadata"] = {
-                k: v for k, v in result["metadata"].items() 
-                if v is not None
-            }
-            
-            return result
+        # Assemble text in one join, recording where each page starts
+        # ("[Page X]" markers separated by blank lines)
+        parts = []
+        position = 0
+        for page_num, page_text in opened["pages"]:
+            part = f"[Page {page_num}]\n{page_text}"
+            result["pages"].append({
+                "page_number": page_num,
+                "text": page_text,
+                # Offset of the "\n\n" separator before this page's marker
+                "char_start": max(0, position - 2)
+            })
+            parts.append(part)
+            position += len(part) + 2
         
-        except Exception as e:
-            raise Exception(f"Error extracting PDF: {str(e)}")
+        result["text"] = "\n\n".join(parts).rstrip()
+        return result
     
     @staticmethod
     def extract_text_simple(file_path: str) -> str:
@@ -94,12 +242,8 @@ class PDFHandler:
         """
         try:
             with pdfplumber.open(file_path) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n\n"
-                return text.strip()
+                pages = PDFHandler._extract_pages(pdf, 0, len(pdf.pages))
+                return "\n\n".join(page_text for _, page_text in pages).strip()
         except Exception as e:
             raise Exception(f"Error extracting PDF text: {str(e)}")
     
@@ -0,0 +1,155 @@
+"""
+Shared service registry
+Owns the process-wide embedding model, vector store and services so that
+every router works against the same instances instead of building its own
+"""
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from config import settings
+
+
+class ServiceRegistry:
+    """Lazily builds heavy components once and shares them across the app"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._embedder = None
+        self._vector_store = None
+        self._reranker = None
+        self._rag_engine = None
+        self._document_manager = None
+
+        # Readiness tracking for /api/v1/health. Without startup warm-up,
+        # components are built lazily by the first request that needs them,
+        # so the app is ready to serve from the start.
+        self.ready = not settings.WARMUP_ON_STARTUP
+        self.warming_up = False
+        self.warmup_seconds: Optional[float] = None
+        self.warmup_error: Optional[str] = None
+
+    @property
+    def embedder(self):
+        """Shared embedding service (single SentenceTransformer model)"""
+        if self._embedder is None:
+            with self._lock:
+                if self._embedder is None:
+                    from database.embedding_service import EmbeddingService
+                    self._embedder = EmbeddingService()
+        return self._embedder
+
+    @property
+    def vector_store(self):
+        """Shared VectorStore (shared embedder + single Chroma client)"""
+        if self._vector_store is None:
+            with self._lock:
+                if self._vector_store is None:
+                    from database.vector_store import VectorStore
+                    self._vector_store = VectorStore(embedder=self.embedder)
+        return self._vector_store
+
+    @property
+    def reranker(self):
+        """Shared cross-encoder reranker (None unless RERANK_ENABLED)"""
+        if self._reranker is None and settings.RERANK_ENABLED:
+            with self._lock:
+                if self._reranker is None:
+                    from rag.reranker import CrossEncoderReranker
+                    self._reranker = CrossEncoderReranker()
+        return self._reranker
+
+    @property
+    def rag_engine(self):
+        """Shared RAGEngine bound to the shared vector store"""
+        if self._rag_engine is None:
+            with self._lock:
+                if self._rag_engine is None:
+                    from rag.rag_engine import RAGEngine
+                    self._rag_engine = RAGEngine(
+                        vector_store=self.vector_store,
+                        reranker=self.reranker
+                    )
+        return self._rag_engine
+
+    @property
+    def document_manager(self):
+        """Shared DocumentManager bound to the shared vector store"""
+        if self._document_manager is None:
+            with self._lock:
+                if self._document_manager is None:
+                    from services.document_manager import DocumentManager
+                    self._document_manager = DocumentManager(vector_store=self.vector_store)
+        return self._document_manager
+
+    def warm_up(self):
+        """
+        Build all shared components and run one encode so the first real
+        request does not pay model loading or lazy initialization costs
+        """
+        self.warming_up = True
+        start_time = time.time()
+
+        try:
+            self.embedder.warm_up()
+            if self.reranker is not None:
+                self.reranker.warm_up()
+            _ = self.vector_store
+            _ = self.rag_engine
+            _ = self.document_manager
+
+            self.warmup_seconds = time.time() - start_time
+            self.ready = True
+            print(f"🔥 Warm-up complete in {self.warmup_seconds:.2f}s")
+        except Exception as e:
+            self.warmup_error = str(e)
+            print(f"❌ Warm-up failed: {e}")
+        finally:
+            self.warming_up = False
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get readiness information for health checks
+
+        Returns:
+            Readiness details of shared components
+        """
+        return {
+            "ready": self.ready,
+            "warming_up": self.warming_up,
+            "warmup_seconds": self.warmup_seconds,
+            "warmup_error": self.warmup_error,
+            "embedding_model": settings.EMBEDDING_MODEL,
+            "vector_store_loaded": self._vector_store is not None,
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get runtime metrics of components that have been loaded
+
+        Returns:
+            Metrics keyed by component name
+        """
+        metrics = {}
+        if self._embedder is not None:
+            metrics["embedding"] = self._embedder.stats()
+        if self._reranker is not None:
+            metrics["reranker"] = self._reranker.stats()
+        return metrics
+
+    def shutdown(self):
+        """Release executors and other shared resources"""
+        from services.pdf_handler import shutdown_process_pool
+        shutdown_process_pool()
+        if self._embedder is not None:
+            self._embedder.shutdown()
+        if self._reranker is not None:
+            self._reranker.shutdown()
+        if self._document_manager is not None:
+            self._document_manager.metadata_store.close()
+        if self._vector_store is not None:
+            self._vector_store.close()
+
+
+# Global registry instance
+registry = ServiceRegistry()
@@ -1,24 +1,194 @@
 """
 Web scraper for extracting content from URLs
+Pages are fetched over a shared, pooled async HTTP client (keep-alive,
+per-host concurrency limits, capped streaming downloads) and revalidated
+with ETag/Last-Modified so re-adding an unchanged page is a cheap 304
 """
-import requests
-from bs4 import BeautifulSoup
-from typing import Dict, Any
-from urllib.parse import urlparse
+import asyncio
 import re
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, AsyncIterator
+from urllib.parse import urlparse
+
+import httpx
+from bs4 import BeautifulSoup
+
+from config import settings
 
 
 class WebScraper:
     """Handle web page scraping"""
     
-    @staticmethod
-    def scrape_url(url: str, timeout: int = 10) -> Dict[str, Any]:
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    }
+    
+    def __init__(
+        self,
+        timeout: float = 10,
+        max_connections: int = 20,
+        max_per_host: int = 4,
+        max_response_mb: float = 5,
+        cache_size: int = 200
+    ):
+        """
+        Configure the scraper (the HTTP client is created on first use)
+        
+        Args:
+            timeout: Request timeout in seconds
+            max_connections: Connections in the shared pool
+            max_per_host: Concurrent requests to one host
+            max_response_mb: Largest page downloaded; bigger ones are rejected
+            cache_size: Pages remembered for conditional requests (0 disables)
+        """
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.max_response_bytes = int(max_response_mb * 1024 * 1024)
+        self.cache_size = cache_size
+        
+        self._client: Optional[httpx.AsyncClient] = None
+        # Host -> {"semaphore", "users"}; dropped when no request uses it
+        self._host_slots: Dict[str, Dict[str, Any]] = {}
+        # URL -> validators and parsed result of the last 200 response
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        
+        # Metrics
+        self.requests = 0
+        self.not_modified = 0
+        self.too_large = 0
+        self.bytes_downloaded = 0
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared client, so connections are kept alive across requests"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=self.HEADERS,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+        return self._client
+    
+    @asynccontextmanager
+    async def _host_slot(self, url: str) -> AsyncIterator[None]:
+        """Hold one of the URL's host's max_per_host request slots"""
+        host = urlparse(url).netloc.lower()
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = {
+                "semaphore": asyncio.Semaphore(self.max_per_host),
+                "users": 0
+            }
+        
+        # Counted while waiting too, so the entry outlives every waiter
+        slot["users"] += 1
+        try:
+            async with slot["semaphore"]:
+                yield
+        finally:
+            slot["users"] -= 1
+            if slot["users"] == 0:
+                del self._host_slots[host]
+    
+    async def scrape_url(self, url: str) -> Dict[str, Any]:
         """
         Scrape content from a URL
         
+        If the page was scraped before and the server confirms it is
+        unchanged (304 Not Modified), the previous result is reused without
+        downloading or parsing it again.
+        
         Args:
             url: URL to scrape
-            timeout: Request timeout in seconds
+        
+        Returns:
+            Dictionary with text and metadata
+        
+        Raises:
+            ValueError: If the page exceeds max_response_mb
+        """
+        cached = self._cache.get(url)
+        headers = {}
+        if cached is not None:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+        
+        self.requests += 1
+        try:
+            async with self._host_slot(url):
+                async with self._get_client().stream("GET", url, headers=headers) as response:
+                    if response.status_code == 304 and cached is not None:
+                        self.not_modified += 1
+                        # A concurrent fetch may have evicted it meanwhile
+                        if url in self._cache:
+                            self._cache.move_to_end(url)
+                        return {"text": cached["text"], "metadata": dict(cached["metadata"])}
+                    
+                    response.raise_for_status()
+                    content = await self._read_capped(response)
+                    validators = {
+                        "etag": response.headers.get("etag"),
+                        "last_modified": response.headers.get("last-modified"),
+                        "no_store": "no-store" in response.headers.get("cache-control", "").lower()
+                    }
+        except httpx.TimeoutException:
+            raise Exception(f"Request timeout: {url}")
+        except httpx.HTTPError as e:
+            raise Exception(f"Error fetching URL: {str(e)}")
+        
+        try:
+            # Parsing is CPU-bound; keep it off the event loop
+            result = await asyncio.to_thread(self._parse_html, url, content)
+        except Exception as e:
+            raise Exception(f"Error scraping URL: {str(e)}")
+        
+        if self.cache_size and not validators["no_store"] and (validators["etag"] or validators["last_modified"]):
+            self._cache[url] = {
+                "etag": validators["etag"],
+                "last_modified": validators["last_modified"],
+                "text": result["text"],
+                "metadata": dict(result["metadata"])
+            }
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        
+        return result
+    
+    async def _read_capped(self, response: httpx.Response) -> bytes:
+        """Stream the body, stopping as soon as it exceeds max_response_bytes"""
+        limit_mb = self.max_response_bytes / 1024 / 1024
+        declared = response.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > self.max_response_bytes:
+            self.too_large += 1
+            raise ValueError(f"Page too large. Max size: {limit_mb:g}MB")
+        
+        parts = []
+        size = 0
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+            self.bytes_downloaded += len(chunk)
+            if size > self.max_response_bytes:
+                self.too_large += 1
+                raise ValueError(f"Page too large. Max size: {limit_mb:g}MB")
+            parts.append(chunk)
+        return b"".join(parts)
+    
+    @staticmethod
+    def _parse_html(url: str, content: bytes) -> Dict[str, Any]:
+        """
+        Extract text and metadata from a downloaded page
+        
+        Args:
+            url: Page URL
+            content: Raw response body
         
         Returns:
             Dictionary with text and metadata
@@ -36,101 +206,86 @@ class WebScraper:
             }
         }
         
-        try:
-            # Make request
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=timeout)
-            response.raise_for_status()
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'lxml')
-            
-            # Extract domain
-            parsed_url = urlparse(url)
-            result["metadata"]["domain"] = parsed_url.netloc
-            
-            # Extract title
-            title_tag = soup.find('title')
-            if title_tag:
-                result["metadata"]["title"] = title_tag.get_text().strip()
-            
-            # Extract meta description
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            if meta_desc and meta_desc.get('content'):
-                result["metadata"]["description"] = meta_desc.get('content').strip()
-            
-            # Extract author
-            meta_author = soup.find('meta', attrs={'name': 'author'})
-            if meta_author and meta_author.get('content'):
-                result["metadata"]["author"] = meta_author.get('content').strip()
-            
-            # Extract published date (various formats)
-            date_selectors = [
-                ('meta', {'property': 'article:published_time'}),
-                ('meta', {'name': 'publish-date'}),
-                ('meta', {'name': 'date'}),
-                ('time', {'class': 'published'})
-            ]
-            
-            for tag_name, attrs in date_selectors:
-                date_tag = soup.find(tag_name, attrs=attrs)
-                if date_tag:
-                    if tag_name == 'meta':
-                        result["metadata"]["published_date"] = date_tag.get('content', '').strip()
-                    else:
-                        result["metadata"]["published_date"] = date_tag.get_text().strip()
-                    break
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside']):
-                element.decompose()
-            
-            # Extract main content
-            # Try to find main content area
-            main_content = (
-                soup.find('article') or
-                soup.find('main') or
-                soup.find('div', class_=re.compile(r'content|article|post|entry', re.I)) or
-                soup.find('body')
-            )
-            
-            if main_content:
-                # Extract text from paragraphs
-                paragraphs = main_content.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li'])
-                text_parts = []
-                
-                for para in paragraphs:
-                    text = para.get_text().strip()
-                    if text and len(text) > 20:  # Filter out very short text
-                        text_parts.append(text)
-                
-                result["text"] = "\n\n".join(text_parts)
-            else:
-                # Fallback: get all text
-                result["text"] = soup.get_text(separator='\n', strip=True)
-            
-            # Clean up text
-            result["text"] = WebScraper._clean_text(result["text"])
-            
-            # Calculate word count
-            result["metadata"]["word_count"] = len(result["text"].split())
+        # Parse HTML
+        soup = BeautifulSoup(content, 'lxml')
+        
+        # Extract domain
+        parsed_url = urlparse(url)
+        result["metadata"]["domain"] = parsed_url.netloc
+        
+        # Extract title
+        title_tag = soup.find('title')
+        if title_tag:
+            result["metadata"]["title"] = title_tag.get_text().strip()
+        
+        # Extract meta description
+        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        if meta_desc and meta_desc.get('content'):
+            result["metadata"]["description"] = meta_desc.get('content').strip()
+        
+        # Extract author
+        meta_author = soup.find('meta', attrs={'name': 'author'})
+        if meta_author and meta_author.get('content'):
+            result["metadata"]["author"] = meta_author.get('content').strip()
+        
+        # Extract published date (various formats)
+        date_selectors = [
+            ('meta', {'property': 'article:published_time'}),
+            ('meta', {'name': 'publish-date'}),
+            ('meta', {'name': 'date'}),
+            ('time', {'class': 'published'})
+        ]
+        
+        for tag_name, attrs in date_selectors:
+            date_tag = soup.find(tag_name, attrs=attrs)
+            if date_tag:
+                if tag_name == 'meta':
+                    result["metadata"]["published_date"] = date_tag.get('content', '').strip()
+                else:
+                    result["metadata"]["published_date"] = date_tag.get_text().strip()
+                break
+        
+        # Remove unwanted elements
+        for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside']):
+            element.decompose()
+        
+        # Extract main content
+        # Try to find main content area
+        main_content = (
+            soup.find('article') or
+            soup.find('main') or
+            soup.find('div', class_=re.compile(r'content|article|post|entry', re.I)) or
+            soup.find('body')
+        )
+        
+        if main_content:
+            # Extract text from paragraphs
+            paragraphs = main_content.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li'])
+            text_parts = []
             
-            # Filter out None values from metadata (ChromaDB doesn't accept None)
-            result["metadata"] = {
-                k: v for k, v in result["metadata"].items() 
-                if v is not None
-            }
+            for para in paragraphs:
+                text = para.get_text().strip()
+                if text and len(text) > 20:  # Filter out very short text
+                    text_parts.append(text)
             
-            return result
+            result["text"] = "\n\n".join(text_parts)
+        else:
+            # Fallback: get all text
+            result["text"] = soup.get_text(separator='\n', strip=True)
         
-        except requests.exceptions.Timeout:
-            raise Exception(f"Request timeout: {url}")
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Error fetching URL: {str(e)}")
-        except Exception as e:
-            raise Exception(f"Error scraping URL: {str(e)}")
+        # Clean up text
+        result["text"] = WebScraper._clean_text(result["text"])
+        
+        # Calculate word count
+        result["metadata"]["word_count"] = len(result["text"].split())
+        
+        # Filter out None values from metadata (ChromaDB doesn't accept None)
+        result["metadata"] = {
+            k: v for k, v in result["metadata"].items() 
+            if v is not None
+        }
+        
+        return result
     
     @staticmethod
     def _clean_text(text: str) -> str:
@@ -169,3 +324,35 @@ class WebScraper:
             return all([result.scheme, result.netloc])
         except:
             return False
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get scraper metrics
+        
+        Returns:
+            Request, revalidation and download counters
+        """
+        return {
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "too_large": self.too_large,
+            "bytes_downloaded": self.bytes_downloaded,
+            "cached_pages": len(self._cache),
+            "hosts": len(self._host_slots),
+        }
+    
+    async def close(self):
+        """Close the shared HTTP client and its pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Global scraper instance (shares one connection pool)
+web_scraper = WebScraper(
+    timeout=settings.SCRAPER_TIMEOUT_SECONDS,
+    max_connections=settings.SCRAPER_MAX_CONNECTIONS,
+    max_per_host=settings.SCRAPER_MAX_PER_HOST,
+    max_response_mb=settings.SCRAPER_MAX_RESPONSE_MB,
+    cache_size=settings.SCRAPER_CACHE_SIZE
+)